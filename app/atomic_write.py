@@ -0,0 +1,107 @@
+### Atomic Write
+
+from contextlib import contextmanager
+import os
+from pathlib import Path
+import time
+from typing import Iterator, Optional
+
+class AtomicWriter:
+    """
+    Replaces files atomically, with a configurable fsync policy.
+
+    A file is written under a temporary name in the same directory and then
+    renamed over the original, so readers and a later restart see either the
+    old or the new contents, never a partial file. The rename alone does not
+    make the new contents durable: after a power failure the file system may
+    still hold the old file, or an empty one. The fsync policy decides how
+    often the data and the rename are forced to disk:
+
+    - 'always' syncs the file before the rename and the directory after it,
+    - 'interval' does the same at most once per interval seconds,
+    - 'never' leaves flushing to the operating system.
+    """
+
+    def __init__(self, fsync: str = 'always', interval: float = 30):
+        """
+        Initialize the writer.
+
+        Args:
+            fsync (str, optional): 'always', 'interval' or 'never'. Defaults to 'always'.
+            interval (float, optional): Minimum seconds between syncs with the 'interval'
+                policy. Defaults to 30.
+        """
+        self.fsync = fsync
+        self.interval = interval
+        self._last_sync: Optional[float] = None
+
+    @contextmanager
+    def replace(self, path: Path) -> Iterator[Path]:
+        """
+        Write a file atomically.
+
+        Yields a temporary path to write the new contents to. When the block
+        completes, the temporary file replaces path; if the block raises, the
+        temporary file is removed and path is left unchanged.
+
+        Args:
+            path (Path): The file to replace.
+
+        Yields:
+            Path: Temporary file to write.
+        """
+        temp_path = path.with_name(path.name + '.tmp')
+        try:
+            yield temp_path
+            sync = self._should_sync()
+            if sync:
+                _sync_file(temp_path)
+            os.replace(temp_path, path)
+            if sync:
+                _sync_directory(path.parent)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+    def _should_sync(self) -> bool:
+        """
+        Decide whether the current write is synced.
+
+        Returns:
+            bool: True if the policy requires syncing this write.
+        """
+        if self.fsync == 'never':
+            return False
+        if self.fsync == 'interval':
+            now = time.monotonic()
+            if self._last_sync is not None and now - self._last_sync < self.interval:
+                return False
+            self._last_sync = now
+        return True
+
+def _sync_file(path: Path) -> None:
+    """
+    Force a file's contents to disk.
+
+    Args:
+        path (Path): The file to sync.
+    """
+    with open(path, 'rb+') as synced_file:
+        os.fsync(synced_file.fileno())
+
+def _sync_directory(path: Path) -> None:
+    """
+    Force a directory's entries, such as a completed rename, to disk.
+
+    Args:
+        path (Path): The directory to sync.
+    """
+    try:
+        descriptor = os.open(path, os.O_RDONLY)
+    except OSError:
+        # directories cannot be opened on every platform (Windows)
+        return
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
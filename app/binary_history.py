@@ -0,0 +1,233 @@
+### Binary History File
+
+from decimal import Decimal
+import mmap
+from pathlib import Path
+import struct
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from app.calculation import Calculation
+from app.exceptions import OperationError
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# File header: magic, format version, reserved, record count, string table offset
+HEADER = struct.Struct('<8sIIQQ')
+
+# Fixed-width record: operation, operand1, operand2 and result as string table
+# indexes, followed by the timestamp in microseconds since 1970-01-01
+RECORD = struct.Struct('<IIIIq')
+
+# The same record layout as a numpy dtype, used to read records as columns
+RECORD_DTYPE = [
+    ('operation', '<u4'),
+    ('operand1', '<u4'),
+    ('operand2', '<u4'),
+    ('result', '<u4'),
+    ('timestamp', '<i8'),
+]
+
+# String table: number of strings, followed by count + 1 byte offsets into the string data
+TABLE_COUNT = struct.Struct('<Q')
+TABLE_OFFSET = struct.Struct('<Q')
+
+MAGIC = b'CALCHIST'
+VERSION = 1
+
+class BinaryHistoryFile:
+    """
+    Compact binary history file read through mmap.
+
+    The file holds a header, one fixed-width record per calculation and a
+    side table of the distinct strings (operation names and decimal values)
+    the records refer to. Because records have a fixed width, any range of
+    calculations can be read without parsing the ones before it, and only
+    the pages holding that range and the strings it uses are touched. Each
+    distinct decimal string is parsed once per read and the resulting
+    Decimal is shared by every calculation that uses it.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Initialize the history file.
+
+        Args:
+            path (Path): Location of the binary history file.
+        """
+        self.path = path
+
+    def write(self, columns: Dict[str, Any]) -> None:
+        """
+        Write the history, replacing the file's contents.
+
+        Args:
+            columns (Dict[str, Any]): The history as returned by HistoryBuffer.to_columns().
+        """
+        strings: Dict[str, int] = {}
+
+        def index_of(value: str) -> int:
+            # store each distinct string once
+            return strings.setdefault(value, len(strings))
+
+        timestamps = columns['timestamp'].view('int64').tolist()
+        records = b''.join(
+            RECORD.pack(
+                index_of(operation),
+                index_of(operand1),
+                index_of(operand2),
+                index_of(result),
+                timestamp
+            )
+            for operation, operand1, operand2, result, timestamp in zip(
+                columns['operation'],
+                columns['operand1'],
+                columns['operand2'],
+                columns['result'],
+                timestamps
+            )
+        )
+
+        encoded = [value.encode('utf-8') for value in strings]
+        offsets = [0]
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value))
+
+        table_offset = HEADER.size + len(records)
+        with open(self.path, 'wb') as history_file:
+            history_file.write(HEADER.pack(MAGIC, VERSION, 0, len(timestamps), table_offset))
+            history_file.write(records)
+            history_file.write(TABLE_COUNT.pack(len(encoded)))
+            history_file.write(struct.pack(f'<{len(offsets)}Q', *offsets))
+            history_file.write(b''.join(encoded))
+
+    def read(self, start: int = 0, stop: Optional[int] = None, verify: bool = True) -> List[Calculation]:
+        """
+        Read a range of calculations.
+
+        Args:
+            start (int, optional): Position of the first calculation to read. Defaults to 0.
+            stop (Optional[int], optional): Position after the last calculation to read.
+                Defaults to the end of the file.
+            verify (bool, optional): Whether to recompute each result while reading,
+                see Calculation.from_row. Defaults to True.
+
+        Returns:
+            List[Calculation]: The calculations, oldest first.
+
+        Raises:
+            OperationError: If the file is not a valid binary history file.
+        """
+        with open(self.path, 'rb') as history_file:
+            record_count, table_offset = self._read_header(history_file.read(HEADER.size))
+            start, stop, _ = slice(start, stop).indices(record_count)
+            if start >= stop:
+                return []
+            with mmap.mmap(history_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return self._read_records(data, start, stop, table_offset, verify)
+
+    def _read_records(
+        self,
+        data: mmap.mmap,
+        start: int,
+        stop: int,
+        table_offset: int,
+        verify: bool
+    ) -> List[Calculation]:
+        """
+        Read a range of records from the mapped file.
+
+        Args:
+            data (mmap.mmap): The mapped history file.
+            start (int): Position of the first record to read.
+            stop (int): Position after the last record to read.
+            table_offset (int): Position of the string table in the file.
+            verify (bool): Whether to recompute each result.
+
+        Returns:
+            List[Calculation]: The calculations, oldest first.
+        """
+        import numpy as np
+
+        string_count, = TABLE_COUNT.unpack_from(data, table_offset)
+        offsets_start = table_offset + TABLE_COUNT.size
+        strings_start = offsets_start + (string_count + 1) * TABLE_OFFSET.size
+
+        def strings_at(indexes: 'np.ndarray') -> List[str]:
+            # decode only the strings used by the range
+            offsets = np.frombuffer(data, dtype='<u8', count=string_count + 1, offset=offsets_start)
+            begins = (offsets[indexes] + strings_start).tolist()
+            ends = (offsets[indexes + 1] + strings_start).tolist()
+            # release the view so the mapping can be closed
+            del offsets
+            return [data[begin:end].decode('utf-8') for begin, end in zip(begins, ends)]
+
+        def lookup(values: List, used: 'np.ndarray', column: 'np.ndarray') -> List:
+            # map each string table index in the column to its shared value
+            table = np.empty(len(values), dtype=object)
+            table[:] = values
+            return table[np.searchsorted(used, column)].tolist()
+
+        # copy the range out of the mapping, so the mapping can be closed afterwards
+        records = np.frombuffer(
+            data,
+            dtype=RECORD_DTYPE,
+            count=stop - start,
+            offset=HEADER.size + start * RECORD.size
+        ).copy()
+
+        # parse each distinct decimal string once and share the Decimal
+        used = np.unique(np.concatenate(
+            (records['operand1'], records['operand2'], records['result'])
+        ))
+        decimals = [Decimal(value) for value in strings_at(used)]
+        used_operations = np.unique(records['operation'])
+        operations = strings_at(used_operations)
+
+        from_row = Calculation.from_row
+        return [
+            from_row(operation, operand1, operand2, result, timestamp, verify)
+            for operation, operand1, operand2, result, timestamp in zip(
+                lookup(operations, used_operations, records['operation']),
+                lookup(decimals, used, records['operand1']),
+                lookup(decimals, used, records['operand2']),
+                lookup(decimals, used, records['result']),
+                records['timestamp'].astype('datetime64[us]').tolist()
+            )
+        ]
+
+    def __len__(self) -> int:
+        """
+        Return the number of calculations in the file.
+
+        Only the header is read.
+
+        Returns:
+            int: Number of calculations.
+        """
+        with open(self.path, 'rb') as history_file:
+            record_count, _ = self._read_header(history_file.read(HEADER.size))
+        return record_count
+
+    @staticmethod
+    def _read_header(data) -> tuple:
+        """
+        Read and check the file header.
+
+        Args:
+            data: Buffer starting with the header.
+
+        Returns:
+            tuple: The record count and the string table offset.
+
+        Raises:
+            OperationError: If the header is missing or not a supported version.
+        """
+        if len(data) < HEADER.size:
+            raise OperationError("Invalid binary history file: header is truncated")
+        magic, version, _, record_count, table_offset = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise OperationError("Invalid binary history file: unrecognized format")
+        if version != VERSION:
+            raise OperationError(f"Unsupported binary history file version: {version}")
+        return record_count, table_offset
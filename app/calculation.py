@@ -4,11 +4,14 @@ from dataclasses import dataclass, field
 import datetime
 from decimal import Decimal, InvalidOperation
 import logging
-from typing import Any, Dict
+import sys
+from typing import Any, Dict, Optional, Union
 
-from app.exceptions import OperationError
+from app.exceptions import OperationError, ValidationError
+from app.operation_cache import operation_cache
+from app.operations import OperationFactory
 
-@dataclass
+@dataclass(slots=True)
 class Calculation:
     """
     Value Object representing a single calculation.
@@ -17,6 +20,9 @@ class Calculation:
     operation performed, operands involved, the result, and the timestamp of the
     calculation. It provides methods for performing the calculation, serializing
     the data for storage, and deserializing data to recreate a Calculation instance.
+
+    Instances use __slots__ instead of a per-instance __dict__ and share a single
+    interned string per operation name, which keeps large histories compact.
     """
 
     # required fields
@@ -38,20 +44,58 @@ class Calculation:
         
         Automatically calculates the result of the operation after the Calculation instance is created
         """
-        self.result = self.calculate()
+        # every calculation of the same operation shares one name string
+        self.operation = sys.intern(self.operation)
+        # repeated calculations reuse the result computed the first time
+        self.result = operation_cache.get_or_compute(
+            self.operation, self.operand1, self.operand2, self.calculate
+        )
+
+    @classmethod
+    def restore(
+        cls,
+        operation: str,
+        operand1: Decimal,
+        operand2: Decimal,
+        result: Decimal,
+        timestamp: Optional[datetime.datetime] = None
+    ) -> 'Calculation':
+        """
+        Create a calculation whose result is already known.
+
+        Unlike the regular constructor, the result is not recomputed, so the
+        caller is responsible for passing the correct result.
+
+        Args:
+            operation (str): The name of the operation (ex: Addition).
+            operand1 (Decimal): The first operand.
+            operand2 (Decimal): The second operand.
+            result (Decimal): The result of the calculation.
+            timestamp (Optional[datetime.datetime], optional): When the calculation was
+                performed. Defaults to now.
 
-    # Map operation names (as strings) to functions
+        Returns:
+            Calculation: The restored calculation.
+        """
+        calc = cls.__new__(cls)
+        calc.operation = sys.intern(operation)
+        calc.operand1 = operand1
+        calc.operand2 = operand2
+        calc.result = result
+        calc.timestamp = timestamp or datetime.datetime.now()
+        return calc
+
+    # Look up the operation by name in the registry shared with OperationFactory
     # Dynamically perform the operation on the stored operands (x and y)
     # Return the computed result as a Decimal
     # Raise custom errors if the operation is invalid or unsafe (e.g., divide by zero)
-    # call this like: return operations[self.operation](self.operand1, self.operand2)
     def calculate(self) -> Decimal:
         """
         Execute calculation using the specified operation.
 
-        Utilizes a dictionary to map operation names to their corresponding
-        lambda functions, enabling dynamic execution of operations based on
-        the operation name.
+        The operation is looked up by name with OperationFactory.get_by_name,
+        so every operation the factory knows, including operations added with
+        register_operation, can be recalculated.
 
         Returns:
             Decimal: The result of the calculation.
@@ -60,65 +104,21 @@ class Calculation:
             OperationError: If the operation is unknown or the calculation fails.
         """
 
-        # Mapping of operation names to their corresponding functions
-        operations = {
-            "Addition": lambda x, y: x + y,
-            "Subtraction": lambda x, y: x - y,
-            "Multiplication": lambda x, y: x * y,
-            "Division": lambda x, y: x / y if y != 0 else self._raise_div_zero(),
-            "Power": lambda x, y: Decimal(pow(float(x), float(y))) if y >= 0 else self._raise_neg_power(),
-            "Root": lambda x, y: (
-                Decimal(pow(float(x), 1 / float(y)))
-                if x >= 0 and y != 0
-                else self._raise_invalid_root(x,y)
-            )
-        }
-
-        # retrieve the operation function based on the operation name
-        op = operations.get(self.operation)
-        if not op:
+        # retrieve the operation based on the operation name
+        operation = OperationFactory.get_by_name(self.operation)
+        if operation is None:
             raise OperationError(f"Unknown operation: {self.operation}")
-        
+
         try:
             # execute the operation with the provided operands
-            return op(self.operand1, self.operand2)
+            return operation.execute(self.operand1, self.operand2)
+        except ValidationError as e:
+            # operands the operation rejects, such as a zero divisor
+            raise OperationError(str(e))
         except (InvalidOperation, ValueError, ArithmeticError) as e:
             # handle any errors that occur during calculation
             raise OperationError(f"Calculation failed: {str(e)}") # pragma: no cover
-        
-    @staticmethod
-    def _raise_div_zero(): # pragma: no cover
-        """
-        helper method to raise division by zero error. This method is called
-        when a division by zero is attempted
-        """
-        raise OperationError("Division by zero is not allowed")
-    
-    @staticmethod
-    def _raise_neg_power(): # pragma: no cover
-        """
-        Helper method to raise negative power error.
-        Called when a negative exponent is used in a power operation
-        """
-        raise OperationError("Negative exponents are not supported")
-    
-    @staticmethod
-    def _raise_invalid_root(x: Decimal, y: Decimal): # pragma: no cover
-        """
-        helper method to raise invalid root error. This method is called
-        when an invalid root operation is attempted, such as taking the root of a
-        negative number or using zero as the root degree
 
-        Args:
-            x (Decimal): The number from which the root is taken.
-            y (Decimal): The degree of the root.
-        """
-        if y == 0:
-            raise OperationError("Zero root is undefined")
-        if x < 0:
-            raise OperationError("Cannot calculate root of negative number")
-        raise OperationError("Invalid root operation")
-    
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert calculation to dictionary for serialization.
@@ -138,7 +138,7 @@ class Calculation:
         }
     
     @staticmethod
-    def from_dict(data: Dict[str, Any]) -> 'Calculation':
+    def from_dict(data: Dict[str, Any], verify: bool = True) -> 'Calculation':
         """
         Create calculation from dictionary.
 
@@ -147,6 +147,9 @@ class Calculation:
 
         Args:
             data (Dict[str, Any]): Dictionary containing calculation data.
+            verify (bool, optional): Whether to recompute the result and compare it with the
+                saved one. When False the saved result is trusted and restored as is.
+                Defaults to True.
 
         Returns:
             Calculation: A new instance of Calculation with data populated from the dictionary.
@@ -155,18 +158,75 @@ class Calculation:
             OperationError: If data is invalid or missing required fields.
         """
         try:
+            return Calculation.from_row(
+                data['operation'],
+                data['operand1'],
+                data['operand2'],
+                data['result'],
+                data['timestamp'],
+                verify
+            )
+        except KeyError as e:
+            raise OperationError(f"Invalid calculation data: {str(e)}")
+
+    @classmethod
+    def from_row(
+        cls,
+        operation: str,
+        operand1: Any,
+        operand2: Any,
+        result: Any,
+        timestamp: Union[str, datetime.datetime],
+        verify: bool = True
+    ) -> 'Calculation':
+        """
+        Create calculation from the fields of a saved record.
+
+        Takes the fields positionally so loaders can build calculations
+        straight from parsed columns without creating a dictionary per row.
+
+        Args:
+            operation (str): The name of the operation (ex: Addition).
+            operand1 (Any): The first operand, as a string or number.
+            operand2 (Any): The second operand, as a string or number.
+            result (Any): The saved result, as a string or number.
+            timestamp (Union[str, datetime.datetime]): The timestamp, as a datetime or in ISO format.
+            verify (bool, optional): Whether to recompute the result and compare it with the
+                saved one. When False the saved result is trusted and restored as is.
+                Defaults to True.
+
+        Returns:
+            Calculation: A new instance of Calculation with data populated from the record.
+
+        Raises:
+            OperationError: If the record is invalid.
+        """
+        try:
+            if not isinstance(timestamp, datetime.datetime):
+                timestamp = datetime.datetime.fromisoformat(timestamp)
+
+            if not verify:
+                # trusted load: skip recomputing the result
+                return cls.restore(
+                    operation,
+                    Decimal(operand1),
+                    Decimal(operand2),
+                    Decimal(result),
+                    timestamp
+                )
+
             # create the calculation object with the original operands
-            calc = Calculation(
-                operation=data['operation'],
-                operand1=Decimal(data['operand1']),
-                operand2=Decimal(data['operand2'])
+            calc = cls(
+                operation=operation,
+                operand1=Decimal(operand1),
+                operand2=Decimal(operand2)
             )
 
             # set the timestamp from the saved data
-            calc.timestamp = datetime.datetime.fromisoformat(data['timestamp'])
+            calc.timestamp = timestamp
 
             # verify the result matches (help catch data corruption)
-            saved_result = Decimal(data['result'])
+            saved_result = Decimal(result)
             if calc.result != saved_result:
                 logging.warning(
                     f"Loaded calculation result {saved_result} "
@@ -174,9 +234,32 @@ class Calculation:
                 ) # pragma: no cover
 
             return calc
-        except (KeyError, InvalidOperation, ValueError) as e:
+        except (InvalidOperation, ValueError, TypeError) as e:
             raise OperationError(f"Invalid calculation data: {str(e)}")
-        
+
+    def verify(self) -> bool:
+        """
+        Recompute the result and compare it with the stored one.
+
+        Used to check calculations that were loaded without verification.
+        A mismatch or a failed recomputation is logged as a warning.
+
+        Returns:
+            bool: True if the recomputed result matches the stored result.
+        """
+        try:
+            computed = self.calculate()
+        except OperationError as e:
+            logging.warning(f"Could not verify loaded calculation {self}: {e}")
+            return False
+        if computed != self.result:
+            logging.warning(
+                f"Loaded calculation result {self.result} "
+                f"differs from computed result {computed}"
+            )
+            return False
+        return True
+
     def __str__(self) -> str:
         """
         Return string representation of calculation.
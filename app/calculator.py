@@ -1,24 +1,44 @@
 ### Calculator class ###
 
+import csv
+import datetime
 from decimal import Decimal
+from itertools import count
 import logging
 import os
+import random
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
-
-import pandas as pd
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 
+from app import decimal_math
+from app.atomic_write import AtomicWriter
+from app.binary_history import BinaryHistoryFile
 from app.calculation import Calculation
 from app.calculator_config import CalculatorConfig
-from app.calculator_memento import CalculatorMemento
-from app.exceptions import OperationError, ValidationError
+from app.calculator_memento import CalculatorMemento, MementoStack
+from app.exceptions import CalculatorError, OperationError, ValidationError
+from app.expression import Step, compile_expression
 from app.history import HistoryObserver
+from app.history_archive import ArchiveSnapshot, HistoryArchive
+from app.history_buffer import COLUMNS, ColumnarHistoryBuffer, HistoryBuffer, columns_of, concat_columns
+from app.history_journal import HistoryJournal
+from app.history_tail import copy_prefix, line_start_before
+from app.history_writer import HistorySnapshot
 from app.input_validators import InputValidator
-from app.operations import Operation
+from app.log_queue import start_queue_logging, stop_queue_logging
+from app.operation_cache import operation_cache
+from app.operations import Operation, OperationFactory
+
+if TYPE_CHECKING:
+    # pandas takes several hundred milliseconds to import, so it is only
+    # imported by the methods that read or write history files
+    import pandas as pd
 
 # type aliases for better readability
 Number = Union[int, float, Decimal]
 CalculationResult = Union[Number, str]
+BatchResult = List[Union[Decimal, float, CalculatorError]]
 
 class Calculator:
     """
@@ -55,16 +75,46 @@ class Calculator:
         # Set up the logging system
         self._setup_logging()
 
-        # Initialize calculation history and operation strategy
-        self.history: List[Calculation] = []
+        # Size the result cache shared by all calculations
+        operation_cache.configure(
+            self.config.operation_cache_size,
+            self.config.operation_cache_eviction
+        )
+
+        # Initialize bounded stacks for undo and redo functionality using the Memento pattern
+        self.undo_stack = MementoStack(self.config.max_undo_depth, self.config.undo_memory_budget)
+        self.redo_stack = MementoStack(self.config.max_undo_depth, self.config.undo_memory_budget)
+
+        # Calculations older than the history, kept in the history file
+        self._archive = HistoryArchive(self._archive_position_before)
+
+        # Initialize calculation history (a ring buffer of max_history_size) and operation strategy
+        self.history = []
         self.operation_strategy: Optional[Operation] = None
 
         # Initialize observer list for the Observer pattern
         self.observers: List[HistoryObserver] = []
 
-        # Initialize stacks for undo and redo functionality using the Memento pattern
-        self.undo_stack: List[CalculatorMemento] = []
-        self.redo_stack: List[CalculatorMemento] = []
+        # Append-only journal used for incremental auto-saves
+        self.journal = HistoryJournal(
+            self.config.history_journal_file,
+            self.config.default_encoding
+        )
+
+        # Thread checking loaded history when history_verify is 'background'
+        self._verify_thread: Optional[threading.Thread] = None
+
+        # Snapshots are numbered so that an older one never replaces a newer
+        # one in the history file, and written one at a time
+        self._snapshot_sequence = count()
+        self._written_sequence = -1
+        self._write_lock = threading.Lock()
+
+        # Replaces the history file atomically, syncing it as history_fsync requires
+        self._history_file_writer = AtomicWriter(
+            self.config.history_fsync,
+            self.config.history_fsync_interval
+        )
 
         # Create required directories for history management
         self._setup_directories()
@@ -79,24 +129,79 @@ class Calculator:
         # Log the successful initialization of the calculator
         logging.info("Calculator initialized with configuration")
 
+    @property
+    def history(self) -> HistoryBuffer:
+        """
+        Get the calculation history.
+
+        Returns:
+            HistoryBuffer: Ring buffer holding the newest max_history_size calculations.
+        """
+        return self._history
+
+    @history.setter
+    def history(self, calculations: Iterable[Calculation]) -> None:
+        """
+        Replace the calculation history.
+
+        The undo and redo stacks are cleared: their delta mementos describe
+        changes to the replaced history and cannot be applied to the new one.
+        The archived calculations are discarded as well, so the next save
+        writes exactly the new history.
+
+        Args:
+            calculations (Iterable[Calculation]): The new history, oldest first. Only the
+                newest max_history_size calculations are kept.
+        """
+        self._replace_history(calculations)
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self._archive.reset()
+
+    def _replace_history(self, calculations: Iterable[Calculation]) -> None:
+        """
+        Replace the calculation history, keeping the undo and redo stacks.
+
+        Used by undo and redo, whose mementos produce the new history.
+
+        Args:
+            calculations (Iterable[Calculation]): The new history, oldest first. Only the
+                newest max_history_size calculations are kept.
+        """
+        if self.config.history_backend == 'columnar':
+            buffer_class = ColumnarHistoryBuffer
+        else:
+            buffer_class = HistoryBuffer
+        if not isinstance(calculations, buffer_class):
+            calculations = buffer_class(self.config.max_history_size, calculations)
+        self._history = calculations
+
     def _setup_logging(self) -> None:
         """
         Configure the logging system.
 
         Sets up logging to a file with a specified format and log level.
+        With config.log_queue, records are written to the file by a
+        listener thread instead of the thread that logs them.
         """
         try:
             # Ensure the log directory exists
             os.makedirs(self.config.log_dir, exist_ok=True)
             log_file = self.config.log_file.resolve()
+            log_format = '%(asctime)s - %(levelname)s - %(message)s'
 
-            # Configure the basic logging settings
-            logging.basicConfig(
-                filename=str(log_file),
-                level=logging.INFO,
-                format='%(asctime)s - %(levelname)s - %(message)s',
-                force=True  # Overwrite any existing logging configuration
-            )
+            if self.config.log_queue:
+                start_queue_logging(log_file, self.config.log_level, log_format)
+            else:
+                # A listener started by an earlier calculator would keep the file open
+                stop_queue_logging()
+                # Configure the basic logging settings
+                logging.basicConfig(
+                    filename=str(log_file),
+                    level=self.config.log_level,
+                    format=log_format,
+                    force=True  # Overwrite any existing logging configuration
+                )
             logging.info(f"Logging initialized at: {log_file}")
         except Exception as e:
             # Print an error message and re-raise the exception if logging setup fails
@@ -122,7 +227,7 @@ class Calculator:
             observer (HistoryObserver): The observer to be added.
         """
         self.observers.append(observer)
-        logging.info(f"Added observer: {observer.__class__.__name__}")
+        logging.info("Added observer: %s", observer.__class__.__name__)
 
     def remove_observer(self, observer: HistoryObserver) -> None:
         """
@@ -134,7 +239,7 @@ class Calculator:
             observer (HistoryObserver): The observer to be removed.
         """
         self.observers.remove(observer)
-        logging.info(f"Removed observer: {observer.__class__.__name__}")
+        logging.info("Removed observer: %s", observer.__class__.__name__)
 
     def notify_observers(self, calculation: Calculation) -> None:
         """
@@ -149,6 +254,34 @@ class Calculator:
         for observer in self.observers:
             observer.update(calculation)
 
+    def notify_observers_batch(self, calculations: List[Calculation]) -> None:
+        """
+        Notify all observers of a batch of new calculations.
+
+        Each observer receives the whole batch through a single update_batch call.
+
+        Args:
+            calculations (List[Calculation]): The calculations performed together.
+        """
+        for observer in self.observers:
+            observer.update_batch(calculations)
+
+    def notify_history_changed(self) -> None:
+        """
+        Notify all observers that undo, redo or clear changed the history.
+        """
+        for observer in self.observers:
+            observer.history_changed()
+
+    def flush_observers(self) -> None:
+        """
+        Ask all observers to complete any work they have deferred.
+
+        Called after undo, redo and clear, and before the calculator shuts down.
+        """
+        for observer in self.observers:
+            observer.flush()
+
     def set_operation(self, operation: Operation) -> None:
         """
         Set the current operation strategy.
@@ -161,7 +294,7 @@ class Calculator:
             operation (Operation): The operation strategy to be set.
         """
         self.operation_strategy = operation
-        logging.info(f"Set operation: {operation}")
+        logging.info("Set operation: %s", operation)
 
     def perform_operation(
         self,
@@ -193,29 +326,38 @@ class Calculator:
             validated_a = InputValidator.validate_number(a, self.config)
             validated_b = InputValidator.validate_number(b, self.config)
 
-            # Execute the operation strategy
-            result = self.operation_strategy.execute(validated_a, validated_b)
-
-            # Create a new Calculation instance with the operation details
-            calculation = Calculation(
-                operation=str(self.operation_strategy),
-                operand1=validated_a,
-                operand2=validated_b
-            )
-
-            # Save the current state to the undo stack before making changes
-            self.undo_stack.append(CalculatorMemento(self.history.copy()))
+            with decimal_math.precision(self.config.precision):
+                # Execute the operation strategy, reusing the result of an identical calculation
+                operation = self.operation_strategy
+                result = operation_cache.get_or_compute(
+                    str(operation),
+                    validated_a,
+                    validated_b,
+                    lambda: operation.execute(validated_a, validated_b)
+                )
+
+                # Record the calculation with the result just obtained, so the
+                # cache is not consulted a second time
+                calculation = Calculation.restore(
+                    operation=str(operation),
+                    operand1=validated_a,
+                    operand2=validated_b,
+                    result=result
+                )
+
+            # Append the new calculation to the history, evicting the oldest
+            # calculation once the history reaches its maximum size
+            evicted = self.history.extend([calculation])
+
+            # Record the change on the undo stack as a delta instead of a full copy
+            memento = CalculatorMemento.from_append([calculation], evicted)
+            self.undo_stack.append(memento)
+            # Evicted calculations stay in the history file
+            self._archive.push(memento.evicted)
 
             # Clear the redo stack since new operation invalidates the redo history
             self.redo_stack.clear()
 
-            # Append the new calculation to the history
-            self.history.append(calculation)
-
-            # Ensure the history does not exceed the maximum size
-            if len(self.history) > self.config.max_history_size:
-                self.history.pop(0)
-
             # Notify all observers about the new calculation
             self.notify_observers(calculation)
 
@@ -223,112 +365,864 @@ class Calculator:
 
         except ValidationError as e:
             # Log and re-raise validation errors
-            logging.error(f"Validation error: {str(e)}")
+            logging.error("Validation error: %s", e)
             raise
         except Exception as e: # pragma: no cover
             # Log and raise operation errors for any other exceptions
-            logging.error(f"Operation failed: {str(e)}")
+            logging.error("Operation failed: %s", e)
             raise OperationError(f"Operation failed: {str(e)}")
 
+    def perform_batch(
+        self,
+        operation: Union[str, Operation],
+        a_values: Sequence[Union[str, Number]],
+        b_values: Sequence[Union[str, Number]],
+        allow_float: bool = False
+    ) -> BatchResult:
+        """
+        Perform the same operation on many pairs of operands in one pass.
+
+        Every pair is validated and evaluated independently; a failing pair does
+        not stop the batch. Successful calculations are appended to the history
+        together, recorded as a single undo step and delivered to observers as
+        one batch, so bulk work pays the undo, notification and auto-save cost
+        once rather than once per pair.
+
+        When allow_float is True and the operation provides an array kernel,
+        the batch is evaluated with vectorized float64 arithmetic instead of
+        Decimal, trading precision for speed. Results are then returned as floats.
+
+        Args:
+            operation (Union[str, Operation]): The operation to apply, either an
+                Operation instance or a name understood by OperationFactory.
+            a_values (Sequence[Union[str, Number]]): First operands.
+            b_values (Sequence[Union[str, Number]]): Second operands.
+            allow_float (bool, optional): Whether float64 precision is acceptable.
+                Defaults to False.
+
+        Returns:
+            BatchResult: One entry per pair, holding either the result or the
+            ValidationError/OperationError raised for that pair.
+
+        Raises:
+            OperationError: If the operation is unknown.
+            ValidationError: If the operand sequences differ in length.
+        """
+        if isinstance(operation, str):
+            try:
+                operation = OperationFactory.create_operation(operation)
+            except ValueError as e:
+                raise OperationError(str(e))
+        if len(a_values) != len(b_values):
+            raise ValidationError("Operand sequences must have the same length")
+
+        if allow_float and operation.supports_arrays:
+            results, calculations = self._evaluate_float_batch(operation, a_values, b_values)
+        else:
+            results, calculations = self._evaluate_exact_batch(operation, a_values, b_values)
+
+        if calculations:
+            # Append the whole batch and record it as a single undo step
+            evicted = self.history.extend(calculations)
+            memento = CalculatorMemento.from_append(calculations, evicted, self.history.max_size)
+            self.undo_stack.append(memento)
+            self._archive.push(memento.evicted)
+            self.redo_stack.clear()
+            self.notify_observers_batch(calculations)
+
+        logging.info(
+            "Batch %s: %d of %d calculations succeeded",
+            operation,
+            len(calculations),
+            len(results)
+        )
+        return results
+
+    def _evaluate_exact_batch(
+        self,
+        operation: Operation,
+        a_values: Sequence[Union[str, Number]],
+        b_values: Sequence[Union[str, Number]]
+    ) -> Tuple[BatchResult, List[Calculation]]:
+        """
+        Evaluate a batch pair by pair with Decimal arithmetic.
+
+        Args:
+            operation (Operation): The operation to apply.
+            a_values (Sequence[Union[str, Number]]): First operands.
+            b_values (Sequence[Union[str, Number]]): Second operands.
+
+        Returns:
+            Tuple[BatchResult, List[Calculation]]: The per-pair results and the
+            calculations for the successful pairs.
+        """
+        operation_name = str(operation)
+        timestamp = datetime.datetime.now()
+        results: BatchResult = []
+        calculations: List[Calculation] = []
+        with decimal_math.precision(self.config.precision):
+            for a, b in zip(a_values, b_values):
+                try:
+                    validated_a = InputValidator.validate_number(a, self.config)
+                    validated_b = InputValidator.validate_number(b, self.config)
+                    result = operation.execute(validated_a, validated_b)
+                    # record the result without recomputing it, and without filling
+                    # the shared operation cache with one-off batch entries
+                    calculations.append(Calculation.restore(
+                        operation=operation_name,
+                        operand1=validated_a,
+                        operand2=validated_b,
+                        result=result,
+                        timestamp=timestamp
+                    ))
+                    results.append(result)
+                except CalculatorError as e:
+                    results.append(e)
+                except Exception as e:
+                    results.append(OperationError(f"Operation failed: {str(e)}"))
+        return results, calculations
+
+    def _evaluate_float_batch(
+        self,
+        operation: Operation,
+        a_values: Sequence[Union[str, Number]],
+        b_values: Sequence[Union[str, Number]]
+    ) -> Tuple[BatchResult, List[Calculation]]:
+        """
+        Evaluate a batch with the vectorized float64 engine.
+
+        Args:
+            operation (Operation): An operation providing an array kernel.
+            a_values (Sequence[Union[str, Number]]): First operands.
+            b_values (Sequence[Union[str, Number]]): Second operands.
+
+        Returns:
+            Tuple[BatchResult, List[Calculation]]: The per-pair results and the
+            calculations for the successful pairs.
+        """
+        # numpy is only needed for float batches, so import the engine on first use
+        from app.float_engine import evaluate_batch
+
+        a, b, values, errors = evaluate_batch(
+            operation, a_values, b_values, self.config.max_input_value
+        )
+        operation_name = str(operation)
+        timestamp = datetime.datetime.now()
+        results: BatchResult = []
+        calculations: List[Calculation] = []
+        for operand1, operand2, value, error in zip(a.tolist(), b.tolist(), values.tolist(), errors):
+            if error is not None:
+                results.append(error)
+                continue
+            results.append(value)
+            # the result was computed in float64, so record it without recomputing
+            calculations.append(Calculation.restore(
+                operation=operation_name,
+                operand1=Decimal(repr(operand1)),
+                operand2=Decimal(repr(operand2)),
+                result=Decimal(repr(value)),
+                timestamp=timestamp
+            ))
+        return results, calculations
+
+    def evaluate_expression(
+        self,
+        expression: str,
+        variables: Optional[Mapping[str, Union[str, Number]]] = None
+    ) -> Decimal:
+        """
+        Evaluate an arithmetic expression, such as '(3 + 4) ^ 2 / root(81, 2)'.
+
+        Expressions are compiled once and cached (see app.expression), so
+        evaluating a formula again, with the same or other variable values,
+        skips parsing. The numbers in the expression and the variable values
+        are validated like the operands of perform_operation. Every operation
+        performed is appended to the history; together they are recorded as
+        a single undo step and delivered to observers as one batch.
+
+        Args:
+            expression (str): The expression to evaluate.
+            variables (Optional[Mapping[str, Union[str, Number]]], optional): Values of
+                the variables used in the expression.
+
+        Returns:
+            Decimal: The value of the expression.
+
+        Raises:
+            ValidationError: If the expression is malformed or an input is invalid.
+            OperationError: If an operation fails.
+        """
+        try:
+            compiled = compile_expression(expression)
+            for number in compiled.numbers:
+                InputValidator.validate_number(number, self.config)
+            values = {
+                name: InputValidator.validate_number(value, self.config)
+                for name, value in (variables or {}).items()
+            }
+
+            steps: List[Step] = []
+            with decimal_math.precision(self.config.precision):
+                result = compiled.evaluate(values, steps)
+        except CalculatorError as e:
+            logging.error("Expression evaluation failed: %s", e)
+            raise
+
+        if steps:
+            # the steps were just computed, so record them without recomputing
+            timestamp = datetime.datetime.now()
+            calculations = [
+                Calculation.restore(
+                    operation=str(operation),
+                    operand1=operand1,
+                    operand2=operand2,
+                    result=step_result,
+                    timestamp=timestamp
+                )
+                for operation, operand1, operand2, step_result in steps
+            ]
+            evicted = self.history.extend(calculations)
+            memento = CalculatorMemento.from_append(calculations, evicted, self.history.max_size)
+            self.undo_stack.append(memento)
+            self._archive.push(memento.evicted)
+            self.redo_stack.clear()
+            self.notify_observers_batch(calculations)
+
+        logging.info("Evaluated %s = %s", expression, result)
+        return result
+
     def save_history(self) -> None:
         """
-        Save calculation history to a CSV file using pandas.
+        Save calculation history to the history file.
 
-        Serializes the history of calculations and writes them to a CSV file for
-        persistent storage. Utilizes pandas DataFrames for efficient data handling.
+        Serializes the history of calculations and writes them in the format
+        given by config.history_file_format: CSV, Parquet or Feather using
+        pandas DataFrames, or a binary history file.
 
         Raises:
             OperationError: If saving the history fails.
         """
+        self.write_history(self.snapshot_history())
+
+    def snapshot_history(self) -> HistorySnapshot:
+        """
+        Copy the current history for writing, possibly on another thread.
+
+        Only the history's columns and the archived calculations not yet in
+        the history file are copied; serializing and writing them is left to
+        write_history.
+
+        Returns:
+            HistorySnapshot: The numbered copy of the history.
+        """
+        return HistorySnapshot(
+            next(self._snapshot_sequence),
+            self.history.to_columns(),
+            self._archive.snapshot()
+        )
+
+    def write_history(self, snapshot: HistorySnapshot) -> None:
+        """
+        Write a history snapshot to the history file.
+
+        The new file starts with the archived calculations older than the
+        history: the records the history file already holds before the
+        history are copied, followed by the calculations evicted since then.
+        The snapshot's history is written after them.
+
+        The snapshot is written to a temporary file next to the history file,
+        which then atomically replaces it, so a crash during the write leaves
+        the previous history file intact. Whether the new file is also forced
+        to disk is decided by config.history_fsync. Writes are serialized,
+        and a snapshot older than the one last written is skipped. Safe to
+        call from a background thread.
+
+        Args:
+            snapshot (HistorySnapshot): The snapshot to write.
+
+        Raises:
+            OperationError: If writing the history fails.
+        """
+        history_file = self.config.history_file
+        archive = snapshot.archive or ArchiveSnapshot(0, [], 0)
         try:
-            # Ensure the history directory exists
-            self.config.history_dir.mkdir(parents=True, exist_ok=True)
-
-            history_data = []
-            for calc in self.history:
-                # Serialize each Calculation instance to a dictionary
-                history_data.append({
-                    'operation': str(calc.operation),
-                    'operand1': str(calc.operand1),
-                    'operand2': str(calc.operand2),
-                    'result': str(calc.result),
-                    'timestamp': calc.timestamp.isoformat()
-                })
-
-            if history_data:
-                # Create a pandas DataFrame from the history data
-                df = pd.DataFrame(history_data)
-                # Write the DataFrame to a CSV file without the index
-                df.to_csv(self.config.history_file, index=False)
-                logging.info(f"History saved successfully to {self.config.history_file}")
-            else:
-                # If history is empty, create an empty CSV with headers
-                pd.DataFrame(columns=['operation', 'operand1', 'operand2', 'result', 'timestamp']
-                           ).to_csv(self.config.history_file, index=False)
-                logging.info("Empty history saved")
+            with self._write_lock:
+                if snapshot.sequence < self._written_sequence:
+                    logging.info("Skipped writing history snapshot superseded by a newer one")
+                    return
+
+                # Ensure the history directory exists
+                self.config.history_dir.mkdir(parents=True, exist_ok=True)
+
+                file_format = self.config.history_file_format
+                with self._history_file_writer.replace(history_file) as temp_file:
+                    if file_format == 'binary':
+                        position = self._save_history_binary(snapshot.columns, archive, temp_file)
+                    elif file_format in ('parquet', 'feather'):
+                        position = self._save_history_arrow(
+                            snapshot.columns, archive, temp_file, file_format
+                        )
+                    else:
+                        position = self._save_history_csv(snapshot.columns, archive, temp_file)
+                self._written_sequence = snapshot.sequence
+                if snapshot.archive is not None:
+                    self._archive.written(snapshot.archive, position)
+
+                if len(snapshot):
+                    logging.info(f"History saved successfully to {history_file}")
+                else:
+                    logging.info("Empty history saved")
+
+                # The snapshot now contains every journaled calculation and nothing older.
+                # If the process stops before the journal is cleared, load_history
+                # recognizes the journaled calculations in the snapshot and skips them.
+                self.journal.clear()
 
         except Exception as e:
             # Log and raise an OperationError if saving fails
             logging.error(f"Failed to save history: {e}")
             raise OperationError(f"Failed to save history: {e}")
 
+    def _save_history_csv(self, columns: Dict[str, Any], archive: ArchiveSnapshot, path: Path) -> int:
+        """
+        Write history columns as CSV using pandas.
+
+        The header and the archived records already in the history file are
+        copied byte for byte, so older records are not parsed again.
+
+        Args:
+            columns (Dict[str, Any]): The history as returned by HistoryBuffer.to_columns().
+            archive (ArchiveSnapshot): The calculations older than the history.
+            path (Path): File to write.
+
+        Returns:
+            int: Byte offset of the end of the archived records in the new file.
+        """
+        import numpy as np
+        import pandas as pd
+
+        if archive.position:
+            with open(self.config.history_file, 'rb') as history_file, open(path, 'wb') as csv_file:
+                copy_prefix(history_file, csv_file, archive.position)
+        if archive.pending:
+            columns = concat_columns(columns_of(archive.pending), columns)
+
+        # Format timestamps the same way as Calculation.to_dict
+        columns = dict(columns, timestamp=np.datetime_as_string(columns['timestamp'], unit='us'))
+        # Write the DataFrame to a CSV file without the index; an empty
+        # history produces a file holding only the header
+        pd.DataFrame(columns, columns=list(COLUMNS)).to_csv(
+            path,
+            mode='a' if archive.position else 'w',
+            index=False,
+            header=not archive.position
+        )
+
+        if not archive.pending:
+            return archive.position
+        # the history's records follow the newly archived ones
+        with open(path, 'rb') as csv_file:
+            csv_file.readline()
+            data_start = csv_file.tell()
+            end = csv_file.seek(0, os.SEEK_END)
+            return line_start_before(csv_file, end, len(columns['operation']) - len(archive.pending), data_start)
+
+    def _save_history_binary(self, columns: Dict[str, Any], archive: ArchiveSnapshot, path: Path) -> int:
+        """
+        Write history columns as a binary history file.
+
+        Args:
+            columns (Dict[str, Any]): The history as returned by HistoryBuffer.to_columns().
+            archive (ArchiveSnapshot): The calculations older than the history.
+            path (Path): File to write.
+
+        Returns:
+            int: Number of archived records in the new file.
+        """
+        archived = []
+        if archive.position:
+            archived = BinaryHistoryFile(self.config.history_file).read(
+                0, archive.position, verify=False
+            )
+        # Fixed-width records sharing a table of distinct strings
+        BinaryHistoryFile(path).write(concat_columns(
+            columns_of(archived), columns_of(archive.pending), columns
+        ))
+        return archive.position + len(archive.pending)
+
+    def _save_history_arrow(
+        self,
+        columns: Dict[str, Any],
+        archive: ArchiveSnapshot,
+        path: Path,
+        file_format: str
+    ) -> int:
+        """
+        Write history columns as Parquet or Feather.
+
+        Columns are typed: the operation is categorical, operands and results
+        are exact decimal strings and timestamps are datetime64 values.
+        Requires pyarrow.
+
+        Args:
+            columns (Dict[str, Any]): The history as returned by HistoryBuffer.to_columns().
+            archive (ArchiveSnapshot): The calculations older than the history.
+            path (Path): File to write.
+            file_format (str): 'parquet' or 'feather'.
+
+        Returns:
+            int: Number of archived records in the new file.
+        """
+        import pandas as pd
+
+        df = pd.DataFrame(concat_columns(columns_of(archive.pending), columns))
+        if archive.position:
+            archived = self._read_arrow_history(file_format).iloc[:archive.position]
+            df = pd.concat([archived, df], ignore_index=True)
+        df['operation'] = df['operation'].astype('category')
+        if file_format == 'parquet':
+            df.to_parquet(path, index=False)
+        else:
+            df.to_feather(path)
+        return archive.position + len(archive.pending)
+
+    def _archive_position_before(self, position: int, count: int) -> int:
+        """
+        Find where records archived in the history file start, counting back from a position.
+
+        Args:
+            position (int): End of the archived records: a byte offset in a CSV
+                history file, a record count in the other formats.
+            count (int): Number of records to step back over.
+
+        Returns:
+            int: Position of the first of the count records.
+        """
+        if self.config.history_file_format != 'csv':
+            return max(position - count, 0)
+        with open(self.config.history_file, 'rb') as history_file:
+            history_file.readline()
+            return line_start_before(history_file, position, count, history_file.tell())
+
     def load_history(self) -> None:
         """
-        Load calculation history from a CSV file using pandas.
+        Load calculation history from the history file.
 
-        Reads the calculation history from a CSV file and reconstructs the
-        Calculation instances, restoring the calculator's history.
+        Reads the calculation history in the format given by
+        config.history_file_format (CSV, Parquet, Feather or binary) and reconstructs the
+        Calculation instances, restoring the calculator's history. Unless
+        history_verify is 'full', stored results are restored without being
+        recomputed and are checked afterwards by verify_history, on a sample
+        ('sample'), in a background thread ('background') or not at all ('none').
 
         Raises:
             OperationError: If loading the history fails.
         """
+        # in 'full' mode every row is recomputed while loading, otherwise the
+        # stored results are trusted and optionally checked afterwards
+        verify_mode = self.config.history_verify
+        verify = verify_mode == 'full'
         try:
-            if self.config.history_file.exists():
-                # Read the CSV file into a pandas DataFrame
-                df = pd.read_csv(self.config.history_file)
-                if not df.empty:
-                    # Deserialize each row into a Calculation instance
-                    self.history = [
-                        Calculation.from_dict({
-                            'operation': row['operation'],
-                            'operand1': row['operand1'],
-                            'operand2': row['operand2'],
-                            'result': row['result'],
-                            'timestamp': row['timestamp']
-                        })
-                        for _, row in df.iterrows()
-                    ]
+            # Recomputed results use the configured precision
+            with decimal_math.precision(self.config.precision):
+                # Records older than the loaded history stay on disk, in the archive
+                if not self.config.history_file.exists():
+                    # If no history file exists, start with an empty history
+                    self.history = []
+                    logging.info("No history file found - starting with empty history")
+                elif self.config.history_file_format == 'binary':
+                    # Only the records that fit in the history are read
+                    history_file = BinaryHistoryFile(self.config.history_file)
+                    self.history = history_file.read(-self.config.max_history_size, verify=verify)
+                    self._archive.reset(len(history_file) - len(self.history))
                     logging.info(f"Loaded {len(self.history)} calculations from history")
+                elif self.config.history_file_format in ('parquet', 'feather'):
+                    self._load_history_arrow(self.config.history_file_format, verify)
                 else:
-                    logging.info("Loaded empty history file")
-            else:
-                # If no history file exists, start with an empty history
-                logging.info("No history file found - starting with empty history")
+                    self._load_history_csv(verify)
+
+                # Replay calculations journaled since the snapshot was written
+                journaled = self.journal.read(verify)
+                if journaled and self._snapshot_contains(journaled):
+                    # The snapshot was written after these calculations were journaled,
+                    # but the journal was not cleared (the process stopped in between)
+                    self.journal.clear()
+                    logging.info("Discarded history journal already contained in the history file")
+                elif journaled:
+                    self._archive.push(self.history.extend(journaled))
+                    logging.info(f"Replayed {len(journaled)} calculations from history journal")
         except Exception as e:
             # Log and raise an OperationError if loading fails
             logging.error(f"Failed to load history: {e}")
             raise OperationError(f"Failed to load history: {e}")
 
-    def get_history_dataframe(self) -> pd.DataFrame:
+        loaded = self.history.copy()
+        if verify_mode == 'sample':
+            sample_size = min(self.config.history_verify_sample_size, len(loaded))
+            self.verify_history(random.sample(loaded, sample_size))
+        elif verify_mode == 'background' and loaded:
+            self._verify_thread = threading.Thread(
+                target=self.verify_history,
+                args=(loaded,),
+                name='history-verifier',
+                daemon=True
+            )
+            self._verify_thread.start()
+
+    def _snapshot_contains(self, journaled: List[Calculation]) -> bool:
+        """
+        Check whether the loaded history file already contains journaled calculations.
+
+        write_history replaces the history file before it clears the journal,
+        so a crash in between leaves a journal whose calculations are also in
+        the new history file. Journaled calculations are newer than every
+        calculation in the history file they were journaled against, so
+        finding any of them in the loaded history means the file was written
+        after them and supersedes the whole journal. Calculations are matched
+        by operation, operands, result and timestamp.
+
+        The check cannot recognize a history file written after every journaled
+        calculation was undone or cleared; those calculations are replayed.
+
+        Args:
+            journaled (List[Calculation]): Calculations read from the journal.
+
+        Returns:
+            bool: True if the journal must not be replayed.
+        """
+        def key(calculation: Calculation) -> tuple:
+            return (
+                calculation.operation,
+                calculation.operand1,
+                calculation.operand2,
+                calculation.result,
+                calculation.timestamp
+            )
+
+        journaled_keys = {key(calculation) for calculation in journaled}
+        return any(key(calculation) in journaled_keys for calculation in self.history)
+
+    def _load_history_csv(self, verify: bool) -> None:
+        """
+        Read the newest calculations from a CSV history file.
+
+        Only the last max_history_size records are read: their start is found
+        by scanning backwards from the end of the file, so startup time does
+        not grow with the number of older records in the file. The records
+        are parsed with the csv module rather than pandas, so loading the
+        history at startup does not import pandas.
+
+        Args:
+            verify (bool): Whether to recompute each result while loading.
+        """
+        with open(self.config.history_file, 'rb') as history_file:
+            header = history_file.readline()
+            data_start = history_file.tell()
+            end = history_file.seek(0, os.SEEK_END)
+            start = line_start_before(history_file, end, self.config.max_history_size, data_start)
+            history_file.seek(start)
+            lines = history_file.read().decode('utf-8').splitlines()
+
+        names = next(csv.reader([header.decode('utf-8')]), [])
+        # values are kept as text, so they keep their exact decimal digits
+        rows = [row for row in csv.reader(lines) if row]
+        if not rows:
+            self.history = []
+            self._archive.reset(start)
+            logging.info("Loaded empty history file")
+            return
+
+        positions = [names.index(column) for column in COLUMNS]
+        from_row = Calculation.from_row
+        self.history = [
+            from_row(*(row[position] for position in positions), verify)
+            for row in rows
+        ]
+        # the records before the tail are archived
+        self._archive.reset(start)
+        logging.info(f"Loaded {len(self.history)} calculations from history")
+
+    def _load_history_arrow(self, file_format: str, verify: bool) -> None:
+        """
+        Read the newest calculations from a Parquet or Feather history file.
+
+        Requires pyarrow.
+
+        Args:
+            file_format (str): 'parquet' or 'feather'.
+            verify (bool): Whether to recompute each result while loading.
+        """
+        df = self._read_arrow_history(file_format)
+        self.history = self._calculations_from_frame(
+            df.tail(self.config.max_history_size), verify
+        )
+        self._archive.reset(len(df) - len(self.history))
+        logging.info(f"Loaded {len(self.history)} calculations from history")
+
+    def _read_arrow_history(self, file_format: str) -> 'pd.DataFrame':
+        """
+        Read a Parquet or Feather history file into a DataFrame.
+
+        Args:
+            file_format (str): 'parquet' or 'feather'.
+
+        Returns:
+            pd.DataFrame: The history file's contents.
+        """
+        import pandas as pd
+
+        if file_format == 'parquet':
+            return pd.read_parquet(self.config.history_file)
+        return pd.read_feather(self.config.history_file)
+
+    @staticmethod
+    def _calculations_from_frame(df: 'pd.DataFrame', verify: bool) -> List[Calculation]:
+        """
+        Build Calculation instances straight from the columns of a history DataFrame.
+
+        Args:
+            df (pd.DataFrame): History records, with timestamps as ISO strings or datetime64 values.
+            verify (bool): Whether to recompute each result.
+
+        Returns:
+            List[Calculation]: The calculations, in the DataFrame's order.
+        """
+        timestamps = df['timestamp']
+        if timestamps.dtype.kind == 'M':
+            # timestamps are converted in one step instead of parsing a string per row
+            timestamps = timestamps.to_numpy(dtype='datetime64[us]').tolist()
+        from_row = Calculation.from_row
+        return [
+            from_row(operation, operand1, operand2, result, timestamp, verify)
+            for operation, operand1, operand2, result, timestamp in zip(
+                df['operation'].astype(str),
+                df['operand1'],
+                df['operand2'],
+                df['result'],
+                timestamps
+            )
+        ]
+
+    def iter_history_pages(self, page_size: int = 100) -> Iterator[List[Calculation]]:
+        """
+        Lazily read the archived calculations, which are older than the history.
+
+        load_history keeps only the newest max_history_size records of the
+        history file, and calculations evicted from the history later are
+        archived as well; saving the history keeps all of them in the file.
+        This generator reads them on demand, one page at a time, newest page
+        first. Calculations evicted since the last save are held in memory;
+        CSV and binary history files are read backwards page by page, and
+        Parquet and Feather files are read whole once.
+
+        Args:
+            page_size (int, optional): Number of calculations per page. Defaults to 100.
+
+        Yields:
+            List[Calculation]: A page of calculations, oldest first within the page.
+
+        Raises:
+            OperationError: If the history file cannot be read.
+        """
+        archive = self._archive.snapshot()
+        end = len(archive.pending)
+        while end > 0:
+            start = max(end - page_size, 0)
+            yield archive.pending[start:end]
+            end = start
+
+        if not archive.position or not self.config.history_file.exists():
+            return
+        verify = self.config.history_verify == 'full'
+        file_format = self.config.history_file_format
+
+        try:
+            if file_format == 'csv':
+                pages = self._csv_history_pages(archive.position, page_size, verify)
+            elif file_format == 'binary':
+                pages = self._binary_history_pages(archive.position, page_size, verify)
+            else:
+                pages = self._arrow_history_pages(file_format, archive.position, page_size, verify)
+            yield from pages
+        except Exception as e:
+            logging.error(f"Failed to read history page: {e}")
+            raise OperationError(f"Failed to read history page: {e}")
+
+    def _csv_history_pages(self, end: int, page_size: int, verify: bool) -> Iterator[List[Calculation]]:
+        """
+        Read pages of a CSV history file backwards from a byte offset.
+
+        Args:
+            end (int): Byte offset of the end of the archived records.
+            page_size (int): Number of calculations per page.
+            verify (bool): Whether to recompute each result.
+
+        Yields:
+            List[Calculation]: A page of calculations, oldest first within the page.
+        """
+        with open(self.config.history_file, 'rb') as history_file:
+            header = next(csv.reader([history_file.readline().decode('utf-8')]), None)
+            data_start = history_file.tell()
+            while end > data_start:
+                start = line_start_before(history_file, end, page_size, data_start)
+                history_file.seek(start)
+                lines = history_file.read(end - start).decode('utf-8').splitlines()
+                with decimal_math.precision(self.config.precision):
+                    page = [
+                        Calculation.from_dict(row, verify)
+                        for row in csv.DictReader(lines, fieldnames=header)
+                    ]
+                yield page
+                end = start
+
+    def _binary_history_pages(self, end: int, page_size: int, verify: bool) -> Iterator[List[Calculation]]:
+        """
+        Read pages of a binary history file backwards from a record.
+
+        Args:
+            end (int): Number of archived records.
+            page_size (int): Number of calculations per page.
+            verify (bool): Whether to recompute each result.
+
+        Yields:
+            List[Calculation]: A page of calculations, oldest first within the page.
+        """
+        history_file = BinaryHistoryFile(self.config.history_file)
+        while end > 0:
+            start = max(end - page_size, 0)
+            with decimal_math.precision(self.config.precision):
+                page = history_file.read(start, end, verify)
+            yield page
+            end = start
+
+    def _arrow_history_pages(
+        self,
+        file_format: str,
+        end: int,
+        page_size: int,
+        verify: bool
+    ) -> Iterator[List[Calculation]]:
+        """
+        Read pages of a Parquet or Feather history file backwards from a record.
+
+        Args:
+            file_format (str): 'parquet' or 'feather'.
+            end (int): Number of archived records.
+            page_size (int): Number of calculations per page.
+            verify (bool): Whether to recompute each result.
+
+        Yields:
+            List[Calculation]: A page of calculations, oldest first within the page.
+        """
+        df = self._read_arrow_history(file_format)
+        while end > 0:
+            start = max(end - page_size, 0)
+            with decimal_math.precision(self.config.precision):
+                page = self._calculations_from_frame(df.iloc[start:end], verify)
+            yield page
+            end = start
+
+    def verify_history(self, calculations: Optional[Iterable[Calculation]] = None) -> int:
+        """
+        Recompute loaded calculations and report results that do not match.
+
+        Used by the 'sample' and 'background' history_verify modes, where
+        load_history restores stored results without recomputing them.
+        Mismatches are logged as warnings.
+
+        Args:
+            calculations (Optional[Iterable[Calculation]], optional): The calculations to check.
+                Defaults to the whole history.
+
+        Returns:
+            int: Number of calculations whose stored result could not be verified.
+        """
+        if calculations is None:
+            calculations = self.history.copy()
+        mismatches = 0
+        checked = 0
+        # this may run in a background thread, so set the precision here
+        with decimal_math.precision(self.config.precision):
+            for calculation in calculations:
+                checked += 1
+                if not calculation.verify():
+                    mismatches += 1
+        logging.info(f"Verified {checked} loaded calculations, {mismatches} mismatched")
+        return mismatches
+
+    def append_history(self, calculation: Calculation) -> None:
+        """
+        Persist a single calculation by appending it to the history journal.
+
+        Appending costs the same regardless of history size. Once the journal
+        holds journal_compact_interval records it is compacted into the
+        history file by a full save.
+
+        Args:
+            calculation (Calculation): The calculation to persist.
+
+        Raises:
+            OperationError: If appending to the journal fails.
+        """
+        try:
+            self.journal.append(calculation)
+        except Exception as e:
+            # Log and raise an OperationError if appending fails
+            logging.error(f"Failed to append history: {e}")
+            raise OperationError(f"Failed to append history: {e}")
+
+        if len(self.journal) >= self.config.journal_compact_interval:
+            self.save_history()
+            logging.info("History journal compacted")
+
+    def append_history_batch(self, calculations: List[Calculation]) -> None:
+        """
+        Persist a batch of calculations by appending them to the history journal.
+
+        The whole batch is appended with a single write, and the journal is
+        compacted at most once.
+
+        Args:
+            calculations (List[Calculation]): The calculations to persist, oldest first.
+
+        Raises:
+            OperationError: If appending to the journal fails.
+        """
+        try:
+            self.journal.extend(calculations)
+        except Exception as e:
+            # Log and raise an OperationError if appending fails
+            logging.error(f"Failed to append history: {e}")
+            raise OperationError(f"Failed to append history: {e}")
+
+        if len(self.journal) >= self.config.journal_compact_interval:
+            self.save_history()
+            logging.info("History journal compacted")
+
+    def _rewrite_journaled_history(self) -> None:
+        """
+        Rewrite the history file after a change the journal cannot record.
+
+        The journal only records appended calculations, so undo, redo and clear
+        must write a fresh snapshot when journaled auto-saving is enabled.
+        """
+        if self.config.auto_save and self.config.history_journal:
+            self.save_history()
+
+    def get_history_dataframe(self) -> 'pd.DataFrame':
         """
         Get calculation history as a pandas DataFrame.
 
-        Converts the list of Calculation instances into a pandas DataFrame for
-        advanced data manipulation or analysis.
+        Builds the DataFrame from the history's columns for advanced data
+        manipulation or analysis. With the columnar history backend each
+        column is copied as a whole.
 
         Returns:
             pd.DataFrame: DataFrame containing the calculation history.
         """
-        history_data = []
-        for calc in self.history:
-            history_data.append({
-                'operation': str(calc.operation),
-                'operand1': str(calc.operand1),
-                'operand2': str(calc.operand2),
-                'result': str(calc.result),
-                'timestamp': calc.timestamp
-            })
-        return pd.DataFrame(history_data)
+        import pandas as pd
+
+        return pd.DataFrame(self.history.to_columns())
 
     def show_history(self) -> List[str]:
         """
@@ -339,6 +1233,18 @@ class Calculator:
         Returns:
             List[str]: List of formatted calculation history entries.
         """
+        if isinstance(self.history, ColumnarHistoryBuffer):
+            # format straight from the stored strings
+            columns = self.history.to_columns()
+            return [
+                f"{operation}({operand1}, {operand2}) = {result}"
+                for operation, operand1, operand2, result in zip(
+                    columns['operation'],
+                    columns['operand1'],
+                    columns['operand2'],
+                    columns['result']
+                )
+            ]
         return [
             f"{calc.operation}({calc.operand1}, {calc.operand2}) = {calc.result}"
             for calc in self.history
@@ -349,11 +1255,25 @@ class Calculator:
         Clear calculation history.
 
         Empties the calculation history and clears the undo and redo stacks.
+        The older calculations kept in the history file are cleared too.
         """
         self.history.clear()
         self.undo_stack.clear()
         self.redo_stack.clear()
+        self._archive.reset()
         logging.info("History cleared")
+        self._rewrite_journaled_history()
+        self.notify_history_changed()
+        self.flush_observers()
+
+    def get_undo_memory_usage(self) -> int:
+        """
+        Get the memory currently used by the undo and redo stacks.
+
+        Returns:
+            int: Approximate number of bytes held by both stacks.
+        """
+        return self.undo_stack.memory_usage + self.redo_stack.memory_usage
 
     def undo(self) -> bool:
         """
@@ -369,10 +1289,16 @@ class Calculator:
             return False
         # Pop the last state from the undo stack
         memento = self.undo_stack.pop()
-        # Push the current state onto the redo stack
-        self.redo_stack.append(CalculatorMemento(self.history.copy()))
-        # Restore the history from the memento
-        self.history = memento.history.copy()
+        # Revert the recorded change and push its inverse onto the redo stack
+        history, redo_memento = memento.revert(self.history)
+        self._replace_history(history)
+        if memento.is_delta:
+            # the calculations put back at the head of the history leave the archive
+            self._archive.restore(len(memento.evicted))
+        self.redo_stack.append(redo_memento)
+        self._rewrite_journaled_history()
+        self.notify_history_changed()
+        self.flush_observers()
         return True
 
     def redo(self) -> bool:
@@ -388,9 +1314,14 @@ class Calculator:
             return False
         # Pop the last state from the redo stack
         memento = self.redo_stack.pop()
-        # Push the current state onto the undo stack
-        self.undo_stack.append(CalculatorMemento(self.history.copy()))
-        # Restore the history from the memento
-        self.history = memento.history.copy()
+        # Reapply the recorded change and push it back onto the undo stack
+        history, undo_memento = memento.apply(self.history)
+        self._replace_history(history)
+        if memento.is_delta:
+            self._archive.push(memento.evicted)
+        self.undo_stack.append(undo_memento)
+        self._rewrite_journaled_history()
+        self.notify_history_changed()
+        self.flush_observers()
         return True
         
\ No newline at end of file
@@ -13,6 +13,38 @@ from app.exceptions import ConfigurationError
 # load environment variables from a .env file into the programs environment
 load_dotenv()
 
+# supported values of CalculatorConfig.history_verify
+HISTORY_VERIFY_MODES = ('full', 'sample', 'background', 'none')
+
+# supported values of CalculatorConfig.history_backend
+HISTORY_BACKENDS = ('objects', 'columnar')
+
+# supported values of CalculatorConfig.history_format
+HISTORY_FORMATS = ('auto', 'csv', 'binary', 'parquet', 'feather')
+
+# supported values of CalculatorConfig.history_fsync
+HISTORY_FSYNC_POLICIES = ('always', 'interval', 'never')
+
+# supported values of CalculatorConfig.observer_dispatch
+OBSERVER_DISPATCH_MODES = ('inline', 'thread')
+
+# supported values of CalculatorConfig.observer_queue_policy
+OBSERVER_QUEUE_POLICIES = ('block', 'drop')
+
+# supported values of CalculatorConfig.log_level
+LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+
+# supported values of CalculatorConfig.operation_cache_eviction
+OPERATION_CACHE_EVICTIONS = ('lru', 'fifo')
+
+# history file extensions and their formats, used when history_format is 'auto'
+HISTORY_FORMAT_SUFFIXES = {
+    '.bin': 'binary',
+    '.parquet': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+}
+
 def get_project_root() -> Path:
     """
     get project root directory
@@ -50,7 +82,29 @@ class CalculatorConfig:
         auto_save: Optional[bool] = None,
         precision: Optional[int] = None,
         max_input_value: Optional[Number] = None,
-        default_encoding: Optional[str] = None
+        default_encoding: Optional[str] = None,
+        history_journal: Optional[bool] = None,
+        journal_compact_interval: Optional[int] = None,
+        max_undo_depth: Optional[int] = None,
+        undo_memory_budget: Optional[int] = None,
+        history_verify: Optional[str] = None,
+        history_verify_sample_size: Optional[int] = None,
+        history_backend: Optional[str] = None,
+        history_format: Optional[str] = None,
+        auto_save_coalesce: Optional[bool] = None,
+        auto_save_interval: Optional[float] = None,
+        auto_save_batch_size: Optional[int] = None,
+        auto_save_background: Optional[bool] = None,
+        history_writer_queue_size: Optional[int] = None,
+        history_fsync: Optional[str] = None,
+        history_fsync_interval: Optional[float] = None,
+        observer_dispatch: Optional[str] = None,
+        observer_queue_size: Optional[int] = None,
+        observer_queue_policy: Optional[str] = None,
+        log_queue: Optional[bool] = None,
+        log_level: Optional[str] = None,
+        operation_cache_size: Optional[int] = None,
+        operation_cache_eviction: Optional[str] = None
     ):
         """
         Initialize configuration with environment variables and defaults.
@@ -62,6 +116,56 @@ class CalculatorConfig:
             precision (Optional[int], optional): Number of decimal places for calculations. Defaults to None.
             max_input_value (Optional[Number], optional): Maximum allowed input value. Defaults to None.
             default_encoding (Optional[str], optional): Default encoding for file operations. Defaults to None.
+            history_journal (Optional[bool], optional): Whether auto-save appends to a journal instead of
+                rewriting the whole history file. Defaults to None.
+            journal_compact_interval (Optional[int], optional): Number of journal records after which the
+                journal is compacted into the history file. Defaults to None.
+            max_undo_depth (Optional[int], optional): Maximum number of mementos kept on each of the
+                undo and redo stacks. Defaults to None.
+            undo_memory_budget (Optional[int], optional): Approximate number of bytes each of the undo
+                and redo stacks may use, 0 for no limit. Defaults to None.
+            history_verify (Optional[str], optional): How loaded history results are checked: 'full'
+                recomputes every row while loading, 'sample' recomputes a random sample, 'background'
+                recomputes every row in a background thread and 'none' trusts the stored results.
+                Defaults to None.
+            history_verify_sample_size (Optional[int], optional): Number of rows recomputed in 'sample'
+                mode. Defaults to None.
+            history_backend (Optional[str], optional): How the history is held in memory: 'objects'
+                keeps Calculation instances, 'columnar' keeps one column per field so exports
+                copy whole columns. Defaults to None.
+            history_format (Optional[str], optional): Format of the history file: 'csv', 'binary',
+                'parquet', 'feather' or 'auto' to choose by the file extension. Defaults to None.
+            auto_save_coalesce (Optional[bool], optional): Whether auto-save defers writes and saves
+                once for several calculations. Defaults to None.
+            auto_save_interval (Optional[float], optional): Seconds after the last coalesced save
+                after which the next calculation is saved. Defaults to None.
+            auto_save_batch_size (Optional[int], optional): Number of unsaved calculations after which
+                a coalesced save is made. Defaults to None.
+            auto_save_background (Optional[bool], optional): Whether auto-save hands the history to
+                a background writer thread instead of writing it during the calculation.
+                Defaults to None.
+            history_writer_queue_size (Optional[int], optional): Number of history snapshots that may
+                wait for the background writer before auto-save blocks. Defaults to None.
+            history_fsync (Optional[str], optional): When history file writes are forced to disk:
+                'always', at most once per history_fsync_interval seconds ('interval'), or 'never'.
+                Defaults to None.
+            history_fsync_interval (Optional[float], optional): Minimum seconds between forced
+                writes with the 'interval' policy. Defaults to None.
+            observer_dispatch (Optional[str], optional): How the logging observer is notified:
+                'inline' during the calculation, or 'thread' on its own worker thread.
+                Defaults to None.
+            observer_queue_size (Optional[int], optional): Number of notifications that may wait
+                for an observer's worker thread. Defaults to None.
+            observer_queue_policy (Optional[str], optional): What happens when an observer's queue
+                is full: 'block' waits for room, 'drop' discards the notification. Defaults to None.
+            log_queue (Optional[bool], optional): Whether log records are written to the log file
+                by a background listener thread instead of the logging thread. Defaults to None.
+            log_level (Optional[str], optional): Minimum level of the records written to the log
+                file, such as 'INFO' or 'WARNING'. Defaults to None.
+            operation_cache_size (Optional[int], optional): Number of operation results cached for
+                repeated calculations, 0 to disable the cache. Defaults to None.
+            operation_cache_eviction (Optional[str], optional): Which cached result a full cache
+                evicts: the least recently used ('lru') or the oldest ('fifo'). Defaults to None.
         """
 
         # set base directory to project root by default
@@ -103,6 +207,120 @@ class CalculatorConfig:
             'CALCULATOR_DEFAULT_ENCODING', 'utf-8'
         )
 
+        # append-only history journal preference
+        history_journal_env = os.getenv('CALCULATOR_HISTORY_JOURNAL', 'false').lower()
+        self.history_journal = history_journal if history_journal is not None else (
+            history_journal_env == 'true' or history_journal_env == '1'
+        )
+
+        # number of journal records before compacting into the history file
+        self.journal_compact_interval = journal_compact_interval or int(
+            os.getenv('CALCULATOR_JOURNAL_COMPACT_INTERVAL', '100')
+        )
+
+        # maximum number of undo/redo steps kept
+        self.max_undo_depth = max_undo_depth or int(
+            os.getenv('CALCULATOR_MAX_UNDO_DEPTH', '1000')
+        )
+
+        # memory budget for each undo/redo stack in bytes (0 means unlimited)
+        self.undo_memory_budget = undo_memory_budget if undo_memory_budget is not None else int(
+            os.getenv('CALCULATOR_UNDO_MEMORY_BUDGET', '0')
+        )
+
+        # verification of results read from the history file
+        self.history_verify = (history_verify or os.getenv(
+            'CALCULATOR_HISTORY_VERIFY', 'full'
+        )).lower()
+
+        # number of rows recomputed when history_verify is 'sample'
+        self.history_verify_sample_size = history_verify_sample_size or int(
+            os.getenv('CALCULATOR_HISTORY_VERIFY_SAMPLE_SIZE', '100')
+        )
+
+        # in-memory representation of the history
+        self.history_backend = (history_backend or os.getenv(
+            'CALCULATOR_HISTORY_BACKEND', 'objects'
+        )).lower()
+
+        # history file format ('auto' picks the format from the file extension)
+        self.history_format = (history_format or os.getenv(
+            'CALCULATOR_HISTORY_FORMAT', 'auto'
+        )).lower()
+
+        # coalescing auto-save preference
+        auto_save_coalesce_env = os.getenv('CALCULATOR_AUTO_SAVE_COALESCE', 'false').lower()
+        self.auto_save_coalesce = auto_save_coalesce if auto_save_coalesce is not None else (
+            auto_save_coalesce_env == 'true' or auto_save_coalesce_env == '1'
+        )
+
+        # seconds between coalesced auto-saves
+        self.auto_save_interval = auto_save_interval if auto_save_interval is not None else float(
+            os.getenv('CALCULATOR_AUTO_SAVE_INTERVAL', '5')
+        )
+
+        # unsaved calculations that trigger a coalesced auto-save
+        self.auto_save_batch_size = auto_save_batch_size or int(
+            os.getenv('CALCULATOR_AUTO_SAVE_BATCH_SIZE', '100')
+        )
+
+        # background history writer preference
+        auto_save_background_env = os.getenv('CALCULATOR_AUTO_SAVE_BACKGROUND', 'false').lower()
+        self.auto_save_background = auto_save_background if auto_save_background is not None else (
+            auto_save_background_env == 'true' or auto_save_background_env == '1'
+        )
+
+        # snapshots waiting for the background writer before auto-save blocks
+        self.history_writer_queue_size = history_writer_queue_size or int(
+            os.getenv('CALCULATOR_HISTORY_WRITER_QUEUE_SIZE', '8')
+        )
+
+        # durability of history file writes
+        self.history_fsync = (history_fsync or os.getenv(
+            'CALCULATOR_HISTORY_FSYNC', 'always'
+        )).lower()
+
+        # seconds between forced writes when history_fsync is 'interval'
+        self.history_fsync_interval = history_fsync_interval if history_fsync_interval is not None else float(
+            os.getenv('CALCULATOR_HISTORY_FSYNC_INTERVAL', '30')
+        )
+
+        # thread on which observers are notified
+        self.observer_dispatch = (observer_dispatch or os.getenv(
+            'CALCULATOR_OBSERVER_DISPATCH', 'inline'
+        )).lower()
+
+        # notifications waiting for an observer's worker thread
+        self.observer_queue_size = observer_queue_size or int(
+            os.getenv('CALCULATOR_OBSERVER_QUEUE_SIZE', '1000')
+        )
+
+        # behavior when an observer's queue is full
+        self.observer_queue_policy = (observer_queue_policy or os.getenv(
+            'CALCULATOR_OBSERVER_QUEUE_POLICY', 'block'
+        )).lower()
+
+        # queue-based logging preference
+        log_queue_env = os.getenv('CALCULATOR_LOG_QUEUE', 'false').lower()
+        self.log_queue = log_queue if log_queue is not None else (
+            log_queue_env == 'true' or log_queue_env == '1'
+        )
+
+        # minimum level written to the log file
+        self.log_level = (log_level or os.getenv(
+            'CALCULATOR_LOG_LEVEL', 'INFO'
+        )).upper()
+
+        # results cached for repeated calculations (0 disables the cache)
+        self.operation_cache_size = operation_cache_size if operation_cache_size is not None else int(
+            os.getenv('CALCULATOR_OPERATION_CACHE_SIZE', '1024')
+        )
+
+        # cached result evicted when the cache is full
+        self.operation_cache_eviction = (operation_cache_eviction or os.getenv(
+            'CALCULATOR_OPERATION_CACHE_EVICTION', 'lru'
+        )).lower()
+
     @property
     def log_dir(self) -> Path:
         """
@@ -147,6 +365,40 @@ class CalculatorConfig:
             str(self.history_dir / "calculator_history.csv")
         )).resolve()
     
+    @property
+    def history_journal_file(self) -> Path:
+        """
+        get history journal file path.
+
+        determines the file path of the append-only journal holding calculations
+        recorded since the history file was last written.
+
+        Returns:
+            Path: the history journal file path.
+        """
+
+        history_file = self.history_file
+        return Path(os.getenv(
+            'CALCULATOR_HISTORY_JOURNAL_FILE',
+            str(history_file.with_name(history_file.name + ".journal"))
+        )).resolve()
+
+    @property
+    def history_file_format(self) -> str:
+        """
+        get the format of the history file.
+
+        the format is taken from history_format, or from the history file's
+        extension when history_format is 'auto' (CSV for unknown extensions).
+
+        Returns:
+            str: one of 'csv', 'binary', 'parquet' or 'feather'.
+        """
+
+        if self.history_format == 'auto':
+            return HISTORY_FORMAT_SUFFIXES.get(self.history_file.suffix.lower(), 'csv')
+        return self.history_format
+
     @property
     def log_file(self) -> Path:
         """
@@ -179,3 +431,55 @@ class CalculatorConfig:
             raise ConfigurationError("precision must be positive")
         if self.max_input_value <= 0:
             raise ConfigurationError("max_input_value must be positive")
+        if self.journal_compact_interval <= 0:
+            raise ConfigurationError("journal_compact_interval must be positive")
+        if self.max_undo_depth <= 0:
+            raise ConfigurationError("max_undo_depth must be positive")
+        if self.undo_memory_budget < 0:
+            raise ConfigurationError("undo_memory_budget must not be negative")
+        if self.history_verify not in HISTORY_VERIFY_MODES:
+            raise ConfigurationError(
+                f"history_verify must be one of: {', '.join(HISTORY_VERIFY_MODES)}"
+            )
+        if self.history_verify_sample_size <= 0:
+            raise ConfigurationError("history_verify_sample_size must be positive")
+        if self.history_backend not in HISTORY_BACKENDS:
+            raise ConfigurationError(
+                f"history_backend must be one of: {', '.join(HISTORY_BACKENDS)}"
+            )
+        if self.history_format not in HISTORY_FORMATS:
+            raise ConfigurationError(
+                f"history_format must be one of: {', '.join(HISTORY_FORMATS)}"
+            )
+        if self.auto_save_interval < 0:
+            raise ConfigurationError("auto_save_interval must not be negative")
+        if self.auto_save_batch_size <= 0:
+            raise ConfigurationError("auto_save_batch_size must be positive")
+        if self.history_writer_queue_size <= 0:
+            raise ConfigurationError("history_writer_queue_size must be positive")
+        if self.history_fsync not in HISTORY_FSYNC_POLICIES:
+            raise ConfigurationError(
+                f"history_fsync must be one of: {', '.join(HISTORY_FSYNC_POLICIES)}"
+            )
+        if self.history_fsync_interval < 0:
+            raise ConfigurationError("history_fsync_interval must not be negative")
+        if self.observer_dispatch not in OBSERVER_DISPATCH_MODES:
+            raise ConfigurationError(
+                f"observer_dispatch must be one of: {', '.join(OBSERVER_DISPATCH_MODES)}"
+            )
+        if self.observer_queue_size <= 0:
+            raise ConfigurationError("observer_queue_size must be positive")
+        if self.observer_queue_policy not in OBSERVER_QUEUE_POLICIES:
+            raise ConfigurationError(
+                f"observer_queue_policy must be one of: {', '.join(OBSERVER_QUEUE_POLICIES)}"
+            )
+        if self.log_level not in LOG_LEVELS:
+            raise ConfigurationError(
+                f"log_level must be one of: {', '.join(LOG_LEVELS)}"
+            )
+        if self.operation_cache_size < 0:
+            raise ConfigurationError("operation_cache_size must not be negative")
+        if self.operation_cache_eviction not in OPERATION_CACHE_EVICTIONS:
+            raise ConfigurationError(
+                f"operation_cache_eviction must be one of: {', '.join(OPERATION_CACHE_EVICTIONS)}"
+            )
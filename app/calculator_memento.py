@@ -1,10 +1,13 @@
 ### calculator memento
 
+from collections import deque
 from dataclasses import dataclass, field
 import datetime
-from typing import Any, Dict, List
+import sys
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from app.calculation import Calculation
+from app.history_buffer import HistoryBuffer
 
 # to_dict() is an instance method because it needs access 
     # to self — it works on an existing object.
@@ -22,10 +25,132 @@ class CalculatorMemento:
 
     The memento pattern allows the calculator to save its current state (history)
     so that it can be restored later. This enables features like undo and redo
+
+    A memento either holds a full snapshot of the history, or a delta describing
+    a single change: the calculations appended to the end of the history and the
+    calculations evicted from its head to respect max_history_size. Delta mementos
+    are undone and redone in constant time on the calculator's HistoryBuffer and
+    do not copy the history.
     """
 
-    history: List[Calculation] # list of Calculation instances representing the calculator's history
+    history: Optional[List[Calculation]] = None # full snapshot of the calculator's history, None for a delta
     timestamp: datetime.datetime = field(default_factory=datetime.datetime.now) # time when the memento was created
+    appended: List[Calculation] = field(default_factory=list) # calculations appended by the change
+    evicted: List[Calculation] = field(default_factory=list) # calculations evicted from the head by the change
+
+    @classmethod
+    def from_append(
+        cls,
+        appended: List[Calculation],
+        evicted: Optional[List[Calculation]] = None,
+        max_size: Optional[int] = None
+    ) -> 'CalculatorMemento':
+        """
+        Create a delta memento for calculations appended to the history.
+
+        When more calculations are appended than the history holds, the oldest
+        appended calculations are evicted by the newer ones of the same change.
+        Those are left out of the memento: only the appended calculations still
+        in the history are removed on undo, and only the calculations that were
+        in the history before the change are restored.
+
+        Args:
+            appended (List[Calculation]): Calculations appended to the end of the history.
+            evicted (Optional[List[Calculation]], optional): Calculations evicted from the
+                head of the history to make room, oldest first, as returned by
+                HistoryBuffer.extend. Defaults to None.
+            max_size (Optional[int], optional): Capacity of the history, None if every
+                appended calculation was kept. Defaults to None.
+
+        Returns:
+            CalculatorMemento: A delta memento describing the change.
+        """
+        appended = list(appended)
+        evicted = list(evicted or [])
+        if max_size is not None and len(appended) > max_size:
+            # the appended calculations evicted by the same change are the last ones evicted
+            dropped = len(appended) - max_size
+            appended = appended[dropped:]
+            evicted = evicted[:len(evicted) - dropped]
+        return cls(appended=appended, evicted=evicted)
+
+    @property
+    def is_delta(self) -> bool:
+        """
+        Check whether the memento stores a delta rather than a snapshot.
+
+        Returns:
+            bool: True if the memento is a delta, False if it is a full snapshot.
+        """
+        return self.history is None
+
+    def revert(self, history: HistoryBuffer) -> Tuple[Iterable[Calculation], 'CalculatorMemento']:
+        """
+        Undo the change recorded by this memento.
+
+        Args:
+            history (HistoryBuffer): The calculator's current history.
+
+        Returns:
+            Tuple[Iterable[Calculation], CalculatorMemento]: The restored history and the
+            memento to push onto the redo stack.
+        """
+        if not self.is_delta:
+            return self._swap(history)
+        for _ in self.appended:
+            history.pop()
+        for calc in reversed(self.evicted):
+            history.appendleft(calc)
+        return history, self
+
+    def apply(self, history: HistoryBuffer) -> Tuple[Iterable[Calculation], 'CalculatorMemento']:
+        """
+        Redo the change recorded by this memento.
+
+        Args:
+            history (HistoryBuffer): The calculator's current history.
+
+        Returns:
+            Tuple[Iterable[Calculation], CalculatorMemento]: The restored history and the
+            memento to push onto the undo stack.
+        """
+        if not self.is_delta:
+            return self._swap(history)
+        # the history buffer evicts the same head calculations again
+        history.extend(self.appended)
+        return history, self
+
+    def _swap(self, history: HistoryBuffer) -> Tuple[Iterable[Calculation], 'CalculatorMemento']:
+        """
+        Restore a snapshot memento, capturing the current history in its place.
+
+        The current history list is kept by reference rather than copied, since
+        the calculator continues with the restored list from here on.
+
+        Args:
+            history (HistoryBuffer): The calculator's current history.
+
+        Returns:
+            Tuple[Iterable[Calculation], CalculatorMemento]: The restored history and a
+            snapshot memento of the replaced history.
+        """
+        return list(self.history), CalculatorMemento(history)
+
+    def estimate_size(self) -> int:
+        """
+        Estimate the memory held by this memento.
+
+        Counts the memento itself, its calculation lists and the calculations
+        they reference, including each calculation's field values.
+
+        Returns:
+            int: Approximate size of the memento in bytes.
+        """
+        size = sys.getsizeof(self)
+        for calculations in (self.history or [], self.appended, self.evicted):
+            size += sys.getsizeof(calculations)
+            size += sum(_calculation_size(calc) for calc in calculations)
+        return size
 
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -37,6 +162,12 @@ class CalculatorMemento:
         Returns:
             Dict[str, Any]: A dictionary containing the serialized state of the memento.
         """
+        if self.is_delta:
+            return {
+                'appended': [calc.to_dict() for calc in self.appended],
+                'evicted': [calc.to_dict() for calc in self.evicted],
+                'timestamp': self.timestamp.isoformat()
+            }
         return {
             # For every calc in self.history, call calc.to_dict() and store the result in a list.
             'history': [calc.to_dict() for calc in self.history],
@@ -57,7 +188,141 @@ class CalculatorMemento:
         Returns:
             CalculatorMemento: A new instance of CalculatorMemento with restored state.
         """
+        if 'history' not in data:
+            return cls(
+                appended=[Calculation.from_dict(calc) for calc in data['appended']],
+                evicted=[Calculation.from_dict(calc) for calc in data['evicted']],
+                timestamp=datetime.datetime.fromisoformat(data['timestamp'])
+            )
         return cls(
             history=[Calculation.from_dict(calc) for calc in data['history']],
             timestamp=datetime.datetime.fromisoformat(data['timestamp'])
         )
+
+
+def _calculation_size(calculation: Calculation) -> int:
+    """
+    Estimate the memory held by a single calculation.
+
+    Args:
+        calculation (Calculation): The calculation to measure.
+
+    Returns:
+        int: Approximate size of the calculation in bytes.
+    """
+    size = sys.getsizeof(calculation)
+    for value in (calculation.operand1, calculation.operand2, calculation.result, calculation.timestamp):
+        size += sys.getsizeof(value)
+    return size
+
+
+class MementoStack:
+    """
+    Bounded stack of calculator mementos.
+
+    Behaves like the list previously used for the undo and redo stacks, but
+    evicts the oldest mementos once the stack holds more than max_depth
+    mementos or uses more than memory_budget bytes, so the stacks cannot
+    grow without bound in long-running sessions.
+    """
+
+    def __init__(self, max_depth: int, memory_budget: int = 0):
+        """
+        Initialize the stack.
+
+        Args:
+            max_depth (int): Maximum number of mementos kept.
+            memory_budget (int, optional): Approximate number of bytes the stack may use,
+                0 for no limit. Defaults to 0.
+        """
+        self.max_depth = max_depth
+        self.memory_budget = memory_budget
+        self.memory_usage = 0
+        # mementos and their estimated sizes, oldest first
+        self._mementos: Deque[CalculatorMemento] = deque()
+        self._sizes: Deque[int] = deque()
+
+    def append(self, memento: CalculatorMemento) -> None:
+        """
+        Push a memento, evicting the oldest mementos if a limit is exceeded.
+
+        Args:
+            memento (CalculatorMemento): The memento to push.
+        """
+        size = memento.estimate_size()
+        self._mementos.append(memento)
+        self._sizes.append(size)
+        self.memory_usage += size
+
+        while self._mementos and (
+            len(self._mementos) > self.max_depth or
+            (self.memory_budget and self.memory_usage > self.memory_budget)
+        ):
+            self._mementos.popleft()
+            self.memory_usage -= self._sizes.popleft()
+
+    def pop(self) -> CalculatorMemento:
+        """
+        Pop the most recently pushed memento.
+
+        Returns:
+            CalculatorMemento: The most recent memento.
+
+        Raises:
+            IndexError: If the stack is empty.
+        """
+        memento = self._mementos.pop()
+        self.memory_usage -= self._sizes.pop()
+        return memento
+
+    def clear(self) -> None:
+        """
+        Remove all mementos from the stack.
+        """
+        self._mementos.clear()
+        self._sizes.clear()
+        self.memory_usage = 0
+
+    def __getitem__(self, index: int) -> CalculatorMemento:
+        """
+        Return the memento at the given position, oldest first.
+
+        Args:
+            index (int): Position of the memento.
+
+        Returns:
+            CalculatorMemento: The memento at that position.
+        """
+        return self._mementos[index]
+
+    def __iter__(self) -> Iterator[CalculatorMemento]:
+        """
+        Iterate over the mementos, oldest first.
+
+        Returns:
+            Iterator[CalculatorMemento]: Iterator over the mementos.
+        """
+        return iter(self._mementos)
+
+    def __len__(self) -> int:
+        """
+        Return the number of mementos on the stack.
+
+        Returns:
+            int: Number of mementos.
+        """
+        return len(self._mementos)
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Compare the stack's mementos with another stack or a list.
+
+        Args:
+            other (object): A MementoStack or list of mementos.
+
+        Returns:
+            bool: True if both hold the same mementos in the same order.
+        """
+        if isinstance(other, (MementoStack, list)):
+            return list(self) == list(other)
+        return NotImplemented
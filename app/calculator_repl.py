@@ -5,7 +5,14 @@ import logging
 
 from app.calculator import Calculator
 from app.exceptions import OperationError, ValidationError
-from app.history import AutoSaveObserver, LoggingObserver
+from app.history import (
+    AutoSaveObserver,
+    BackgroundAutoSaveObserver,
+    CoalescingAutoSaveObserver,
+    JournalAutoSaveObserver,
+    LoggingObserver,
+    QueuedObserver,
+)
 from app.operations import OperationFactory
 
 def calculator_repl():
@@ -20,8 +27,23 @@ def calculator_repl():
         calc = Calculator()
 
         # register observers for logging and auto-saving history
-        calc.add_observer(LoggingObserver())
-        calc.add_observer(AutoSaveObserver(calc))
+        if calc.config.observer_dispatch == 'thread':
+            # logging only needs the calculation, so it can run on its own thread
+            calc.add_observer(QueuedObserver(
+                LoggingObserver(),
+                calc.config.observer_queue_size,
+                calc.config.observer_queue_policy
+            ))
+        else:
+            calc.add_observer(LoggingObserver())
+        if calc.config.history_journal:
+            calc.add_observer(JournalAutoSaveObserver(calc))
+        elif calc.config.auto_save_coalesce:
+            calc.add_observer(CoalescingAutoSaveObserver(calc))
+        elif calc.config.auto_save_background:
+            calc.add_observer(BackgroundAutoSaveObserver(calc))
+        else:
+            calc.add_observer(AutoSaveObserver(calc))
 
         print("Calculator started. Type 'help' for commands.")
 
@@ -34,6 +56,8 @@ def calculator_repl():
                     # display available commands
                     print("\nAvailable commands:")
                     print("  add, subtract, multiply, divide, power, root - Perform calculations")
+                    print("  (or their symbols: +, -, *, /, ^, √)")
+                    print("  eval - Evaluate an expression, such as (3 + 4) ^ 2 / root(81, 2)")
                     print("  history - Show calculation history")
                     print("  clear - Clear calculation history")
                     print("  undo - Undo the last calculation")
@@ -96,7 +120,16 @@ def calculator_repl():
                     except Exception as e:
                         print(f"Error loading history: {e}")
                     continue
-                if command in ['add', 'subtract', 'multiply', 'divide', 'power', 'root']:
+                if command == 'eval':
+                    # evaluate a whole expression in one step
+                    try:
+                        expression = input("Expression: ")
+                        result = calc.evaluate_expression(expression)
+                        print(f"\nResult: {result.normalize()}")
+                    except (ValidationError, OperationError) as e:
+                        print(f"Error: {e}")
+                    continue
+                if OperationFactory.has_operation(command):
                     # perform the specified arithmetic operation
                     try:
                         print("\nEnter numbers (or 'cancel' to abort):")
@@ -140,6 +173,11 @@ def calculator_repl():
             except EOFError:
                 # handle end of file (Ctrl+D) gracefully
                 print("\nInput terminated. Exiting...")
+                # write any auto-saves that are still pending
+                try:
+                    calc.flush_observers()
+                except Exception as e:
+                    print(f"Warning: Could not save history: {e}")
                 break
             except Exception as e: # pragma: no cover
                 # handle any other unexpected exceptions
@@ -0,0 +1,235 @@
+### Decimal Math
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Context, Decimal, getcontext, localcontext
+from functools import lru_cache
+from typing import Iterator
+
+from app.exceptions import OperationError
+
+# Number of decimal places used when no calculator precision is in effect
+DEFAULT_PRECISION = 10
+
+# Extra significant digits carried while computing, removed by the final rounding
+GUARD_DIGITS = 5
+
+# Integer-digit estimates above this are refined with a logarithm
+_LOOSE_BOUND = 100
+
+_ZERO = Decimal(0)
+_ONE = Decimal(1)
+
+# Integer exponents small enough for the fast path of power(), by value
+_SMALL_EXPONENTS = {Decimal(count): count for count in range(_LOOSE_BOUND + 1)}
+
+# Decimal places applied by power() and root(), set by the calculator
+_precision: ContextVar[int] = ContextVar('calculator_precision', default=DEFAULT_PRECISION)
+
+@contextmanager
+def precision(places: int) -> Iterator[None]:
+    """
+    Set the number of decimal places used by power() and root() within a block.
+
+    Works like decimal.localcontext: the previous precision is restored when
+    the block exits, and the setting is local to the current thread or task.
+
+    Args:
+        places (int): Number of decimal places, normally CalculatorConfig.precision.
+    """
+    token = _precision.set(places)
+    try:
+        yield
+    finally:
+        _precision.reset(token)
+
+def get_precision() -> int:
+    """
+    Get the number of decimal places currently in effect.
+
+    Returns:
+        int: Number of decimal places.
+    """
+    return _precision.get()
+
+def power(base: Decimal, exponent: Decimal) -> Decimal:
+    """
+    Raise a Decimal to a non-negative Decimal power without converting to float.
+
+    Integer exponents are evaluated by binary exponentiation (repeated
+    squaring, performed by libmpdec), so results that fit in the working
+    precision are exact. Other exponents use Decimal's correctly rounded
+    power. The working precision covers every integer digit of the result
+    plus the current number of decimal places. Integer exponents up to
+    _LOOSE_BOUND whose result has at most _LOOSE_BOUND integer digits take a
+    fast path that skips the logarithm and the normalization, so their
+    inexact results may keep trailing zeros.
+
+    Args:
+        base (Decimal): Base number.
+        exponent (Decimal): Non-negative exponent.
+
+    Returns:
+        Decimal: base raised to exponent.
+
+    Raises:
+        OperationError: If the result is too large or undefined.
+    """
+    count = _SMALL_EXPONENTS.get(exponent)
+    if count is not None and base:
+        digits = (base.adjusted() + 1) * count
+        if digits <= _LOOSE_BOUND:
+            # the cheap bound is tight enough, so skip the logarithm and let
+            # libmpdec round once to the final precision
+            prec = (digits if digits > 0 else 0) + 1 + _precision.get()
+            return _context(prec).power(base, exponent)
+
+    if exponent == 0:
+        return _ONE
+    if base == 0:
+        return _ZERO
+    if base < 0 and exponent != exponent.to_integral_value():
+        raise OperationError("Fractional powers of negative numbers are not supported")
+
+    places = get_precision()
+    digits = _integer_digits(base, exponent)
+    result = _context(digits + places + GUARD_DIGITS).power(base, exponent)
+    return _round(result, digits + places)
+
+def root(value: Decimal, degree: Decimal) -> Decimal:
+    """
+    Calculate the root of a non-negative Decimal without converting to float.
+
+    Square roots use Decimal's correctly rounded sqrt, other integer degrees
+    use Newton iteration seeded from a float estimate when one is available,
+    and fractional degrees use Decimal's correctly rounded power.
+
+    Args:
+        value (Decimal): Non-negative number from which the root is taken.
+        degree (Decimal): Non-zero degree of the root.
+
+    Returns:
+        Decimal: The degree-th root of value.
+
+    Raises:
+        OperationError: If the root is undefined or the result is too large.
+    """
+    if value < 0:
+        raise OperationError("Cannot calculate root of negative number")
+    if degree == 0:
+        raise OperationError("Zero root is undefined")
+    if value == 0:
+        if degree < 0:
+            raise OperationError("Division by zero is not allowed")
+        return _ZERO
+    if degree < 0:
+        # a negative degree is the positive-degree root of the reciprocal
+        ctx = _context(abs(value.adjusted()) + get_precision() + 2 * GUARD_DIGITS)
+        value, degree = ctx.divide(_ONE, value), -degree
+
+    places = get_precision()
+    digits = _integer_digits(value, _ONE / degree)
+    ctx = _context(digits + places + GUARD_DIGITS)
+    if degree == 2:
+        result = ctx.sqrt(value)
+    elif degree == degree.to_integral_value():
+        with localcontext(ctx):
+            result = _newton_root(value, int(degree))
+    else:
+        result = ctx.power(value, ctx.divide(_ONE, degree))
+    return _round(result, digits + places)
+
+@lru_cache(maxsize=64)
+def _context(prec: int) -> Context:
+    """
+    Get a decimal context with the given precision.
+
+    Contexts are cached because creating one costs more than the arithmetic
+    done with it. Other settings follow decimal.DefaultContext.
+
+    Args:
+        prec (int): Number of significant digits.
+
+    Returns:
+        Context: The decimal context.
+    """
+    return Context(prec=prec)
+
+def _integer_digits(base: Decimal, exponent: Decimal) -> int:
+    """
+    Estimate the number of integer digits of abs(base) ** exponent.
+
+    Args:
+        base (Decimal): Base number.
+        exponent (Decimal): Non-negative exponent.
+
+    Returns:
+        int: An upper bound on the number of integer digits, at least 1.
+
+    Raises:
+        OperationError: If the result would exceed the Decimal exponent range.
+    """
+    magnitude = base.adjusted() + 1
+    if magnitude <= 0:
+        # abs(base) < 1, so the result is below 1 as well
+        return 1
+    # cheap upper bound from the exponent of the base
+    digits = magnitude * exponent
+    if digits > _LOOSE_BOUND:
+        # the bound may be far too large, so use the logarithm instead
+        ctx = _context(30)
+        digits = ctx.multiply(ctx.log10(base.copy_abs()), exponent)
+        if digits > getcontext().Emax:
+            raise OperationError("Result is too large")
+    return int(digits) + 1
+
+def _round(value: Decimal, prec: int) -> Decimal:
+    """
+    Round a result to prec significant digits and remove trailing zeros.
+
+    Integers are kept out of exponent notation.
+
+    Args:
+        value (Decimal): The unrounded result.
+        prec (int): Integer digits of the result plus the decimal places to keep.
+
+    Returns:
+        Decimal: The rounded result.
+    """
+    ctx = _context(prec)
+    value = ctx.plus(value)
+    if value.same_quantum(_ONE):
+        # already an integer without fractional digits
+        return value
+    value = value.normalize(ctx)
+    if value.adjusted() >= 0 and value == value.to_integral_value():
+        return value.quantize(_ONE, context=ctx)
+    return value
+
+def _newton_root(value: Decimal, degree: int) -> Decimal:
+    """
+    Calculate the integer-degree root of a positive value by Newton iteration.
+
+    After the first step every iterate lies above the root and decreases, so
+    iteration stops as soon as an iterate no longer decreases.
+
+    Args:
+        value (Decimal): Positive number from which the root is taken.
+        degree (int): Positive integer degree of the root.
+
+    Returns:
+        Decimal: The root, rounded to the current context.
+    """
+    if degree == 1:
+        return +value
+    estimate = Decimal(float(value) ** (1.0 / degree))
+    if not estimate.is_finite() or estimate <= 0:
+        # value is outside the float range, start from a power of ten instead
+        estimate = _ONE.scaleb(value.adjusted() // degree + 1)
+
+    current = ((degree - 1) * estimate + value / estimate ** (degree - 1)) / degree
+    while True:
+        following = ((degree - 1) * current + value / current ** (degree - 1)) / degree
+        if following >= current:
+            return current
+        current = following
@@ -0,0 +1,422 @@
+### Expression Engine
+
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+import re
+from typing import List, Mapping, Optional, Tuple, Union
+
+from app.exceptions import OperationError, ValidationError
+from app.operations import Operation, OperationFactory
+
+# Number of compiled expressions kept by compile_expression
+EXPRESSION_CACHE_SIZE = 256
+
+# Infix symbols by precedence, lowest first; the operations are resolved
+# through OperationFactory, so they follow its alias table
+_ADDITIVE = ('+', '-')
+_MULTIPLICATIVE = ('*', '/', '×', '÷')
+_POWER = ('^', '**')
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+      | (?P<name>[A-Za-z_]\w*)
+      | (?P<symbol>\*\*|[-+*/^×÷√(),])
+    )
+""", re.VERBOSE)
+
+@dataclass(frozen=True)
+class Number:
+    """A number written in the expression."""
+
+    value: Decimal
+
+@dataclass(frozen=True)
+class Variable:
+    """A name whose value is supplied when the expression is evaluated."""
+
+    name: str
+
+@dataclass(frozen=True)
+class Negate:
+    """Unary minus applied to a subexpression."""
+
+    operand: 'Node'
+
+@dataclass(frozen=True)
+class Apply:
+    """An operation applied to two subexpressions."""
+
+    operation: Operation
+    left: 'Node'
+    right: 'Node'
+
+Node = Union[Number, Variable, Negate, Apply]
+
+# One recorded operation: the operation, its operands and its result
+Step = Tuple[Operation, Decimal, Decimal, Decimal]
+
+# Instructions of a compiled expression, evaluated in order on a stack
+_PUSH = 0 # push a number
+_LOAD = 1 # push the value of a variable
+_NEGATE = 2 # replace the top value with its negation
+_APPLY = 3 # replace the top two values with the result of an operation
+
+# A compiled instruction and its argument (number, variable name, None or Operation)
+Instruction = Tuple[int, object]
+
+# Precedence of the infix operators, and of the prefix operators '-' and '√',
+# which bind tighter than '*' but looser than '^'
+_PREFIX_PRECEDENCE = 3
+_PRECEDENCE = dict(
+    [(symbol, 1) for symbol in _ADDITIVE] +
+    [(symbol, 2) for symbol in _MULTIPLICATIVE] +
+    [(symbol, 4) for symbol in _POWER]
+)
+
+class _Parser:
+    """
+    Operator precedence parser translating an expression to postfix instructions.
+
+    Grammar, from lowest to highest precedence:
+
+        expression := term (('+' | '-') term)*
+        term       := unary (('*' | '/' | '×' | '÷') unary)*
+        unary      := ('-' | '+' | '√') unary | power
+        power      := primary (('^' | '**') unary)?
+        primary    := number | name | name '(' expression ',' expression ')'
+                    | '(' expression ')'
+
+    Powers are right associative and bind tighter than unary minus, so
+    -2^2 is -(2^2). A function name is any name OperationFactory knows,
+    such as root(81, 2); '√x' is the square root root(x, 2).
+
+    The parser keeps its pending operators on an explicit stack (the
+    shunting-yard algorithm) instead of recursing, so neither long nor
+    deeply nested expressions are limited by Python's recursion limit.
+    """
+
+    def __init__(self, text: str):
+        """
+        Split the expression into tokens.
+
+        Args:
+            text (str): The expression.
+
+        Raises:
+            ValidationError: If the expression contains an unexpected character.
+        """
+        self.text = text
+        self.tokens: List[Tuple[str, str, int]] = []
+        position = 0
+        end = len(text.rstrip())
+        while position < end:
+            match = _TOKEN.match(text, position)
+            if match is None:
+                position += len(text[position:]) - len(text[position:].lstrip())
+                raise ValidationError(
+                    f"Invalid expression: unexpected character '{text[position]}' at position {position}"
+                )
+            kind = match.lastgroup
+            self.tokens.append((kind, match.group(kind), match.start(kind)))
+            position = match.end()
+
+    def parse(self) -> List[Instruction]:
+        """
+        Parse the whole expression.
+
+        Returns:
+            List[Instruction]: The expression in postfix order.
+
+        Raises:
+            ValidationError: If the expression is empty or malformed.
+        """
+        if not self.tokens:
+            raise ValidationError("Invalid expression: expression is empty")
+
+        output: List[Instruction] = []
+        # pending operators: ('infix', symbol, Operation), ('prefix', symbol, None),
+        # ('paren', '(', None) or ('call', name, [Operation, number of arguments])
+        operators: List[Tuple[str, str, object]] = []
+        expect_operand = True
+        # set when a function name was read and its opening parenthesis comes next
+        in_call = False
+
+        for index, (kind, text, position) in enumerate(self.tokens):
+            if in_call:
+                in_call = False
+                continue
+            if expect_operand:
+                if kind == 'number':
+                    try:
+                        output.append((_PUSH, Decimal(text).normalize()))
+                    except ArithmeticError:
+                        raise ValidationError(
+                            f"Invalid expression: number '{text}' out of range at position {position}"
+                        )
+                    expect_operand = False
+                elif kind == 'name':
+                    following = self.tokens[index + 1][1] if index + 1 < len(self.tokens) else None
+                    if following != '(':
+                        output.append((_LOAD, text))
+                        expect_operand = False
+                    elif not OperationFactory.has_operation(text):
+                        raise ValidationError(
+                            f"Invalid expression: unknown function '{text}' at position {position}"
+                        )
+                    else:
+                        operators.append(('call', text, [OperationFactory.create_operation(text), 1]))
+                        in_call = True
+                elif text == '(':
+                    operators.append(('paren', text, None))
+                elif text in ('-', '√'):
+                    operators.append(('prefix', text, None))
+                elif text != '+':
+                    self._fail(index)
+                continue
+
+            if text in _PRECEDENCE:
+                precedence = _PRECEDENCE[text]
+                while operators and operators[-1][0] in ('infix', 'prefix'):
+                    top_kind, top_text, _ = operators[-1]
+                    top_precedence = _PRECEDENCE[top_text] if top_kind == 'infix' else _PREFIX_PRECEDENCE
+                    # powers are right associative, the other operators left associative
+                    if top_precedence < precedence or (top_precedence == precedence and text in _POWER):
+                        break
+                    self._emit(operators.pop(), output)
+                operators.append(('infix', text, OperationFactory.create_operation(text)))
+                expect_operand = True
+            elif text in (')', ','):
+                while operators and operators[-1][0] in ('infix', 'prefix'):
+                    self._emit(operators.pop(), output)
+                if not operators:
+                    self._fail(index)
+                group_kind, _, call = operators[-1]
+                if text == ',':
+                    if group_kind != 'call':
+                        self._fail(index)
+                    if call[1] == 2:
+                        self._fail(index, "expected ')'")
+                    call[1] += 1
+                    expect_operand = True
+                    continue
+                if group_kind == 'call':
+                    if call[1] < 2:
+                        self._fail(index, "expected ','")
+                    output.append((_APPLY, call[0]))
+                operators.pop()
+            else:
+                self._fail(index)
+
+        if expect_operand:
+            self._fail(len(self.tokens))
+        while operators:
+            entry = operators.pop()
+            if entry[0] == 'paren':
+                self._fail(len(self.tokens), "expected ')'")
+            if entry[0] == 'call':
+                self._fail(len(self.tokens), "expected ','" if entry[2][1] < 2 else "expected ')'")
+            self._emit(entry, output)
+        return output
+
+    @staticmethod
+    def _emit(entry: Tuple[str, str, object], output: List[Instruction]) -> None:
+        """
+        Append the instructions of a popped operator.
+
+        Args:
+            entry (Tuple[str, str, object]): The operator stack entry.
+            output (List[Instruction]): The instructions emitted so far.
+        """
+        kind, text, operation = entry
+        if kind == 'infix':
+            output.append((_APPLY, operation))
+        elif text == '√':
+            output.append((_PUSH, Decimal(2)))
+            output.append((_APPLY, OperationFactory.create_operation('root')))
+        elif output[-1][0] == _PUSH:
+            # the operand is a single number, so -2 is a number rather than an operation
+            output[-1] = (_PUSH, -output[-1][1])
+        else:
+            output.append((_NEGATE, None))
+
+    def _fail(self, index: int, expected: Optional[str] = None) -> None:
+        """
+        Raise an error describing the token at a position.
+
+        Args:
+            index (int): Index of the unexpected token, len(tokens) for the end of the expression.
+            expected (Optional[str], optional): What the parser expected instead.
+
+        Raises:
+            ValidationError: Always.
+        """
+        if index < len(self.tokens):
+            _, text, position = self.tokens[index]
+            problem = f"unexpected '{text}' at position {position}"
+        else:
+            problem = "unexpected end of expression"
+        if expected:
+            problem = f"{problem}, {expected}"
+        raise ValidationError(f"Invalid expression: {problem}")
+
+def _build_tree(program: List[Instruction]) -> Node:
+    """
+    Build the syntax tree of a postfix program.
+
+    Args:
+        program (List[Instruction]): The instructions.
+
+    Returns:
+        Node: Root of the syntax tree.
+    """
+    nodes: List[Node] = []
+    for code, argument in program:
+        if code == _PUSH:
+            nodes.append(Number(argument))
+        elif code == _LOAD:
+            nodes.append(Variable(argument))
+        elif code == _NEGATE:
+            nodes.append(Negate(nodes.pop()))
+        else:
+            right = nodes.pop()
+            nodes.append(Apply(argument, nodes.pop(), right))
+    return nodes[0]
+
+class CompiledExpression:
+    """
+    An arithmetic expression parsed once and evaluated any number of times.
+
+    The expression is compiled into a flat list of postfix instructions that
+    refer directly to the calculator's Operation instances; evaluating runs
+    them on a stack, without parsing again. The syntax tree built from the
+    same Operation instances is available as tree. Names that are not
+    function calls are variables, supplied to evaluate().
+    """
+
+    def __init__(self, text: str):
+        """
+        Parse and compile an expression.
+
+        Args:
+            text (str): The expression, such as '(3 + 4) ^ 2 / root(81, 2)'.
+
+        Raises:
+            ValidationError: If the expression is malformed.
+        """
+        self.text = text
+        self.program = _Parser(text).parse()
+        # names of the variables, in the order they first appear
+        self.variables: Tuple[str, ...] = tuple(dict.fromkeys(
+            argument for code, argument in self.program if code == _LOAD
+        ))
+        # numbers written in the expression
+        self.numbers: Tuple[Decimal, ...] = tuple(
+            argument for code, argument in self.program if code == _PUSH
+        )
+        self._tree: Optional[Node] = None
+
+    @property
+    def tree(self) -> Node:
+        """
+        Get the syntax tree of the expression, built on first use.
+
+        Returns:
+            Node: Root of the syntax tree.
+        """
+        if self._tree is None:
+            self._tree = _build_tree(self.program)
+        return self._tree
+
+    def evaluate(
+        self,
+        variables: Optional[Mapping[str, Decimal]] = None,
+        steps: Optional[List[Step]] = None
+    ) -> Decimal:
+        """
+        Evaluate the expression.
+
+        Args:
+            variables (Optional[Mapping[str, Decimal]], optional): Values of the variables.
+            steps (Optional[List[Step]], optional): If given, each operation performed is
+                appended to it, innermost first, as (operation, operand1, operand2, result).
+
+        Returns:
+            Decimal: The value of the expression.
+
+        Raises:
+            ValidationError: If a variable has no value, or an operation rejects its operands.
+            OperationError: If the arithmetic fails.
+        """
+        values: Mapping[str, Decimal] = variables if variables is not None else {}
+        for name in self.variables:
+            if name not in values:
+                raise ValidationError(f"Undefined variable: {name}")
+        stack: List[Decimal] = []
+        push = stack.append
+        pop = stack.pop
+        try:
+            for code, argument in self.program:
+                if code == _PUSH:
+                    push(argument)
+                elif code == _LOAD:
+                    push(values[argument])
+                elif code == _NEGATE:
+                    push(-pop())
+                else:
+                    b = pop()
+                    a = pop()
+                    result = argument.execute(a, b)
+                    if steps is not None:
+                        steps.append((argument, a, b, result))
+                    push(result)
+        except (InvalidOperation, ValueError, ArithmeticError) as e:
+            raise OperationError(f"Calculation failed: {e}")
+        return stack[0]
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the compiled expression.
+
+        Returns:
+            str: The expression text.
+        """
+        return f"CompiledExpression({self.text!r})"
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(text: str) -> CompiledExpression:
+    """
+    Compile an expression, reusing the result for an expression compiled before.
+
+    Operation names and symbols are resolved when the expression is
+    compiled; call compile_expression.cache_clear() after registering an
+    operation that replaces one used by cached expressions.
+
+    Args:
+        text (str): The expression.
+
+    Returns:
+        CompiledExpression: The compiled expression.
+
+    Raises:
+        ValidationError: If the expression is malformed.
+    """
+    return CompiledExpression(text)
+
+def evaluate_expression(text: str, variables: Optional[Mapping[str, Decimal]] = None) -> Decimal:
+    """
+    Evaluate an expression in one call, compiling it on first use.
+
+    Args:
+        text (str): The expression.
+        variables (Optional[Mapping[str, Decimal]], optional): Values of the variables.
+
+    Returns:
+        Decimal: The value of the expression.
+
+    Raises:
+        ValidationError: If the expression is malformed or a variable has no value.
+        OperationError: If the arithmetic fails.
+    """
+    return compile_expression(text).evaluate(variables)
@@ -0,0 +1,92 @@
+### Float Batch Engine
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.exceptions import CalculatorError, OperationError, ValidationError
+from app.operations import Operation
+
+# Per-row outcome of a vectorized evaluation: None for success, otherwise the error
+RowErrors = List[Optional[CalculatorError]]
+
+def parse_operands(values: Sequence, max_input_value) -> Tuple[np.ndarray, RowErrors]:
+    """
+    Convert operands to a float64 array, validating each row.
+
+    Applies the same rules as InputValidator.validate_number: rows that are not
+    finite numbers or whose magnitude exceeds max_input_value are reported as
+    ValidationErrors and hold NaN in the returned array.
+
+    Args:
+        values (Sequence): Operands as numbers or numeric strings.
+        max_input_value: Maximum allowed magnitude of an operand.
+
+    Returns:
+        Tuple[np.ndarray, RowErrors]: The parsed operands and the error for each row.
+    """
+    errors: RowErrors = [None] * len(values)
+    try:
+        # fast path: every value converts directly
+        operands = np.asarray(values, dtype=np.float64)
+    except (ValueError, TypeError):
+        parsed = []
+        for index, value in enumerate(values):
+            try:
+                parsed.append(float(value.strip() if isinstance(value, str) else value))
+            except (ValueError, TypeError):
+                parsed.append(np.nan)
+                errors[index] = ValidationError(f"Invalid number format: {value}")
+        operands = np.asarray(parsed, dtype=np.float64)
+
+    for index in np.flatnonzero(~np.isfinite(operands)):
+        if errors[index] is None:
+            errors[index] = ValidationError(f"Invalid number format: {values[index]}")
+    with np.errstate(invalid='ignore'):
+        too_large = np.abs(operands) > float(max_input_value)
+    for index in np.flatnonzero(too_large):
+        errors[index] = ValidationError(f"Value exceeds maximum allowed: {max_input_value}")
+    return operands, errors
+
+def evaluate_batch(
+    operation: Operation,
+    a_values: Sequence,
+    b_values: Sequence,
+    max_input_value
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, RowErrors]:
+    """
+    Evaluate an operation over many operand pairs using float64 arithmetic.
+
+    Operands are parsed and validated as whole arrays, the operation's array
+    validation rules are applied as masks, and the array kernel runs once over
+    the remaining valid rows. Results that are not finite (overflow, or an
+    undefined power such as a fractional power of a negative number) are
+    reported as OperationErrors.
+
+    Args:
+        operation (Operation): An operation providing an array kernel.
+        a_values (Sequence): First operands.
+        b_values (Sequence): Second operands.
+        max_input_value: Maximum allowed magnitude of an operand.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, RowErrors]: The parsed first and
+        second operands, the results (NaN for failed rows) and the error for each row.
+    """
+    a, errors = parse_operands(a_values, max_input_value)
+    b, b_errors = parse_operands(b_values, max_input_value)
+    errors = [a_error or b_error for a_error, b_error in zip(errors, b_errors)]
+    valid = np.fromiter((error is None for error in errors), dtype=bool, count=len(errors))
+
+    for mask, message in operation.validate_arrays(a, b):
+        for index in np.flatnonzero(mask & valid):
+            errors[index] = ValidationError(message)
+        valid &= ~mask
+
+    results = np.full(len(errors), np.nan)
+    with np.errstate(all='ignore'):
+        results[valid] = operation.execute_arrays(a[valid], b[valid])
+
+    for index in np.flatnonzero(valid & ~np.isfinite(results)):
+        errors[index] = OperationError("Calculation failed: result is not a finite number")
+    return a, b, results, errors
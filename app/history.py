@@ -1,9 +1,15 @@
 ### History Management
 
 from abc import ABC, abstractmethod
+import atexit
 import logging
-from typing import Any
+import queue
+import threading
+import time
+from typing import Any, Callable, List, Optional
 from app.calculation import Calculation
+from app.exceptions import OperationError
+from app.history_writer import HistoryWriter
 
 
 # Purpose: Define a common interface (update) for all observers.
@@ -28,6 +34,36 @@ class HistoryObserver(ABC):
         """
         pass # pragma: no cover
 
+    def update_batch(self, calculations: List[Calculation]) -> None:
+        """
+        Handle a batch of new calculations.
+
+        Called once for calculations performed together in bulk. The default
+        implementation calls update for each calculation; observers can
+        override it to handle the whole batch at once.
+
+        Args:
+            calculations (List[Calculation]): the calculations that were performed
+        """
+        for calculation in calculations:
+            self.update(calculation)
+
+    def history_changed(self) -> None:
+        """
+        Handle a change to the history that is not a new calculation.
+
+        Called by the calculator after undo, redo and clear, before flush.
+        The default implementation does nothing.
+        """
+
+    def flush(self) -> None:
+        """
+        Complete any work the observer has deferred.
+
+        Called by the calculator after undo, redo and clear, and before it
+        shuts down. The default implementation does nothing.
+        """
+
 # Purpose: Logs every calculation to the logging system (usually a file).
 # How it works: It gets called with a Calculation object and writes the operation, operands, 
     # and result using logging.info(...).
@@ -53,12 +89,34 @@ class LoggingObserver(HistoryObserver):
 
         if calculation is None:
             raise AttributeError("Calculation cannot be None")
+        # formatted by the logging system, and only if INFO records are enabled
         logging.info(
-            f"Calculation performed: {calculation.operation} "
-            f"({calculation.operand1}, {calculation.operand2}) = "
-            f"{calculation.result}"
+            "Calculation performed: %s (%s, %s) = %s",
+            calculation.operation,
+            calculation.operand1,
+            calculation.operand2,
+            calculation.result
         )
 
+    def update_batch(self, calculations: List[Calculation]) -> None:
+        """
+        Log a batch of calculations as a single log record.
+
+        The batch is formatted into one message, so the log handler writes
+        and flushes once per batch instead of once per calculation.
+
+        Args:
+            calculations (List[Calculation]): the calculations that were performed
+        """
+        if not calculations or not logging.getLogger().isEnabledFor(logging.INFO):
+            return
+        lines = [
+            f"  {calculation.operation} ({calculation.operand1}, {calculation.operand2}) = "
+            f"{calculation.result}"
+            for calculation in calculations
+        ]
+        logging.info("Calculations performed: %d\n%s", len(calculations), "\n".join(lines))
+
 # Purpose: Automatically saves the calculator's history if auto_save is enabled.
 # How it works:
     # Takes a calculator instance that must have:
@@ -106,3 +164,444 @@ class AutoSaveObserver(HistoryObserver):
         if self.calculator.config.auto_save:
             self.calculator.save_history()
             logging.info("History auto-saved")
+
+    def update_batch(self, calculations: List[Calculation]) -> None:
+        """
+        Trigger a single auto-save for a batch of calculations.
+
+        Args:
+            calculations (List[Calculation]): The calculations that were performed
+        """
+        if self.calculator.config.auto_save:
+            self.calculator.save_history()
+            logging.info("History auto-saved after batch of %d calculations", len(calculations))
+
+# Purpose: Auto-saves by appending each calculation to the history journal.
+# How it works:
+    # Same contract as AutoSaveObserver, but the calculator must also provide
+    # .append_history(calculation), which appends one record and compacts the
+    # journal into the history file every journal_compact_interval records.
+class JournalAutoSaveObserver(AutoSaveObserver):
+    """
+    Observer that automatically saves calculations to an append-only journal.
+
+    Instead of rewriting the whole history file after every calculation, each
+    new calculation is appended to the calculator's history journal, keeping
+    the cost of an auto-save independent of the history size.
+    """
+
+    def __init__(self, calculator: Any):
+        """
+        Initialize the JournalAutoSaveObserver.
+
+        Args:
+            calculator (Any): the calculator instance to interact with.
+                Must have 'config', 'save_history', 'append_history' and
+                'append_history_batch' attributes
+        Raises:
+            TypeError: If the calculator does not have the required attributes.
+        """
+        super().__init__(calculator)
+        if not hasattr(calculator, 'append_history'):
+            raise TypeError("Calculator must have an 'append_history' attribute")
+        if not hasattr(calculator, 'append_history_batch'):
+            raise TypeError("Calculator must have an 'append_history_batch' attribute")
+
+    def update(self, calculation: Calculation) -> None:
+        """
+        Append the calculation to the history journal.
+
+        Args:
+            calculation (Calculation): The calculation that was performed
+        """
+        if calculation is None:
+            raise AttributeError("Calculation cannot be None")
+        if self.calculator.config.auto_save:
+            self.calculator.append_history(calculation)
+            logging.info("Calculation journaled")
+
+    def update_batch(self, calculations: List[Calculation]) -> None:
+        """
+        Append a batch of calculations to the history journal in one write.
+
+        Args:
+            calculations (List[Calculation]): The calculations that were performed
+        """
+        if self.calculator.config.auto_save:
+            self.calculator.append_history_batch(calculations)
+            logging.info("Batch of %d calculations journaled", len(calculations))
+
+# Purpose: Auto-saves at most once per interval or per batch of calculations.
+# How it works:
+    # Same contract as AutoSaveObserver, but each calculation only marks the
+    # history dirty. The history is saved once auto_save_batch_size calculations
+    # are pending or auto_save_interval seconds have passed since the last save,
+    # and whenever flush() is called (undo, redo, clear and exit).
+class CoalescingAutoSaveObserver(AutoSaveObserver):
+    """
+    Observer that coalesces automatic saves.
+
+    Bursts of calculations are written with one save instead of one save per
+    calculation. Pending calculations are always saved by flush(), which the
+    calculator calls after undo, redo and clear, and which also runs when the
+    interpreter exits.
+    """
+
+    def __init__(
+        self,
+        calculator: Any,
+        interval: Optional[float] = None,
+        max_pending: Optional[int] = None
+    ):
+        """
+        Initialize the CoalescingAutoSaveObserver.
+
+        Args:
+            calculator (Any): the calculator instance to interact with.
+                Must have 'config' and 'save_history' attributes
+            interval (Optional[float], optional): Seconds after the last save after which the
+                next calculation is saved. Defaults to config.auto_save_interval.
+            max_pending (Optional[int], optional): Number of unsaved calculations that triggers
+                a save. Defaults to config.auto_save_batch_size.
+        Raises:
+            TypeError: If the calculator does not have the required attributes.
+        """
+        super().__init__(calculator)
+        config = calculator.config
+        self.interval = interval if interval is not None else config.auto_save_interval
+        self.max_pending = max_pending or config.auto_save_batch_size
+        # number of calculations not yet written to the history file
+        self.pending = 0
+        # whether undo, redo or clear changed the history since the last save
+        self._dirty = False
+        self._last_save = time.monotonic()
+        # guarantee pending calculations are written on shutdown
+        atexit.register(self._flush_at_exit)
+
+    def update(self, calculation: Calculation) -> None:
+        """
+        Mark the history dirty, saving it if a batch or interval is complete.
+
+        Args:
+            calculation (Calculation): The calculation that was performed
+        """
+        if calculation is None:
+            raise AttributeError("Calculation cannot be None")
+        if self.calculator.config.auto_save:
+            self._add_pending(1)
+
+    def update_batch(self, calculations: List[Calculation]) -> None:
+        """
+        Mark the history dirty for a batch of calculations.
+
+        Args:
+            calculations (List[Calculation]): The calculations that were performed
+        """
+        if self.calculator.config.auto_save:
+            self._add_pending(len(calculations))
+
+    def history_changed(self) -> None:
+        """
+        Mark the history dirty after undo, redo or clear.
+
+        The history file may hold calculations that are no longer in the
+        history, so the next flush saves even if no calculations are pending.
+        """
+        if self.calculator.config.auto_save:
+            self._dirty = True
+
+    def flush(self) -> None:
+        """
+        Save the history if any calculations are pending or it has changed.
+        """
+        if self.pending or self._dirty:
+            self.calculator.save_history()
+            logging.info(f"History auto-saved after {self.pending} calculations")
+            self.pending = 0
+            self._dirty = False
+        self._last_save = time.monotonic()
+
+    def close(self) -> None:
+        """
+        Flush pending calculations and stop flushing at interpreter exit.
+        """
+        atexit.unregister(self._flush_at_exit)
+        self.flush()
+
+    def _add_pending(self, count: int) -> None:
+        """
+        Record unsaved calculations and save once a batch or interval is complete.
+
+        Args:
+            count (int): Number of new calculations.
+        """
+        self.pending += count
+        if self.pending >= self.max_pending or time.monotonic() - self._last_save >= self.interval:
+            self.flush()
+
+    def _flush_at_exit(self) -> None:
+        """
+        Flush pending calculations when the interpreter exits, logging failures.
+        """
+        try:
+            self.flush()
+        except Exception as e:
+            logging.warning(f"Could not save pending history at exit: {e}")
+
+# Purpose: Auto-saves without writing the history file on the calculating thread.
+# How it works:
+    # Same contract as AutoSaveObserver, but the calculator must also provide
+    # .snapshot_history() and .write_history(snapshot). Each calculation only
+    # takes a snapshot of the history; a HistoryWriter thread writes it.
+class BackgroundAutoSaveObserver(AutoSaveObserver):
+    """
+    Observer that automatically saves calculations on a background thread.
+
+    Each new calculation queues a snapshot of the history for a dedicated
+    writer thread, so pandas serialization and file I/O no longer delay the
+    calculation. flush() waits until every queued snapshot has been written,
+    and remaining snapshots are written when the interpreter exits.
+    """
+
+    def __init__(self, calculator: Any, max_pending: Optional[int] = None):
+        """
+        Initialize the BackgroundAutoSaveObserver and start its writer thread.
+
+        Args:
+            calculator (Any): the calculator instance to interact with.
+                Must have 'config', 'save_history', 'snapshot_history' and 'write_history' attributes
+            max_pending (Optional[int], optional): Number of snapshots that may wait for the writer
+                before a calculation blocks. Defaults to config.history_writer_queue_size.
+        Raises:
+            TypeError: If the calculator does not have the required attributes.
+        """
+        super().__init__(calculator)
+        if not hasattr(calculator, 'snapshot_history') or not hasattr(calculator, 'write_history'):
+            raise TypeError("Calculator must have 'snapshot_history' and 'write_history' attributes")
+        self.writer = HistoryWriter(
+            calculator.write_history,
+            max_pending or calculator.config.history_writer_queue_size
+        )
+        # guarantee queued snapshots are written on shutdown
+        atexit.register(self._close_at_exit)
+
+    def update(self, calculation: Calculation) -> None:
+        """
+        Queue a snapshot of the history for the writer thread.
+
+        Args:
+            calculation (Calculation): The calculation that was performed
+        """
+        if calculation is None:
+            raise AttributeError("Calculation cannot be None")
+        if self.calculator.config.auto_save:
+            self.writer.submit(self.calculator.snapshot_history())
+
+    def update_batch(self, calculations: List[Calculation]) -> None:
+        """
+        Queue a single snapshot of the history for a batch of calculations.
+
+        Args:
+            calculations (List[Calculation]): The calculations that were performed
+        """
+        if self.calculator.config.auto_save:
+            self.writer.submit(self.calculator.snapshot_history())
+
+    def flush(self) -> None:
+        """
+        Wait until every queued snapshot has been written.
+
+        Raises:
+            OperationError: If a background write failed.
+        """
+        self.writer.flush()
+
+    def close(self) -> None:
+        """
+        Write the queued snapshots and stop the writer thread.
+
+        Raises:
+            OperationError: If a background write failed.
+        """
+        atexit.unregister(self._close_at_exit)
+        self.writer.close()
+
+    def _close_at_exit(self) -> None:
+        """
+        Stop the writer thread when the interpreter exits, logging failures.
+        """
+        try:
+            self.writer.close()
+        except Exception as e:
+            logging.warning(f"Could not save pending history at exit: {e}")
+
+# Purpose: Moves a slow observer off the thread performing calculations.
+# How it works:
+    # Wraps another observer and gives it a bounded queue and a worker thread.
+    # update() and update_batch() only queue the call; the worker delivers the
+    # calls to the wrapped observer one at a time, in the order they were made.
+# Behavior:
+    # When the queue is full, the 'block' policy waits for room and the 'drop'
+    # policy discards the notification. flush() waits for the queue to drain.
+class QueuedObserver(HistoryObserver):
+    """
+    Observer that notifies another observer asynchronously.
+
+    Notifications are delivered on a dedicated worker thread, so the wrapped
+    observer's work no longer adds to the latency of a calculation. Each
+    QueuedObserver has its own queue and thread, so the wrapped observer
+    receives calculations in order, and one slow observer does not delay
+    the others.
+
+    The wrapped observer runs while the calculator keeps changing its
+    history, so only observers that use nothing but the calculations they
+    receive (such as LoggingObserver) should be wrapped.
+    """
+
+    def __init__(self, observer: HistoryObserver, max_pending: int = 1000, policy: str = 'block'):
+        """
+        Initialize the QueuedObserver and start its worker thread.
+
+        Args:
+            observer (HistoryObserver): The observer to notify.
+            max_pending (int, optional): Number of notifications that may wait in the queue.
+                Defaults to 1000.
+            policy (str, optional): What happens when the queue is full: 'block' waits
+                for room, 'drop' discards the notification. Defaults to 'block'.
+        """
+        self.observer = observer
+        self.policy = policy
+        # number of notifications discarded since the last flush
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._error: Optional[Exception] = None
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f'observer-{type(observer).__name__}',
+            daemon=True
+        )
+        self._thread.start()
+        # guarantee queued notifications are delivered on shutdown
+        atexit.register(self._close_at_exit)
+
+    def update(self, calculation: Calculation) -> None:
+        """
+        Queue a calculation for the wrapped observer.
+
+        Args:
+            calculation (Calculation): The calculation that was performed
+        """
+        if calculation is None:
+            raise AttributeError("Calculation cannot be None")
+        self._notify(self.observer.update, calculation)
+
+    def update_batch(self, calculations: List[Calculation]) -> None:
+        """
+        Queue a batch of calculations for the wrapped observer.
+
+        Args:
+            calculations (List[Calculation]): The calculations that were performed
+        """
+        self._notify(self.observer.update_batch, list(calculations))
+
+    def history_changed(self) -> None:
+        """
+        Queue a history change notification for the wrapped observer.
+        """
+        if self._closed:
+            raise OperationError("Observer queue is closed")
+        # never dropped, so the wrapped observer sees every undo, redo and clear
+        self._queue.put((self.observer.history_changed, ()))
+
+    def flush(self) -> None:
+        """
+        Deliver every queued notification, then flush the wrapped observer.
+
+        Raises:
+            OperationError: If the wrapped observer failed since the last flush.
+        """
+        if not self._closed:
+            # never dropped, so the wrapped observer's flush follows every queued notification
+            self._queue.put((self.observer.flush, ()))
+        self._queue.join()
+
+        if self.dropped:
+            logging.warning(
+                f"Dropped {self.dropped} notifications for {type(self.observer).__name__}"
+            )
+            self.dropped = 0
+        error, self._error = self._error, None
+        if error is not None:
+            raise OperationError(f"Observer {type(self.observer).__name__} failed: {error}")
+
+    def close(self) -> None:
+        """
+        Deliver the queued notifications and stop the worker thread.
+
+        Raises:
+            OperationError: If the wrapped observer failed since the last flush.
+        """
+        atexit.unregister(self._close_at_exit)
+        self._shutdown()
+
+    def _notify(self, method: Callable, argument: Any) -> None:
+        """
+        Queue a call to the wrapped observer, applying the queue policy.
+
+        Args:
+            method (Callable): The wrapped observer's method to call.
+            argument (Any): The calculation or calculations to pass.
+
+        Raises:
+            OperationError: If the observer has been closed.
+        """
+        if self._closed:
+            raise OperationError("Observer queue is closed")
+        if self.policy == 'drop':
+            try:
+                self._queue.put_nowait((method, (argument,)))
+            except queue.Full:
+                self.dropped += 1
+        else:
+            self._queue.put((method, (argument,)))
+
+    def _shutdown(self) -> None:
+        """
+        Flush the queue and stop the worker thread, even if flushing fails.
+        """
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._closed = True
+            # a None entry tells the thread to stop
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        """
+        Deliver queued notifications until close() is called.
+        """
+        while True:
+            call = self._queue.get()
+            try:
+                if call is None:
+                    return
+                method, arguments = call
+                method(*arguments)
+            except Exception as e:
+                logging.error(f"Observer {type(self.observer).__name__} failed: {e}")
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _close_at_exit(self) -> None:
+        """
+        Stop the worker thread when the interpreter exits, logging failures.
+        """
+        try:
+            self._shutdown()
+        except Exception as e:
+            logging.warning(f"Could not deliver pending notifications at exit: {e}")
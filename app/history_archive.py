@@ -0,0 +1,129 @@
+### History Archive
+
+from dataclasses import dataclass
+import threading
+from typing import Callable, List
+
+from app.calculation import Calculation
+
+@dataclass(frozen=True)
+class ArchiveSnapshot:
+    """
+    Copy of the archive taken together with a history snapshot.
+    """
+
+    position: int # end of the archived records in the history file, 0 if none are kept
+    pending: List[Calculation] # archived calculations not yet written, oldest first
+    version: int # number of changes made to the archive when the copy was taken
+
+
+class HistoryArchive:
+    """
+    Calculations older than the calculator's history.
+
+    The calculator keeps only the newest max_history_size calculations in
+    memory, but the history file keeps every older one. The archive is made
+    of the records at the start of the history file, up to position, followed
+    by the calculations evicted from the history since the file was last
+    written (pending). Undo takes evicted calculations back from the end of
+    the archive.
+
+    Positions are opaque to the archive: the calculator uses byte offsets
+    for CSV history files and record counts for the other formats. Safe to
+    use from the calculator thread and a history writer thread.
+    """
+
+    def __init__(self, position_before: Callable[[int, int], int]):
+        """
+        Initialize an empty archive.
+
+        Args:
+            position_before (Callable[[int, int], int]): Given a position in the history file
+                and a number of records, returns the position of the first of those records
+                before it.
+        """
+        self._position_before = position_before
+        self._position = 0
+        self._pending: List[Calculation] = []
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def reset(self, position: int = 0) -> None:
+        """
+        Replace the archive with the history file's records up to a position.
+
+        Args:
+            position (int, optional): End of the archived records in the history file.
+                Defaults to 0, which archives nothing.
+        """
+        with self._lock:
+            self._position = position
+            self._pending = []
+            self._version += 1
+
+    def push(self, calculations: List[Calculation]) -> None:
+        """
+        Archive calculations evicted from the history.
+
+        Args:
+            calculations (List[Calculation]): The evicted calculations, oldest first.
+        """
+        if not calculations:
+            return
+        with self._lock:
+            self._pending.extend(calculations)
+            self._version += 1
+
+    def restore(self, count: int) -> None:
+        """
+        Remove the newest archived calculations, which undo puts back in the history.
+
+        Args:
+            count (int): Number of calculations taken back.
+        """
+        if count <= 0:
+            return
+        with self._lock:
+            taken = min(count, len(self._pending))
+            del self._pending[len(self._pending) - taken:]
+            if count > taken:
+                # the rest were already written to the history file
+                self._position = self._position_before(self._position, count - taken)
+            self._version += 1
+
+    def snapshot(self) -> ArchiveSnapshot:
+        """
+        Copy the archive for writing, possibly on another thread.
+
+        Returns:
+            ArchiveSnapshot: The copy.
+        """
+        with self._lock:
+            return ArchiveSnapshot(self._position, list(self._pending), self._version)
+
+    def written(self, snapshot: ArchiveSnapshot, position: int) -> None:
+        """
+        Record that a snapshot of the archive was written to the history file.
+
+        The pending calculations of the snapshot are now in the history file,
+        up to position. They are dropped from memory unless the archive has
+        changed since the snapshot was taken, in which case the next write
+        records them.
+
+        Args:
+            snapshot (ArchiveSnapshot): The archive as written.
+            position (int): End of the archived records in the new history file.
+        """
+        with self._lock:
+            if snapshot.version == self._version:
+                self._position = position
+                self._pending = []
+
+    def __len__(self) -> int:
+        """
+        Return the number of archived calculations held in memory.
+
+        Returns:
+            int: Number of pending calculations.
+        """
+        return len(self._pending)
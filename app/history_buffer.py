@@ -0,0 +1,455 @@
+### History Buffer
+
+from collections import deque
+import datetime
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Union
+
+from app.calculation import Calculation
+
+# Columns exported by to_columns(), in the order used by the history file
+COLUMNS = ('operation', 'operand1', 'operand2', 'result', 'timestamp')
+
+# Timestamps are stored in columns as microseconds since this instant
+EPOCH = datetime.datetime(1970, 1, 1)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+class HistoryBuffer:
+    """
+    Fixed-capacity ring buffer of calculations.
+
+    Stores the calculator's history oldest first. Appending to a full buffer
+    evicts the oldest calculation in constant time, replacing the list.pop(0)
+    eviction previously used by the calculator. The buffer supports indexing,
+    slicing, iteration and comparison with plain lists.
+    """
+
+    def __init__(self, max_size: int, calculations: Iterable[Calculation] = ()):
+        """
+        Initialize the buffer.
+
+        Args:
+            max_size (int): Maximum number of calculations kept.
+            calculations (Iterable[Calculation], optional): Initial calculations, oldest first.
+                Only the newest max_size calculations are kept. Defaults to ().
+        """
+        self._items: Deque[Calculation] = deque(calculations, maxlen=max_size)
+
+    @property
+    def max_size(self) -> int:
+        """
+        Get the capacity of the buffer.
+
+        Returns:
+            int: Maximum number of calculations kept.
+        """
+        return self._items.maxlen
+
+    def append(self, calculation: Calculation) -> Optional[Calculation]:
+        """
+        Append a calculation, evicting the oldest one if the buffer is full.
+
+        Args:
+            calculation (Calculation): The calculation to append.
+
+        Returns:
+            Optional[Calculation]: The evicted calculation, or None if nothing was evicted.
+        """
+        evicted = self._items[0] if len(self._items) == self._items.maxlen else None
+        self._items.append(calculation)
+        return evicted
+
+    def extend(self, calculations: Iterable[Calculation]) -> List[Calculation]:
+        """
+        Append several calculations, evicting the oldest ones as needed.
+
+        Args:
+            calculations (Iterable[Calculation]): The calculations to append, oldest first.
+
+        Returns:
+            List[Calculation]: The evicted calculations, oldest first.
+        """
+        evicted = []
+        for calculation in calculations:
+            removed = self.append(calculation)
+            if removed is not None:
+                evicted.append(removed)
+        return evicted
+
+    def appendleft(self, calculation: Calculation) -> None:
+        """
+        Insert a calculation at the oldest end of the buffer.
+
+        Used to restore calculations that were evicted from the head.
+
+        Args:
+            calculation (Calculation): The calculation to insert.
+        """
+        self._items.appendleft(calculation)
+
+    def pop(self) -> Calculation:
+        """
+        Remove and return the newest calculation.
+
+        Returns:
+            Calculation: The newest calculation.
+
+        Raises:
+            IndexError: If the buffer is empty.
+        """
+        return self._items.pop()
+
+    def clear(self) -> None:
+        """
+        Remove all calculations from the buffer.
+        """
+        self._items.clear()
+
+    def copy(self) -> List[Calculation]:
+        """
+        Return the calculations as a new list.
+
+        Returns:
+            List[Calculation]: The calculations, oldest first.
+        """
+        return list(self._items)
+
+    def to_columns(self) -> Dict[str, Any]:
+        """
+        Return the history as columns.
+
+        Operation names, operands and results are returned as lists of strings,
+        in the same form as the history file. Timestamps are returned as a numpy
+        datetime64[us] array.
+
+        Returns:
+            Dict[str, Any]: One entry per name in COLUMNS, oldest calculation first.
+        """
+        import numpy as np
+
+        return {
+            'operation': [calc.operation for calc in self._items],
+            'operand1': [str(calc.operand1) for calc in self._items],
+            'operand2': [str(calc.operand2) for calc in self._items],
+            'result': [str(calc.result) for calc in self._items],
+            # numpy converts integers much faster than datetime objects
+            'timestamp': np.array(
+                [(calc.timestamp - EPOCH) // MICROSECOND for calc in self._items],
+                dtype=np.int64
+            ).view('datetime64[us]')
+        }
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Calculation, List[Calculation]]:
+        """
+        Return a calculation by position, or a list of calculations for a slice.
+
+        Args:
+            index (Union[int, slice]): Position or slice, oldest first.
+
+        Returns:
+            Union[Calculation, List[Calculation]]: The selected calculation(s).
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self._items))
+            if step == 1:
+                return list(islice(self._items, start, stop))
+            return self.copy()[index]
+        return self._items[index]
+
+    def __iter__(self) -> Iterator[Calculation]:
+        """
+        Iterate over the calculations, oldest first.
+
+        Returns:
+            Iterator[Calculation]: Iterator over the calculations.
+        """
+        return iter(self._items)
+
+    def __reversed__(self) -> Iterator[Calculation]:
+        """
+        Iterate over the calculations, newest first.
+
+        Returns:
+            Iterator[Calculation]: Reverse iterator over the calculations.
+        """
+        return reversed(self._items)
+
+    def __len__(self) -> int:
+        """
+        Return the number of calculations in the buffer.
+
+        Returns:
+            int: Number of calculations.
+        """
+        return len(self._items)
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Compare the buffer's calculations with another buffer or a list.
+
+        Args:
+            other (object): A HistoryBuffer or list of calculations.
+
+        Returns:
+            bool: True if both hold equal calculations in the same order.
+        """
+        if isinstance(other, (HistoryBuffer, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        """
+        Return detailed string representation of the buffer.
+
+        Returns:
+            str: The buffer's capacity and calculations.
+        """
+        return f"{type(self).__name__}(max_size={self.max_size}, calculations={self.copy()!r})"
+
+
+class ColumnarHistoryBuffer(HistoryBuffer):
+    """
+    Ring buffer of calculations stored as parallel columns.
+
+    Instead of Calculation objects the buffer keeps one deque per field:
+    interned operation names, operands and results as the strings written to
+    the history file, and timestamps as integer microseconds since the epoch.
+    Exporting the history with to_columns() therefore copies each column in
+    a single step, without visiting every calculation. Calculation objects
+    are created on demand when the buffer is indexed or iterated.
+    """
+
+    def __init__(self, max_size: int, calculations: Iterable[Calculation] = ()):
+        """
+        Initialize the buffer.
+
+        Args:
+            max_size (int): Maximum number of calculations kept.
+            calculations (Iterable[Calculation], optional): Initial calculations, oldest first.
+                Only the newest max_size calculations are kept. Defaults to ().
+        """
+        self._operations: Deque[str] = deque(maxlen=max_size)
+        self._operands1: Deque[str] = deque(maxlen=max_size)
+        self._operands2: Deque[str] = deque(maxlen=max_size)
+        self._results: Deque[str] = deque(maxlen=max_size)
+        self._timestamps: Deque[int] = deque(maxlen=max_size)
+        self._columns = (
+            self._operations,
+            self._operands1,
+            self._operands2,
+            self._results,
+            self._timestamps
+        )
+        self.extend(calculations)
+
+    @property
+    def max_size(self) -> int:
+        """
+        Get the capacity of the buffer.
+
+        Returns:
+            int: Maximum number of calculations kept.
+        """
+        return self._operations.maxlen
+
+    def append(self, calculation: Calculation) -> Optional[Calculation]:
+        """
+        Append a calculation, evicting the oldest one if the buffer is full.
+
+        Args:
+            calculation (Calculation): The calculation to append.
+
+        Returns:
+            Optional[Calculation]: The evicted calculation, or None if nothing was evicted.
+        """
+        evicted = self[0] if len(self) == self.max_size else None
+        for column, value in zip(self._columns, self._to_row(calculation)):
+            column.append(value)
+        return evicted
+
+    def appendleft(self, calculation: Calculation) -> None:
+        """
+        Insert a calculation at the oldest end of the buffer.
+
+        Used to restore calculations that were evicted from the head.
+
+        Args:
+            calculation (Calculation): The calculation to insert.
+        """
+        for column, value in zip(self._columns, self._to_row(calculation)):
+            column.appendleft(value)
+
+    def pop(self) -> Calculation:
+        """
+        Remove and return the newest calculation.
+
+        Returns:
+            Calculation: The newest calculation.
+
+        Raises:
+            IndexError: If the buffer is empty.
+        """
+        return self._from_row(*(column.pop() for column in self._columns))
+
+    def clear(self) -> None:
+        """
+        Remove all calculations from the buffer.
+        """
+        for column in self._columns:
+            column.clear()
+
+    def copy(self) -> List[Calculation]:
+        """
+        Return the calculations as a new list.
+
+        Returns:
+            List[Calculation]: The calculations, oldest first.
+        """
+        return list(self)
+
+    def to_columns(self) -> Dict[str, Any]:
+        """
+        Return the history as columns.
+
+        Operation names, operands and results are returned as lists of strings,
+        in the same form as the history file. Timestamps are returned as a numpy
+        datetime64[us] array. Each column is copied as a whole.
+
+        Returns:
+            Dict[str, Any]: One entry per name in COLUMNS, oldest calculation first.
+        """
+        import numpy as np
+
+        timestamps = np.fromiter(self._timestamps, dtype=np.int64, count=len(self))
+        return {
+            'operation': list(self._operations),
+            'operand1': list(self._operands1),
+            'operand2': list(self._operands2),
+            'result': list(self._results),
+            'timestamp': timestamps.view('datetime64[us]')
+        }
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Calculation, List[Calculation]]:
+        """
+        Return a calculation by position, or a list of calculations for a slice.
+
+        Args:
+            index (Union[int, slice]): Position or slice, oldest first.
+
+        Returns:
+            Union[Calculation, List[Calculation]]: The selected calculation(s).
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step > 0:
+                # one pass over the rows; indexing a deque by position is not O(1)
+                rows = islice(zip(*self._columns), start, stop, step)
+                return [self._from_row(*row) for row in rows]
+            return self.copy()[index]
+        return self._from_row(*(column[index] for column in self._columns))
+
+    def __iter__(self) -> Iterator[Calculation]:
+        """
+        Iterate over the calculations, oldest first.
+
+        Returns:
+            Iterator[Calculation]: Iterator over the calculations.
+        """
+        return (self._from_row(*row) for row in zip(*self._columns))
+
+    def __reversed__(self) -> Iterator[Calculation]:
+        """
+        Iterate over the calculations, newest first.
+
+        Returns:
+            Iterator[Calculation]: Reverse iterator over the calculations.
+        """
+        return (
+            self._from_row(*row)
+            for row in zip(*(reversed(column) for column in self._columns))
+        )
+
+    def __len__(self) -> int:
+        """
+        Return the number of calculations in the buffer.
+
+        Returns:
+            int: Number of calculations.
+        """
+        return len(self._operations)
+
+    @staticmethod
+    def _to_row(calculation: Calculation) -> tuple:
+        """
+        Convert a calculation to the values stored in the columns.
+
+        Args:
+            calculation (Calculation): The calculation to convert.
+
+        Returns:
+            tuple: Operation name, operands, result and timestamp in microseconds.
+        """
+        return (
+            calculation.operation,
+            str(calculation.operand1),
+            str(calculation.operand2),
+            str(calculation.result),
+            (calculation.timestamp - EPOCH) // MICROSECOND
+        )
+
+    @staticmethod
+    def _from_row(operation: str, operand1: str, operand2: str, result: str, timestamp: int) -> Calculation:
+        """
+        Create a calculation from the values stored in the columns.
+
+        Args:
+            operation (str): The name of the operation.
+            operand1 (str): The first operand.
+            operand2 (str): The second operand.
+            result (str): The result.
+            timestamp (int): Microseconds since the epoch.
+
+        Returns:
+            Calculation: The calculation, without recomputing its result.
+        """
+        return Calculation.restore(
+            operation,
+            Decimal(operand1),
+            Decimal(operand2),
+            Decimal(result),
+            EPOCH + timestamp * MICROSECOND
+        )
+
+
+def columns_of(calculations: List[Calculation]) -> Dict[str, Any]:
+    """
+    Return calculations as columns, in the form of HistoryBuffer.to_columns().
+
+    Args:
+        calculations (List[Calculation]): The calculations, oldest first.
+
+    Returns:
+        Dict[str, Any]: One entry per name in COLUMNS.
+    """
+    return HistoryBuffer(len(calculations), calculations).to_columns()
+
+
+def concat_columns(*parts: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Join columns returned by to_columns(), in the order given.
+
+    Args:
+        *parts (Dict[str, Any]): Columns, oldest calculations first.
+
+    Returns:
+        Dict[str, Any]: One entry per name in COLUMNS.
+    """
+    import numpy as np
+
+    columns: Dict[str, Any] = {
+        name: [value for part in parts for value in part[name]]
+        for name in COLUMNS if name != 'timestamp'
+    }
+    columns['timestamp'] = np.concatenate([part['timestamp'] for part in parts])
+    return columns
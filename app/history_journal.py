@@ -0,0 +1,128 @@
+### History Journal
+
+import codecs
+import csv
+import io
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+from app.calculation import Calculation
+
+class HistoryJournal:
+    """
+    Append-only journal of calculations.
+
+    The journal records every calculation performed since the history file
+    (the snapshot) was last written. Appending a calculation writes a single
+    CSV row, so the cost of persisting one calculation does not depend on the
+    size of the history. The journal is replayed on top of the snapshot when
+    history is loaded and emptied whenever a new snapshot is written.
+    """
+
+    # column order shared with the history snapshot file
+    FIELDNAMES = ['operation', 'operand1', 'operand2', 'result', 'timestamp']
+
+    def __init__(self, path: Path, encoding: str = 'utf-8'):
+        """
+        Initialize the journal.
+
+        Args:
+            path (Path): Location of the journal file.
+            encoding (str, optional): Encoding used for the journal file. Defaults to 'utf-8'.
+        """
+        self.path = path
+        self.encoding = encoding
+        # number of records in the journal, counted lazily from the file
+        self._record_count: Optional[int] = None
+
+    def append(self, calculation: Calculation) -> None:
+        """
+        Append a single calculation to the journal.
+
+        Args:
+            calculation (Calculation): The calculation to record.
+        """
+        self.extend([calculation])
+
+    def extend(self, calculations: List[Calculation]) -> None:
+        """
+        Append several calculations to the journal with a single write.
+
+        Args:
+            calculations (List[Calculation]): The calculations to record, oldest first.
+        """
+        record_count = len(self)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', newline='', encoding=self.encoding) as journal_file:
+            writer = csv.DictWriter(journal_file, fieldnames=self.FIELDNAMES)
+            if journal_file.tell() == 0:
+                # a new journal starts with the same header as the snapshot
+                writer.writeheader()
+            writer.writerows(calculation.to_dict() for calculation in calculations)
+        self._record_count = record_count + len(calculations)
+
+    def read(self, verify: bool = True) -> List[Calculation]:
+        """
+        Read every calculation recorded in the journal.
+
+        A crash while appending can leave an incomplete record at the end of
+        the journal. That record is discarded and cut from the file, so the
+        complete records can still be replayed and later appends start on a
+        new line.
+
+        Args:
+            verify (bool, optional): Whether to recompute each result while reading,
+                see Calculation.from_dict. Defaults to True.
+
+        Returns:
+            List[Calculation]: Calculations in the order they were appended.
+        """
+        try:
+            with open(self.path, 'rb') as journal_file:
+                data = journal_file.read()
+        except FileNotFoundError:
+            data = b''
+
+        # bytes of a character cut off at the end are held back by the decoder
+        text = codecs.getincrementaldecoder(self.encoding)().decode(data)
+        # every complete record ends with a line break
+        complete = text[:text.rfind('\n') + 1]
+        complete_size = len(complete.encode(self.encoding)) if complete else 0
+        if complete_size < len(data):
+            logging.warning(
+                "Discarding incomplete record at the end of history journal: %r",
+                data[complete_size:]
+            )
+            with open(self.path, 'rb+') as journal_file:
+                journal_file.truncate(complete_size)
+
+        rows = csv.DictReader(io.StringIO(complete, newline=''))
+        calculations = [Calculation.from_dict(row, verify) for row in rows]
+        self._record_count = len(calculations)
+        return calculations
+
+    def clear(self) -> None:
+        """
+        Remove all records from the journal.
+
+        Called once the journaled calculations have been written to the snapshot.
+        """
+        self.path.unlink(missing_ok=True)
+        self._record_count = 0
+
+    def __len__(self) -> int:
+        """
+        Return the number of records in the journal.
+
+        Returns:
+            int: Number of journaled calculations.
+        """
+        if self._record_count is None:
+            try:
+                with open(self.path, newline='', encoding=self.encoding) as journal_file:
+                    # subtract the header row
+                    self._record_count = max(sum(1 for _ in csv.reader(journal_file)) - 1, 0)
+            except FileNotFoundError:
+                self._record_count = 0
+        return self._record_count
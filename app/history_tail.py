@@ -0,0 +1,70 @@
+### History Tail
+
+from typing import BinaryIO
+
+# Number of bytes read at a time while scanning backwards
+BLOCK_SIZE = 64 * 1024
+
+def line_start_before(history_file: BinaryIO, end: int, count: int, data_start: int = 0) -> int:
+    """
+    Find where the last count lines before a position start, scanning backwards.
+
+    Only the blocks between the returned position and end are read, so the
+    cost depends on the number of lines requested rather than the size of
+    the file. Records in the history file never contain line breaks inside
+    a field, so every line is one record.
+
+    Args:
+        history_file (BinaryIO): File opened in binary mode.
+        end (int): Position at the start of a line, or the end of the file.
+        count (int): Number of lines to step back over.
+        data_start (int, optional): Position of the first line that may be returned,
+            such as the line after a header. Defaults to 0.
+
+    Returns:
+        int: Position of the first of the count lines before end, or data_start
+        if fewer lines precede end.
+    """
+    if count <= 0 or end <= data_start:
+        return end
+
+    # a line break right before end belongs to the last line, not the one after it
+    history_file.seek(end - 1)
+    position = end - 1 if history_file.read(1) == b'\n' else end
+
+    found = 0
+    while position > data_start:
+        block_start = max(data_start, position - BLOCK_SIZE)
+        history_file.seek(block_start)
+        block = history_file.read(position - block_start)
+        index = len(block)
+        while True:
+            index = block.rfind(b'\n', 0, index)
+            if index < 0:
+                break
+            found += 1
+            if found == count:
+                return block_start + index + 1
+        position = block_start
+    return data_start
+
+def copy_prefix(source: BinaryIO, target: BinaryIO, size: int) -> None:
+    """
+    Copy the first bytes of a file to another, one block at a time.
+
+    Args:
+        source (BinaryIO): File opened in binary mode, read from its start.
+        target (BinaryIO): File opened in binary mode for writing.
+        size (int): Number of bytes to copy.
+
+    Raises:
+        EOFError: If the source holds fewer than size bytes.
+    """
+    source.seek(0)
+    remaining = size
+    while remaining:
+        block = source.read(min(BLOCK_SIZE, remaining))
+        if not block:
+            raise EOFError(f"Expected {size} bytes, found {size - remaining}")
+        target.write(block)
+        remaining -= len(block)
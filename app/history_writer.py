@@ -0,0 +1,136 @@
+### History Writer
+
+from dataclasses import dataclass
+import logging
+import queue
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from app.exceptions import OperationError
+from app.history_archive import ArchiveSnapshot
+
+@dataclass(frozen=True)
+class HistorySnapshot:
+    """
+    Copy of the calculation history taken for writing to the history file.
+
+    Snapshots are numbered in the order they are taken, so a snapshot that
+    reaches the file after a newer one can be recognized and skipped.
+    """
+
+    sequence: int # position of the snapshot in the order snapshots were taken
+    columns: Dict[str, Any] # the history as returned by HistoryBuffer.to_columns()
+    archive: Optional[ArchiveSnapshot] = None # calculations older than the history, None to write only the history
+
+    def __len__(self) -> int:
+        """
+        Return the number of calculations in the snapshot.
+
+        Returns:
+            int: Number of calculations.
+        """
+        return len(self.columns['operation'])
+
+
+class HistoryWriter:
+    """
+    Dedicated thread that writes history snapshots to the history file.
+
+    Callers submit snapshots to a bounded queue and return immediately, so
+    serializing and writing the history no longer adds to the latency of a
+    calculation. When the queue is full, submit() blocks until the writer
+    catches up (backpressure). Every snapshot holds the whole history, so
+    when several are queued only the newest is written.
+
+    A write that fails is logged on the writer thread and raised again by
+    the next flush().
+    """
+
+    def __init__(self, write: Callable[[HistorySnapshot], None], max_pending: int = 8):
+        """
+        Initialize the writer and start its thread.
+
+        Args:
+            write (Callable[[HistorySnapshot], None]): Writes one snapshot to the history file,
+                normally Calculator.write_history.
+            max_pending (int, optional): Number of snapshots that may wait in the queue
+                before submit() blocks. Defaults to 8.
+        """
+        self._write = write
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._error: Optional[Exception] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='history-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, snapshot: HistorySnapshot) -> None:
+        """
+        Queue a snapshot for writing, blocking while the queue is full.
+
+        Args:
+            snapshot (HistorySnapshot): The snapshot to write.
+
+        Raises:
+            OperationError: If the writer has been closed.
+        """
+        if self._closed:
+            raise OperationError("History writer is closed")
+        self._queue.put(snapshot)
+
+    def flush(self) -> None:
+        """
+        Wait until every submitted snapshot has been handled.
+
+        Raises:
+            OperationError: If a write failed since the last flush.
+        """
+        self._queue.join()
+        error, self._error = self._error, None
+        if error is not None:
+            raise OperationError(f"Background history write failed: {error}")
+
+    def close(self) -> None:
+        """
+        Write the remaining snapshots and stop the writer thread.
+
+        Raises:
+            OperationError: If a write failed since the last flush.
+        """
+        if not self._closed:
+            self._closed = True
+            # a None entry tells the thread to stop once everything before it is written
+            self._queue.put(None)
+            self._thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        """
+        Write queued snapshots until close() is called.
+        """
+        while True:
+            snapshot = self._queue.get()
+            taken = 1
+            stop = snapshot is None
+            # skip snapshots superseded by a newer one already in the queue
+            while not stop:
+                try:
+                    newer = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                taken += 1
+                if newer is None:
+                    stop = True
+                else:
+                    snapshot = newer
+
+            try:
+                if snapshot is not None:
+                    self._write(snapshot)
+            except Exception as e:
+                logging.error(f"Background history write failed: {e}")
+                self._error = e
+            finally:
+                for _ in range(taken):
+                    self._queue.task_done()
+            if stop:
+                return
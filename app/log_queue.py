@@ -0,0 +1,55 @@
+### Log Queue
+
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+import queue
+from typing import Optional
+
+# Listener writing queued records to the log file, None when queue logging is off
+_listener: Optional[QueueListener] = None
+
+def start_queue_logging(log_file: Path, level: str, log_format: str) -> None:
+    """
+    Route log records through a queue to a listener thread that writes the log file.
+
+    The root logger gets a QueueHandler, so logging a record only formats
+    its message and puts it on a queue; the file write happens on the
+    listener thread. Replaces any existing logging configuration, including
+    a listener started earlier.
+
+    Args:
+        log_file (Path): File the listener writes to.
+        level (str): Minimum level of the records logged, such as 'INFO'.
+        log_format (str): Format of the lines written to the log file.
+    """
+    global _listener
+    stop_queue_logging()
+
+    file_handler = logging.FileHandler(str(log_file))
+    file_handler.setFormatter(logging.Formatter(log_format))
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = QueueHandler(records)
+    # the file handler adds the timestamp and level when the record is written
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=level, handlers=[queue_handler], force=True)
+
+    _listener = QueueListener(records, file_handler)
+    _listener.start()
+
+def stop_queue_logging() -> None:
+    """
+    Write the queued log records and stop the listener thread, if one is running.
+    """
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+# queued records must reach the log file before the interpreter exits
+atexit.register(stop_queue_logging)
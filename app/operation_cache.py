@@ -0,0 +1,118 @@
+### Operation Cache
+
+from collections import OrderedDict
+from decimal import Decimal, getcontext
+import threading
+from typing import Callable, Hashable
+
+from app.decimal_math import get_precision
+
+class OperationCache:
+    """
+    Bounded cache of operation results.
+
+    Results are keyed by the operation name and the exact operands, together
+    with the precision settings that affect the result, so a cached result
+    is always the one the operation would compute. Operands are keyed by
+    their string form rather than their value: Decimal('2.0') and
+    Decimal('2') are equal but give differently formatted results. The
+    calculator normalizes its inputs, so equal inputs share an entry.
+
+    Once the cache is full, adding a result evicts the least recently used
+    entry ('lru') or the oldest entry ('fifo'). Calculations that raise an
+    error are not cached. The cache may be used from several threads.
+    """
+
+    def __init__(self, max_size: int = 1024, eviction: str = 'lru'):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_size (int, optional): Maximum number of results kept, 0 to disable
+                caching. Defaults to 1024.
+            eviction (str, optional): 'lru' or 'fifo'. Defaults to 'lru'.
+        """
+        self.max_size = max_size
+        self.eviction = eviction
+        # number of lookups answered from the cache, and computed instead
+        self.hits = 0
+        self.misses = 0
+        self._results: 'OrderedDict[Hashable, Decimal]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(
+        self,
+        operation: str,
+        a: Decimal,
+        b: Decimal,
+        compute: Callable[[], Decimal]
+    ) -> Decimal:
+        """
+        Return the cached result of an operation, computing and caching it if needed.
+
+        Args:
+            operation (str): The name of the operation (ex: Addition).
+            a (Decimal): The first operand.
+            b (Decimal): The second operand.
+            compute (Callable[[], Decimal]): Computes the result on a cache miss.
+
+        Returns:
+            Decimal: The result of the operation.
+        """
+        if not self.max_size:
+            return compute()
+
+        # power and root round to the calculator's places, other operations to the context
+        key = (operation, str(a), str(b), get_precision(), getcontext().prec)
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self.hits += 1
+                if self.eviction == 'lru':
+                    self._results.move_to_end(key)
+                return result
+            self.misses += 1
+
+        # computed outside the lock, so a slow operation does not block other threads
+        result = compute()
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+        return result
+
+    def configure(self, max_size: int, eviction: str) -> None:
+        """
+        Change the size and eviction policy, evicting entries that no longer fit.
+
+        Args:
+            max_size (int): Maximum number of results kept, 0 to disable caching.
+            eviction (str): 'lru' or 'fifo'.
+        """
+        with self._lock:
+            self.max_size = max_size
+            self.eviction = eviction
+            while len(self._results) > max_size:
+                self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Remove every cached result and reset the hit and miss counters.
+        """
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        """
+        Return the number of cached results.
+
+        Returns:
+            int: Number of cached results.
+        """
+        return len(self._results)
+
+# Results shared by Calculator.perform_operation and Calculation,
+# sized by the calculator from its configuration
+operation_cache = OperationCache()
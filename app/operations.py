@@ -2,9 +2,16 @@
 
 from abc import ABC, abstractmethod
 from decimal import Decimal
-from typing import Dict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from app import decimal_math
 from app.exceptions import ValidationError
 
+if TYPE_CHECKING: # pragma: no cover
+    import numpy as np
+
+# A boolean row mask paired with the validation message for the masked rows
+ArrayValidation = List[Tuple[Any, str]]
+
 class Operation(ABC):
     """
     abstract base class for calculator operations
@@ -48,6 +55,52 @@ class Operation(ABC):
         """
         pass
 
+    @property
+    def supports_arrays(self) -> bool:
+        """
+        Check whether the operation provides a float64 array kernel.
+
+        Returns:
+            bool: True if execute_arrays is implemented.
+        """
+        return type(self).execute_arrays is not Operation.execute_arrays
+
+    def validate_arrays(self, a: 'np.ndarray', b: 'np.ndarray') -> ArrayValidation:
+        """
+        Validate arrays of operands before vectorized execution.
+
+        Vectorized counterpart of validate_operands. Instead of raising, returns
+        the rows that break each rule as boolean masks, so one invalid row does
+        not stop the others.
+
+        Args:
+            a (np.ndarray): First operands as float64.
+            b (np.ndarray): Second operands as float64.
+
+        Returns:
+            ArrayValidation: (mask, message) pairs, one per violated rule.
+        """
+        return []
+
+    def execute_arrays(self, a: 'np.ndarray', b: 'np.ndarray') -> 'np.ndarray':
+        """
+        Execute the operation on arrays of valid operands using float64 arithmetic.
+
+        Operations without an array kernel raise NotImplementedError, in which
+        case callers fall back to the exact Decimal path.
+
+        Args:
+            a (np.ndarray): First operands as float64.
+            b (np.ndarray): Second operands as float64.
+
+        Returns:
+            np.ndarray: Results of the operation.
+
+        Raises:
+            NotImplementedError: If the operation has no array kernel.
+        """
+        raise NotImplementedError(f"{self} has no array kernel")
+
     def __str__(self) -> str:
         """
         Return operation name for display.
@@ -77,6 +130,19 @@ class Addition(Operation):
         """
         self.validate_operands(a,b)
         return a + b
+
+    def execute_arrays(self, a: 'np.ndarray', b: 'np.ndarray') -> 'np.ndarray':
+        """
+        Add arrays of numbers.
+
+        Args:
+            a (np.ndarray): First operands.
+            b (np.ndarray): Second operands.
+
+        Returns:
+            np.ndarray: Element-wise sums.
+        """
+        return a + b
     
 class Subtraction(Operation):
     """
@@ -97,6 +163,19 @@ class Subtraction(Operation):
         """
         self.validate_operands(a,b)
         return a - b
+
+    def execute_arrays(self, a: 'np.ndarray', b: 'np.ndarray') -> 'np.ndarray':
+        """
+        Subtract arrays of numbers.
+
+        Args:
+            a (np.ndarray): First operands.
+            b (np.ndarray): Second operands.
+
+        Returns:
+            np.ndarray: Element-wise differences.
+        """
+        return a - b
     
 class Multiplication(Operation):
     """
@@ -117,6 +196,19 @@ class Multiplication(Operation):
         self.validate_operands(a,b)
         return a * b
 
+    def execute_arrays(self, a: 'np.ndarray', b: 'np.ndarray') -> 'np.ndarray':
+        """
+        Multiply arrays of numbers.
+
+        Args:
+            a (np.ndarray): First operands.
+            b (np.ndarray): Second operands.
+
+        Returns:
+            np.ndarray: Element-wise products.
+        """
+        return a * b
+
 class Division(Operation):
     """
     Division operation implementation. Performs the division of one number
@@ -155,6 +247,32 @@ class Division(Operation):
         """
         self.validate_operands(a,b)
         return a / b
+
+    def validate_arrays(self, a: 'np.ndarray', b: 'np.ndarray') -> ArrayValidation:
+        """
+        Flag rows dividing by zero.
+
+        Args:
+            a (np.ndarray): Dividends.
+            b (np.ndarray): Divisors.
+
+        Returns:
+            ArrayValidation: Rows whose divisor is zero.
+        """
+        return [(b == 0, "Division by zero is not allowed")]
+
+    def execute_arrays(self, a: 'np.ndarray', b: 'np.ndarray') -> 'np.ndarray':
+        """
+        Divide arrays of numbers.
+
+        Args:
+            a (np.ndarray): Dividends.
+            b (np.ndarray): Non-zero divisors.
+
+        Returns:
+            np.ndarray: Element-wise quotients.
+        """
+        return a / b
     
 class Power(Operation):
     """
@@ -167,23 +285,29 @@ class Power(Operation):
         """
         Validate operands for power operation.
 
-        Overrides the base class method to ensure that the exponent is not negative.
+        Overrides the base class method to ensure that the exponent is not negative,
+        and that a negative base is only raised to integer powers.
 
         Args:
             a (Decimal): Base number.
             b (Decimal): Exponent.
 
         Raises:
-            ValidationError: If the exponent is negative.
+            ValidationError: If the exponent is negative, or fractional with a negative base.
         """
         super().validate_operands(a,b)
         if b < 0:
             raise ValidationError("Negative exponents not supported")
+        if a < 0 and b != b.to_integral_value():
+            raise ValidationError("Fractional powers of negative numbers are not supported")
         
     def execute(self, a: Decimal, b: Decimal) -> Decimal:
         """
         Calculate one number raised to the power of another.
 
+        Computed natively in Decimal, exactly for integer exponents, to the
+        number of decimal places set by decimal_math.precision.
+
         Args:
             a (Decimal): Base number.
             b (Decimal): Exponent.
@@ -192,7 +316,39 @@ class Power(Operation):
             Decimal: Result of the exponentiation.
         """
         self.validate_operands(a,b)
-        return Decimal(pow(float(a), float(b)))
+        return decimal_math.power(a, b)
+
+    def validate_arrays(self, a: 'np.ndarray', b: 'np.ndarray') -> ArrayValidation:
+        """
+        Flag rows with a negative exponent, or a negative base and a fractional exponent.
+
+        Args:
+            a (np.ndarray): Base numbers.
+            b (np.ndarray): Exponents.
+
+        Returns:
+            ArrayValidation: Rows whose exponent is negative and rows raising a
+            negative base to a fractional power.
+        """
+        import numpy as np
+
+        return [
+            (b < 0, "Negative exponents not supported"),
+            ((a < 0) & (b != np.floor(b)), "Fractional powers of negative numbers are not supported"),
+        ]
+
+    def execute_arrays(self, a: 'np.ndarray', b: 'np.ndarray') -> 'np.ndarray':
+        """
+        Raise an array of numbers to an array of powers.
+
+        Args:
+            a (np.ndarray): Base numbers.
+            b (np.ndarray): Non-negative exponents.
+
+        Returns:
+            np.ndarray: Element-wise powers.
+        """
+        return a ** b
     
 class Root(Operation):
     """
@@ -223,6 +379,9 @@ class Root(Operation):
         """
         Calculate the nth root of a number.
 
+        Computed natively in Decimal to the number of decimal places set by
+        decimal_math.precision.
+
         Args:
             a (Decimal): Number from which the root is taken.
             b (Decimal): Degree of the root.
@@ -231,7 +390,36 @@ class Root(Operation):
             Decimal: Result of the root calculation.
         """
         self.validate_operands(a,b)
-        return Decimal(pow(float(a), 1 / float(b)))
+        return decimal_math.root(a, b)
+
+    def validate_arrays(self, a: 'np.ndarray', b: 'np.ndarray') -> ArrayValidation:
+        """
+        Flag rows with a negative number or a zero root degree.
+
+        Args:
+            a (np.ndarray): Numbers from which the root is taken.
+            b (np.ndarray): Degrees of the root.
+
+        Returns:
+            ArrayValidation: Rows with a negative number and rows with a zero degree.
+        """
+        return [
+            (a < 0, "Cannot calculate root of negative number"),
+            (b == 0, "Zero root is undefined"),
+        ]
+
+    def execute_arrays(self, a: 'np.ndarray', b: 'np.ndarray') -> 'np.ndarray':
+        """
+        Calculate the nth roots of an array of numbers.
+
+        Args:
+            a (np.ndarray): Non-negative numbers.
+            b (np.ndarray): Non-zero degrees of the root.
+
+        Returns:
+            np.ndarray: Element-wise roots.
+        """
+        return a ** (1 / b)
     
 class OperationFactory:
     """
@@ -240,6 +428,12 @@ class OperationFactory:
     Implements the Factory pattern by providing a method to instantiate
     different operation classes based on a given operation type. This promotes
     scalability and decouples the creation logic from the Calculator class.
+
+    Operations are stateless, so the factory hands out one shared instance
+    per operation (a flyweight) instead of creating a new one per request.
+    Besides the identifiers, operations can be requested by alias or symbol,
+    such as '+' or '^'. Every spelling that has been resolved once is
+    remembered, so repeated requests are a single dictionary lookup.
     """
 
     # Dictionary mapping operatin identifiers to their corresponding classes
@@ -252,6 +446,33 @@ class OperationFactory:
         'root': Root
     }
 
+    # Alternative names and symbols, mapped to operation identifiers
+    _aliases: Dict[str, str] = {
+        '+': 'add',
+        '-': 'subtract',
+        '*': 'multiply',
+        '×': 'multiply',
+        '/': 'divide',
+        '÷': 'divide',
+        '^': 'power',
+        '**': 'power',
+        '√': 'root'
+    }
+
+    # One shared instance of each operation, keyed by identifier
+    _instances: Dict[str, Operation] = {
+        identifier: operation_class() for identifier, operation_class in _operations.items()
+    }
+
+    # The same instances keyed by the name recorded in Calculation.operation
+    # (str(operation), normally the class name)
+    _by_name: Dict[str, Operation] = {
+        str(operation): operation for operation in _instances.values()
+    }
+
+    # Operations by every spelling create_operation has resolved, exactly as requested
+    _resolved: Dict[str, Operation] = {}
+
     @classmethod
     def register_operation(cls, name: str, operation_class: type) -> None:
         """
@@ -268,26 +489,85 @@ class OperationFactory:
         """
         if not issubclass(operation_class, Operation):
             raise TypeError("Operation class must inherit from Operations")
+        operation = operation_class()
         cls._operations[name.lower()] = operation_class
-    
+        cls._instances[name.lower()] = operation
+        cls._by_name[str(operation)] = operation
+        # a spelling resolved earlier may now refer to the new operation
+        cls._resolved.clear()
+
+    @classmethod
+    def register_alias(cls, alias: str, name: str) -> None:
+        """
+        Register an alternative name or symbol for an operation.
+
+        Args:
+            alias (str): The alternative name or symbol (e.g., '%').
+            name (str): Identifier of a registered operation (e.g., 'modulus').
+
+        Raises:
+            ValueError: If the operation is unknown.
+        """
+        if name.lower() not in cls._instances:
+            raise ValueError(f"Unknown operation: {name}")
+        cls._aliases[alias.strip().lower()] = name.lower()
+        cls._resolved.clear()
+
+    @classmethod
+    def get_by_name(cls, name: str) -> Optional[Operation]:
+        """
+        Get the shared instance of an operation by the name calculations record.
+
+        Used to recalculate saved calculations, whose operation is stored as
+        str(operation), such as 'Addition'.
+
+        Args:
+            name (str): The operation's name.
+
+        Returns:
+            Optional[Operation]: The operation, or None if no registered operation has that name.
+        """
+        return cls._by_name.get(name)
+
+    @classmethod
+    def has_operation(cls, operation_type: str) -> bool:
+        """
+        Check whether an identifier, alias or symbol names a registered operation.
+
+        Args:
+            operation_type (str): The identifier, alias or symbol (e.g., 'add' or '+').
+
+        Returns:
+            bool: True if create_operation would return an operation.
+        """
+        try:
+            cls.create_operation(operation_type)
+        except ValueError:
+            return False
+        return True
+
     @classmethod
     def create_operation(cls, operation_type: str) -> Operation:
         """
-        Create an operation instance based on the operation type.
+        Get the operation for an identifier, alias or symbol.
 
-        This method retrieves the appropriate operation class from the
-        _operations dictionary and instantiates it.
+        Identifiers and aliases are matched ignoring case and surrounding
+        whitespace. The same shared instance is returned on every call.
 
         Args:
-            operation_type (str): The type of operation to create (e.g., 'add').
+            operation_type (str): The type of operation to create (e.g., 'add' or '+').
 
         Returns:
-            Operation: An instance of the specified operation class.
+            Operation: The shared instance of the specified operation.
 
         Raises:
             ValueError: If the operation type is unknown.
         """
-        operation_class = cls._operations.get(operation_type.lower())
-        if not operation_class:
-            raise ValueError(f"Unknown operation: {operation_type}")
-        return operation_class()
+        operation = cls._resolved.get(operation_type)
+        if operation is None:
+            key = operation_type.strip().lower()
+            operation = cls._instances.get(cls._aliases.get(key, key))
+            if operation is None:
+                raise ValueError(f"Unknown operation: {operation_type}")
+            cls._resolved[operation_type] = operation
+        return operation
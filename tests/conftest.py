@@ -0,0 +1,14 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.operations import OperationFactory
+
+
+@pytest.fixture
+def operation_registry():
+    """Undo operations and aliases registered with the OperationFactory during a test."""
+    with patch.dict(OperationFactory._operations), patch.dict(OperationFactory._instances), \
+            patch.dict(OperationFactory._by_name), patch.dict(OperationFactory._aliases), \
+            patch.dict(OperationFactory._resolved):
+        yield OperationFactory
@@ -0,0 +1,57 @@
+import pytest
+from unittest.mock import patch
+from app.atomic_write import AtomicWriter
+
+
+def write_text(writer, path, text):
+    with writer.replace(path) as temp_path:
+        temp_path.write_text(text)
+
+
+def test_replace_writes_new_contents(tmp_path):
+    path = tmp_path / "history.csv"
+    path.write_text("old")
+    write_text(AtomicWriter(), path, "new")
+    assert path.read_text() == "new"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_replace_keeps_old_contents_on_failure(tmp_path):
+    path = tmp_path / "history.csv"
+    path.write_text("old")
+    with pytest.raises(OSError, match="disk full"):
+        with AtomicWriter().replace(path) as temp_path:
+            temp_path.write_text("partial")
+            raise OSError("disk full")
+    assert path.read_text() == "old"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_always_syncs_file_and_directory(tmp_path):
+    with patch('app.atomic_write.os.fsync') as mock_fsync:
+        write_text(AtomicWriter('always'), tmp_path / "history.csv", "data")
+        write_text(AtomicWriter('always'), tmp_path / "history.csv", "data")
+    assert mock_fsync.call_count == 4
+
+
+def test_never_syncs(tmp_path):
+    with patch('app.atomic_write.os.fsync') as mock_fsync:
+        write_text(AtomicWriter('never'), tmp_path / "history.csv", "data")
+    mock_fsync.assert_not_called()
+
+
+def test_interval_syncs_at_most_once_per_interval(tmp_path):
+    writer = AtomicWriter('interval', interval=30)
+    with patch('app.atomic_write.os.fsync') as mock_fsync, \
+         patch('app.atomic_write.time.monotonic', side_effect=[100, 110, 130]):
+        for _ in range(3):
+            write_text(writer, tmp_path / "history.csv", "data")
+    # synced at 100 and 130, skipped at 110
+    assert mock_fsync.call_count == 4
+
+
+def test_directory_sync_skipped_where_unsupported(tmp_path):
+    with patch('app.atomic_write.os.open', side_effect=PermissionError), \
+         patch('app.atomic_write.os.fsync') as mock_fsync:
+        write_text(AtomicWriter('always'), tmp_path / "history.csv", "data")
+    mock_fsync.assert_called_once()
@@ -0,0 +1,147 @@
+import datetime
+import time
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+
+import pandas as pd
+import pytest
+from decimal import Decimal
+
+from app import decimal_math
+from app.calculation import Calculation
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+
+HISTORY_ROWS = 100_000
+
+
+@pytest.fixture
+def large_history(tmp_path):
+    """Calculator config whose history file holds HISTORY_ROWS additions."""
+    config = CalculatorConfig(base_dir=tmp_path, max_history_size=HISTORY_ROWS, auto_save=False)
+    config.history_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.datetime(2024, 1, 1).isoformat()
+    pd.DataFrame({
+        'operation': ['Addition'] * HISTORY_ROWS,
+        'operand1': [str(i) for i in range(HISTORY_ROWS)],
+        'operand2': ['1.5'] * HISTORY_ROWS,
+        'result': [str(i + 1.5) for i in range(HISTORY_ROWS)],
+        'timestamp': [timestamp] * HISTORY_ROWS,
+    }).to_csv(config.history_file, index=False)
+    return config
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("verify_mode", ['full', 'none'])
+def test_load_history_benchmark(large_history, verify_mode):
+    large_history.history_verify = verify_mode
+    calculator = Calculator(config=large_history)
+
+    start = time.perf_counter()
+    calculator.load_history()
+    elapsed = time.perf_counter() - start
+    print(f"\nLoaded {HISTORY_ROWS} rows with history_verify={verify_mode} in {elapsed:.3f}s")
+
+    assert len(calculator.history) == HISTORY_ROWS
+    assert calculator.history[-1].result == Decimal(str(HISTORY_ROWS - 1 + 1.5))
+
+
+@dataclass
+class DictCalculation:
+    """Calculation fields stored in a regular per-instance __dict__, for comparison."""
+    operation: str
+    operand1: Decimal
+    operand2: Decimal
+    result: Decimal
+    timestamp: datetime.datetime
+
+
+def _traced_size(build):
+    """Return the memory allocated by build() and still held by its result."""
+    tracemalloc.start()
+    try:
+        built = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del built
+    return size
+
+
+@pytest.mark.slow
+def test_calculation_memory_benchmark():
+    # operation names are read from files as separate string objects
+    rows = [
+        (''.join(['Add', 'ition']), str(i), '1.5', str(i + 1.5), '2024-01-01T00:00:00')
+        for i in range(HISTORY_ROWS)
+    ]
+
+    def build_dict_calculations():
+        return [
+            DictCalculation(
+                operation,
+                Decimal(operand1),
+                Decimal(operand2),
+                Decimal(result),
+                datetime.datetime.fromisoformat(timestamp)
+            )
+            for operation, operand1, operand2, result, timestamp in rows
+        ]
+
+    def build_calculations():
+        return [Calculation.from_row(*row, verify=False) for row in rows]
+
+    dict_size = _traced_size(build_dict_calculations) / HISTORY_ROWS
+    slotted_size = _traced_size(build_calculations) / HISTORY_ROWS
+    print(f"\nBytes per calculation: {dict_size:.0f} with __dict__, {slotted_size:.0f} slotted")
+
+    calculation = Calculation.from_row(*rows[0], verify=False)
+    assert not hasattr(calculation, '__dict__')
+    assert slotted_size < dict_size
+
+
+@pytest.mark.slow
+def test_load_history_tail_benchmark(large_history):
+    large_history.max_history_size = 1000
+    calculator = Calculator(config=large_history)
+
+    start = time.perf_counter()
+    calculator.load_history()
+    elapsed = time.perf_counter() - start
+    print(f"\nLoaded the newest 1000 of {HISTORY_ROWS} rows in {elapsed:.3f}s")
+
+    assert len(calculator.history) == 1000
+    assert calculator.history[0].operand1 == Decimal(HISTORY_ROWS - 1000)
+
+
+# typical calculator input: short operands raised to small integer powers
+POWER_OPERANDS = [
+    (Decimal(base), Decimal(exponent))
+    for base, exponent in [('1.5', '3'), ('2', '10'), ('1.1', '7'), ('3.7', '2'),
+                           ('12.34', '3'), ('0.5', '4'), ('2.25', '2'), ('7', '5')]
+]
+
+
+@pytest.mark.slow
+def test_small_integer_power_benchmark():
+    def decimal_powers():
+        for base, exponent in POWER_OPERANDS:
+            decimal_math.power(base, exponent)
+
+    def float_powers():
+        for base, exponent in POWER_OPERANDS:
+            Decimal(pow(float(base), float(exponent)))
+
+    # alternate the two so that both see the same machine load
+    decimal_time = float_time = float('inf')
+    for _ in range(15):
+        decimal_time = min(decimal_time, timeit.timeit(decimal_powers, number=2000))
+        float_time = min(float_time, timeit.timeit(float_powers, number=2000))
+    calls = 2000 * len(POWER_OPERANDS)
+    decimal_time, float_time = decimal_time / calls, float_time / calls
+    print(f"\nSmall integer powers: {decimal_time * 1e9:.0f}ns in Decimal, "
+          f"{float_time * 1e9:.0f}ns through float")
+
+    for base, exponent in POWER_OPERANDS:
+        assert decimal_math.power(base, exponent) == base ** exponent
@@ -0,0 +1,81 @@
+import datetime
+import logging
+import pytest
+from decimal import Decimal
+from app.binary_history import HEADER, BinaryHistoryFile
+from app.calculation import Calculation
+from app.exceptions import OperationError
+from app.history_buffer import HistoryBuffer
+
+
+def make_calculations(count):
+    return [
+        Calculation(
+            operation="Addition" if i % 2 else "Power",
+            operand1=Decimal(i),
+            operand2=Decimal("2"),
+            timestamp=datetime.datetime(2024, 1, 1) + datetime.timedelta(microseconds=i)
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def history_file(tmp_path):
+    return BinaryHistoryFile(tmp_path / "history.bin")
+
+
+def test_write_and_read_round_trip(history_file):
+    calcs = make_calculations(5)
+    history_file.write(HistoryBuffer(5, calcs).to_columns())
+
+    loaded = history_file.read()
+    assert loaded == calcs
+    assert [calc.timestamp for calc in loaded] == [calc.timestamp for calc in calcs]
+    assert len(history_file) == 5
+
+
+def test_read_range(history_file):
+    calcs = make_calculations(6)
+    history_file.write(HistoryBuffer(6, calcs).to_columns())
+
+    assert history_file.read(2, 4) == calcs[2:4]
+    assert history_file.read(-2) == calcs[-2:]
+    assert history_file.read(-100) == calcs
+    assert history_file.read(4, 2) == []
+
+
+def test_distinct_values_are_shared(history_file):
+    calcs = make_calculations(4)
+    history_file.write(HistoryBuffer(4, calcs).to_columns())
+
+    loaded = history_file.read(verify=False)
+    assert loaded[0].operand2 is loaded[3].operand2
+    assert loaded[1].operation is loaded[3].operation
+
+
+def test_read_verifies_results(history_file, caplog):
+    calc = Calculation.restore("Addition", Decimal("2"), Decimal("3"), Decimal("10"))
+    history_file.write(HistoryBuffer(1, [calc]).to_columns())
+
+    with caplog.at_level(logging.WARNING):
+        assert history_file.read()[0].result == Decimal("5")
+    assert "differs from computed result 5" in caplog.text
+    assert history_file.read(verify=False)[0].result == Decimal("10")
+
+
+def test_empty_history(history_file):
+    history_file.write(HistoryBuffer(1).to_columns())
+    assert history_file.read() == []
+    assert len(history_file) == 0
+
+
+@pytest.mark.parametrize("contents, message", [
+    (b"", "header is truncated"),
+    (b"NOTAHIST" + bytes(HEADER.size - 8), "unrecognized format"),
+    (HEADER.pack(b"CALCHIST", 99, 0, 0, HEADER.size), "Unsupported binary history file version: 99"),
+])
+def test_invalid_file(history_file, contents, message):
+    history_file.path.write_bytes(contents)
+    with pytest.raises(OperationError, match=message):
+        history_file.read()
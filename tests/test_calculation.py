@@ -37,7 +37,7 @@ def test_power():
 
 
 def test_negative_power():
-    with pytest.raises(OperationError, match="Negative exponents are not supported"):
+    with pytest.raises(OperationError, match="Negative exponents not supported"):
         Calculation(operation="Power", operand1=Decimal("2"), operand2=Decimal("-3"))
 
 
@@ -51,6 +51,27 @@ def test_invalid_root():
         Calculation(operation="Root", operand1=Decimal("-16"), operand2=Decimal("2"))
 
 
+def test_zero_root():
+    with pytest.raises(OperationError, match="Zero root is undefined"):
+        Calculation(operation="Root", operand1=Decimal("16"), operand2=Decimal("0"))
+
+
+def test_registered_operation_is_recalculated(operation_registry):
+    from app.operations import Operation, OperationFactory
+
+    class Modulo(Operation):
+        def execute(self, a: Decimal, b: Decimal) -> Decimal:
+            return a % b
+
+    OperationFactory.register_operation("modulo", Modulo)
+    calc = Calculation(operation="Modulo", operand1=Decimal("17"), operand2=Decimal("5"))
+    assert calc.result == Decimal("2")
+
+    loaded = Calculation.from_dict(calc.to_dict())
+    assert loaded.result == Decimal("2")
+    assert loaded.verify()
+
+
 def test_unknown_operation():
     with pytest.raises(OperationError, match="Unknown operation"):
         Calculation(operation="Unknown", operand1=Decimal("5"), operand2=Decimal("3"))
@@ -170,3 +191,44 @@ def test_calculation_eq_returns_not_implemented_for_non_calculation():
     assert eq_result is NotImplemented
 
 
+
+
+def test_from_dict_without_verify_restores_saved_result():
+    data = {
+        "operation": "Addition",
+        "operand1": "2",
+        "operand2": "3",
+        "result": "10",
+        "timestamp": "2024-01-01T12:00:00"
+    }
+    calc = Calculation.from_dict(data, verify=False)
+    assert calc.result == Decimal("10")
+    assert calc.timestamp == datetime(2024, 1, 1, 12, 0)
+
+
+def test_from_dict_without_verify_rejects_invalid_data():
+    with pytest.raises(OperationError, match="Invalid calculation data"):
+        Calculation.from_dict({"operation": "Addition"}, verify=False)
+
+
+def test_verify(caplog):
+    calc = Calculation.restore("Addition", Decimal("2"), Decimal("3"), Decimal("10"))
+    with caplog.at_level(logging.WARNING):
+        assert not calc.verify()
+    assert "Loaded calculation result 10 differs from computed result 5" in caplog.text
+    calc.result = Decimal("5")
+    assert calc.verify()
+
+
+def test_verify_unknown_operation(caplog):
+    calc = Calculation.restore("Modulo", Decimal("2"), Decimal("3"), Decimal("2"))
+    with caplog.at_level(logging.WARNING):
+        assert not calc.verify()
+    assert "Could not verify loaded calculation" in caplog.text
+
+
+def test_calculation_is_slotted_with_interned_operation():
+    calc1 = Calculation(operation=''.join(["Add", "ition"]), operand1=Decimal("1"), operand2=Decimal("2"))
+    calc2 = Calculation.restore(''.join(["Add", "ition"]), Decimal("1"), Decimal("2"), Decimal("3"))
+    assert not hasattr(calc1, '__dict__')
+    assert calc1.operation is calc2.operation
@@ -6,12 +6,13 @@ import pytest
 from unittest.mock import Mock, patch, PropertyMock, MagicMock
 from decimal import Decimal
 from tempfile import TemporaryDirectory
+from app.binary_history import BinaryHistoryFile
 from app.calculator import Calculator
 from app.calculator_repl import calculator_repl
 from app.calculator_config import CalculatorConfig
 from app.calculation import Calculation
 from app.exceptions import OperationError, ValidationError
-from app.history import LoggingObserver, AutoSaveObserver
+from app.history import LoggingObserver, AutoSaveObserver, JournalAutoSaveObserver
 from app.operations import OperationFactory, Addition
 import logging
 
@@ -47,6 +48,38 @@ def test_calculator_initialization(calculator):
 
 # Test Logging Setup
 
+def test_queue_logging(tmp_path):
+    from logging.handlers import QueueHandler
+    from app.log_queue import stop_queue_logging
+    config = CalculatorConfig(base_dir=tmp_path, log_queue=True)
+    with patch.object(CalculatorConfig, 'log_dir', new_callable=PropertyMock) as mock_log_dir, \
+         patch.object(CalculatorConfig, 'log_file', new_callable=PropertyMock) as mock_log_file:
+        mock_log_dir.return_value = tmp_path / "logs"
+        mock_log_file.return_value = tmp_path / "logs/calculator.log"
+        calculator = Calculator(config)
+        assert isinstance(logging.getLogger().handlers[0], QueueHandler)
+        calculator.set_operation(Addition())
+        stop_queue_logging()
+        assert "INFO - Set operation: Addition" in (tmp_path / "logs/calculator.log").read_text()
+
+def test_disabled_log_level_skips_formatting(calculator):
+    class Operand(Decimal):
+        formatted = 0
+        def __str__(self):
+            Operand.formatted += 1
+            return super().__str__()
+
+    calculator.add_observer(LoggingObserver())
+    calculation = Calculation('Addition', Operand(1), Operand(2))
+    Operand.formatted = 0
+    logging.getLogger().setLevel(logging.WARNING)
+    try:
+        calculator.notify_observers(calculation)
+        calculator.notify_observers_batch([calculation, calculation])
+    finally:
+        logging.getLogger().setLevel(logging.INFO)
+    assert Operand.formatted == 0
+
 @patch('app.calculator.logging.info')
 def test_logging_setup(logging_info_mock):
     with patch.object(CalculatorConfig, 'log_dir', new_callable=PropertyMock) as mock_log_dir, \
@@ -114,26 +147,28 @@ def test_redo(calculator):
 
 # Test History Management
 
-@patch('app.calculator.pd.DataFrame.to_csv')
-def test_save_history(mock_to_csv, calculator):
+@patch('app.atomic_write._sync_file')
+@patch('app.atomic_write.os.replace')
+@patch('pandas.DataFrame.to_csv')
+def test_save_history(mock_to_csv, mock_replace, mock_sync_file, calculator):
     operation = OperationFactory.create_operation('add')
     calculator.set_operation(operation)
     calculator.perform_operation(2, 3)
     calculator.save_history()
     mock_to_csv.assert_called_once()
+    # the file is written next to the history file and then moved into place
+    temp_file = mock_to_csv.call_args.args[0]
+    assert temp_file.parent == calculator.config.history_file.parent
+    mock_replace.assert_called_once_with(temp_file, calculator.config.history_file)
+    mock_sync_file.assert_called_once_with(temp_file)
+
+def test_load_history(calculator):
+    # Columns may appear in any order; values keep their exact digits
+    calculator.config.history_file.write_text(
+        "timestamp,operation,operand1,operand2,result\n"
+        f"{datetime.datetime.now().isoformat()},Addition,2,3,5\n"
+    )
 
-@patch('app.calculator.pd.read_csv')
-@patch('app.calculator.Path.exists', return_value=True)
-def test_load_history(mock_exists, mock_read_csv, calculator):
-    # Mock CSV data to match the expected format in from_dict
-    mock_read_csv.return_value = pd.DataFrame({
-        'operation': ['Addition'],
-        'operand1': ['2'],
-        'operand2': ['3'],
-        'result': ['5'],
-        'timestamp': [datetime.datetime.now().isoformat()]
-    })
-    
     # Test the load_history functionality
     try:
         calculator.load_history()
@@ -245,7 +280,10 @@ def test_history_pop_when_max_history_exceeded():
     assert all("1" not in str(c) for c in calc.history)  # the first entry was removed
 
 # covers lines 266-268 of calculator.py
-def test_save_history_saves_empty_csv_and_logs(tmp_path):
+def test_save_history_saves_empty_csv_and_logs(tmp_path, monkeypatch):
+    # keep the history file under tmp_path even if test_config set these
+    for name in ('CALCULATOR_HISTORY_DIR', 'CALCULATOR_HISTORY_FILE', 'CALCULATOR_LOG_DIR', 'CALCULATOR_LOG_FILE'):
+        monkeypatch.delenv(name, raising=False)
     config = CalculatorConfig(base_dir=tmp_path)
     calc = Calculator(config=config)
     calc.history.clear()
@@ -297,8 +335,8 @@ def test_load_history_exception_logging_and_reraise(tmp_path):
     # Create empty file so .exists() returns True and code tries to read CSV
     calc.config.history_file.touch()
 
-    # Patch pandas.read_csv to raise an exception to simulate load failure
-    with patch('pandas.read_csv', side_effect=Exception("Simulated load failure")), \
+    # Make reading the records fail to simulate a load failure
+    with patch('app.calculator.line_start_before', side_effect=Exception("Simulated load failure")), \
          patch('logging.error') as mock_log_error:
 
         with pytest.raises(OperationError) as exc_info:
@@ -408,3 +446,857 @@ def test_redo_returns_false_when_redo_stack_empty():
     result = calc.redo()
 
     assert result is False
+
+# Test History Journal
+
+def test_append_history_writes_journal(calculator):
+    calculator.set_operation(Addition())
+    calculator.perform_operation(2, 3)
+    calculator.append_history(calculator.history[-1])
+
+    assert len(calculator.journal) == 1
+    assert calculator.config.history_journal_file.exists()
+    assert not calculator.config.history_file.exists()
+
+def test_append_history_compacts_journal(calculator):
+    calculator.config.journal_compact_interval = 2
+    calculator.set_operation(Addition())
+    for a in range(2):
+        calculator.perform_operation(a, 1)
+        calculator.append_history(calculator.history[-1])
+
+    # reaching the interval writes a snapshot and empties the journal
+    assert calculator.config.history_file.exists()
+    assert not calculator.config.history_journal_file.exists()
+    assert len(calculator.journal) == 0
+
+def test_append_history_raises_operation_error(calculator):
+    calculator.set_operation(Addition())
+    calculator.perform_operation(2, 3)
+
+    with patch.object(calculator.journal, 'append', side_effect=OSError("disk full")):
+        with pytest.raises(OperationError, match="Failed to append history: disk full"):
+            calculator.append_history(calculator.history[-1])
+
+def test_append_history_batch(calculator):
+    calculator.config.journal_compact_interval = 5
+    calculator.set_operation(Addition())
+    for a in range(3):
+        calculator.perform_operation(a, 1)
+
+    with patch.object(calculator.journal, 'append') as mock_append:
+        calculator.append_history_batch(calculator.history[:])
+    mock_append.assert_not_called()
+    assert len(calculator.journal) == 3
+    assert not calculator.config.history_file.exists()
+
+    # a batch crossing the interval compacts the journal once
+    with patch.object(Calculator, 'save_history', wraps=calculator.save_history) as mock_save:
+        calculator.append_history_batch(calculator.history[:])
+    mock_save.assert_called_once()
+    assert len(calculator.journal) == 0
+
+def test_append_history_batch_raises_operation_error(calculator):
+    with patch.object(calculator.journal, 'extend', side_effect=OSError("disk full")):
+        with pytest.raises(OperationError, match="Failed to append history: disk full"):
+            calculator.append_history_batch([])
+
+def test_perform_batch_journals_once(calculator):
+    from app.history import JournalAutoSaveObserver
+    calculator.config.auto_save = True
+    calculator.add_observer(JournalAutoSaveObserver(calculator))
+
+    with patch.object(calculator.journal, 'extend', wraps=calculator.journal.extend) as mock_extend:
+        calculator.perform_batch('add', ['1', '2', '3'], ['1', '1', '1'])
+    mock_extend.assert_called_once()
+    assert len(calculator.journal) == 3
+
+def test_load_history_replays_journal(calculator):
+    calculator.set_operation(Addition())
+    calculator.perform_operation(1, 1)
+    calculator.save_history()
+    calculator.perform_operation(2, 2)
+    calculator.append_history(calculator.history[-1])
+
+    calculator.history = []
+    calculator.load_history()
+
+    assert [calc.result for calc in calculator.history] == [Decimal('2'), Decimal('4')]
+
+def test_load_history_journal_without_snapshot_replaces_history(calculator):
+    calculator.set_operation(Addition())
+    for a in range(2):
+        calculator.perform_operation(a, 1)
+        calculator.append_history(calculator.history[-1])
+    assert not calculator.config.history_file.exists()
+
+    calculator.load_history()
+
+    assert [calc.result for calc in calculator.history] == [Decimal('1'), Decimal('2')]
+
+def test_load_history_journal_after_empty_snapshot_replaces_history(calculator):
+    calculator.set_operation(Addition())
+    calculator.save_history()
+    calculator.perform_operation(1, 1)
+    calculator.append_history(calculator.history[-1])
+
+    calculator.load_history()
+
+    assert [calc.result for calc in calculator.history] == [Decimal('2')]
+
+def test_load_history_survives_torn_journal_record(calculator):
+    calculator.set_operation(Addition())
+    for a in range(3):
+        calculator.perform_operation(a, 1)
+        calculator.append_history(calculator.history[-1])
+    journal_file = calculator.config.history_journal_file
+    journal_file.write_bytes(journal_file.read_bytes()[:-12])
+
+    calculator.load_history()
+
+    assert [calc.result for calc in calculator.history] == [Decimal('1'), Decimal('2')]
+
+@pytest.mark.parametrize("history_format", ['csv', 'binary'])
+def test_load_history_skips_journal_contained_in_snapshot(calculator, history_format):
+    calculator.config.history_format = history_format
+    calculator.set_operation(Addition())
+    calculator.perform_operation(1, 1)
+    calculator.save_history()
+    for a in range(2, 4):
+        calculator.perform_operation(a, a)
+        calculator.append_history(calculator.history[-1])
+
+    # the process stops after the snapshot is replaced but before the journal is cleared
+    with patch.object(calculator.journal, 'clear'):
+        calculator.save_history()
+    assert len(calculator.journal) == 2
+
+    calculator.history = []
+    calculator.load_history()
+
+    assert [calc.result for calc in calculator.history] == [Decimal('2'), Decimal('4'), Decimal('6')]
+    assert not calculator.config.history_journal_file.exists()
+
+def test_load_history_skips_journal_after_undo_rewrite(calculator):
+    calculator.set_operation(Addition())
+    for a in range(1, 4):
+        calculator.perform_operation(a, a)
+        calculator.append_history(calculator.history[-1])
+
+    # undo rewrites the history file; the process stops before the journal is cleared
+    calculator.undo()
+    with patch.object(calculator.journal, 'clear'):
+        calculator.save_history()
+
+    calculator.history = []
+    calculator.load_history()
+
+    assert [calc.result for calc in calculator.history] == [Decimal('2'), Decimal('4')]
+
+def test_load_history_replay_respects_max_history_size(calculator):
+    calculator.config.max_history_size = 2
+    calculator.set_operation(Addition())
+    for a in range(3):
+        calculator.perform_operation(a, 0)
+        calculator.append_history(calculator.history[-1])
+
+    calculator.history = []
+    calculator.load_history()
+
+    assert [calc.result for calc in calculator.history] == [Decimal('1'), Decimal('2')]
+
+def test_undo_rewrites_history_in_journal_mode(calculator):
+    calculator.config.auto_save = True
+    calculator.config.history_journal = True
+    calculator.add_observer(JournalAutoSaveObserver(calculator))
+    calculator.set_operation(Addition())
+    calculator.perform_operation(1, 1)
+    calculator.perform_operation(2, 2)
+
+    calculator.undo()
+
+    # the undone calculation must not be replayed from the journal
+    calculator.history = []
+    calculator.load_history()
+    assert [calc.result for calc in calculator.history] == [Decimal('2')]
+
+# Test Delta Mementos
+
+def test_load_history_clears_undo_and_redo(calculator):
+    calculator.set_operation(Addition())
+    for a in range(3):
+        calculator.perform_operation(a, 1)
+    calculator.save_history()
+    calculator.perform_operation(1, 1)
+    calculator.undo()
+    calculator.perform_operation(2, 1)
+
+    calculator.load_history()
+
+    # the mementos described the replaced history and must not be applied to the loaded one
+    assert not calculator.undo()
+    assert not calculator.redo()
+    assert calculator.show_history() == [
+        'Addition(0, 1) = 1', 'Addition(1, 1) = 2', 'Addition(2, 1) = 3'
+    ]
+
+def test_assigning_history_clears_undo_and_redo(calculator):
+    calculator.set_operation(Addition())
+    calculator.perform_operation(1, 1)
+    calculator.perform_operation(2, 2)
+    calculator.undo()
+
+    calculator.history = [Calculation(operation='Addition', operand1=Decimal('5'), operand2=Decimal('5'))]
+
+    assert len(calculator.undo_stack) == 0
+    assert len(calculator.redo_stack) == 0
+    assert not calculator.undo()
+    assert calculator.show_history() == ['Addition(5, 5) = 10']
+
+def test_undo_stack_records_deltas(calculator):
+    calculator.set_operation(Addition())
+    calculator.perform_operation(1, 1)
+    calculator.perform_operation(2, 2)
+
+    memento = calculator.undo_stack[-1]
+    assert memento.is_delta
+    assert memento.history is None
+    assert memento.appended == [calculator.history[-1]]
+
+def test_undo_redo_restores_evicted_calculation(calculator):
+    calculator.config.max_history_size = 2
+    calculator.history = []  # rebuild the history buffer with the new size
+    calculator.set_operation(Addition())
+    for a in range(3):
+        calculator.perform_operation(a, 0)
+
+    assert [calc.result for calc in calculator.history] == [Decimal('1'), Decimal('2')]
+
+    assert calculator.undo()
+    assert [calc.result for calc in calculator.history] == [Decimal('0'), Decimal('1')]
+
+    assert calculator.redo()
+    assert [calc.result for calc in calculator.history] == [Decimal('1'), Decimal('2')]
+
+def test_multiple_undo_redo(calculator):
+    calculator.set_operation(Addition())
+    for a in range(3):
+        calculator.perform_operation(a, 0)
+
+    assert calculator.undo() and calculator.undo()
+    assert [calc.result for calc in calculator.history] == [Decimal('0')]
+    assert calculator.redo()
+    assert [calc.result for calc in calculator.history] == [Decimal('0'), Decimal('1')]
+    assert len(calculator.undo_stack) == 2
+    assert len(calculator.redo_stack) == 1
+
+# Test Bounded Undo/Redo Stacks
+
+def test_undo_depth_is_bounded(calculator):
+    calculator.undo_stack.max_depth = 2
+    calculator.set_operation(Addition())
+    for a in range(5):
+        calculator.perform_operation(a, 0)
+
+    assert len(calculator.undo_stack) == 2
+    assert calculator.undo() and calculator.undo()
+    assert not calculator.undo()
+    assert len(calculator.history) == 3
+
+def test_get_undo_memory_usage(calculator):
+    assert calculator.get_undo_memory_usage() == 0
+    calculator.set_operation(Addition())
+    calculator.perform_operation(1, 1)
+    calculator.perform_operation(2, 2)
+    usage = calculator.get_undo_memory_usage()
+    assert usage > 0
+
+    # moving a memento between stacks keeps the total unchanged
+    calculator.undo()
+    assert calculator.get_undo_memory_usage() == usage
+
+    calculator.clear_history()
+    assert calculator.get_undo_memory_usage() == 0
+
+# Test Batch Evaluation
+
+def test_perform_batch_returns_results_and_records_history(calculator):
+    results = calculator.perform_batch('add', [1, '2', 3.5], [1, '2', '0.5'])
+
+    assert results == [Decimal('2'), Decimal('4'), Decimal('4')]
+    assert [calc.result for calc in calculator.history] == results
+    assert all(calc.operation == 'Addition' for calc in calculator.history)
+
+def test_perform_batch_computes_each_pair_once(calculator):
+    from app.operation_cache import operation_cache
+    from app.operations import Power
+    operation_cache.clear()
+    with patch.object(Power, 'execute', autospec=True, side_effect=Power.execute) as mock_execute:
+        results = calculator.perform_batch('power', list(range(100)), [2] * 100)
+
+    assert mock_execute.call_count == 100
+    assert results[-1] == Decimal('9801')
+    assert calculator.history[-1].result == Decimal('9801')
+    # batch rows do not displace the cached results of interactive use
+    assert len(operation_cache) == 0
+
+def test_perform_batch_reports_per_row_errors(calculator):
+    results = calculator.perform_batch(
+        OperationFactory.create_operation('divide'),
+        [10, 'invalid', 5],
+        [2, 1, 0]
+    )
+
+    assert results[0] == Decimal('5')
+    assert isinstance(results[1], ValidationError)
+    assert isinstance(results[2], ValidationError)
+    assert len(calculator.history) == 1
+
+def test_perform_batch_wraps_unexpected_errors(calculator):
+    class BrokenOperation(Addition):
+        def execute(self, a, b):
+            raise RuntimeError("boom")
+
+    results = calculator.perform_batch(BrokenOperation(), [1], [2])
+
+    assert isinstance(results[0], OperationError)
+    assert "Operation failed: boom" in str(results[0])
+    assert calculator.history == []
+    assert calculator.undo_stack == []
+
+def test_perform_batch_is_a_single_undo_step(calculator):
+    calculator.perform_batch('multiply', [1, 2, 3], [2, 2, 2])
+
+    assert len(calculator.undo_stack) == 1
+    assert calculator.undo()
+    assert calculator.history == []
+    assert calculator.redo()
+    assert len(calculator.history) == 3
+
+@pytest.mark.parametrize("backend", ['objects', 'columnar'])
+def test_perform_batch_larger_than_history_undo_redo(calculator, backend):
+    calculator.config.history_backend = backend
+    calculator.config.max_history_size = 3
+    calculator.history = []
+    calculator.set_operation(Addition())
+    for value in range(3):
+        calculator.perform_operation(value, 1)
+    before = calculator.show_history()
+
+    calculator.perform_batch('add', [10, 11, 12, 13, 14], [0] * 5)
+    after = calculator.show_history()
+    assert after == ['Addition(12, 0) = 12', 'Addition(13, 0) = 13', 'Addition(14, 0) = 14']
+
+    assert calculator.undo()
+    assert calculator.show_history() == before
+    assert calculator.redo()
+    assert calculator.show_history() == after
+
+def test_perform_batch_notifies_observers_once(calculator):
+    observer = Mock(spec=LoggingObserver)
+    calculator.add_observer(observer)
+
+    calculator.perform_batch('add', [1, 2], [3, 4])
+
+    observer.update_batch.assert_called_once()
+    assert len(observer.update_batch.call_args.args[0]) == 2
+    observer.update.assert_not_called()
+
+def test_perform_batch_unknown_operation(calculator):
+    with pytest.raises(OperationError, match="Unknown operation: modulo"):
+        calculator.perform_batch('modulo', [1], [2])
+
+def test_perform_batch_length_mismatch(calculator):
+    with pytest.raises(ValidationError, match="same length"):
+        calculator.perform_batch('add', [1, 2], [3])
+
+def test_perform_batch_float_engine(calculator):
+    results = calculator.perform_batch('divide', [1, 'bad', 3], [4, 1, 0], allow_float=True)
+
+    assert results[0] == 0.25
+    assert isinstance(results[0], float)
+    assert isinstance(results[1], ValidationError)
+    assert str(results[2]) == "Division by zero is not allowed"
+
+    # successful rows are recorded with Decimal values, without recomputation
+    assert len(calculator.history) == 1
+    assert calculator.history[0].operation == 'Division'
+    assert calculator.history[0].result == Decimal('0.25')
+    assert len(calculator.undo_stack) == 1
+
+def test_evaluate_expression_records_each_step(calculator):
+    result = calculator.evaluate_expression('(3 + 4) ^ 2 / root(49, 2)')
+
+    assert result == Decimal('7')
+    assert calculator.show_history() == [
+        'Addition(3, 4) = 7',
+        'Power(7, 2) = 49',
+        'Root(49, 2) = 7',
+        'Division(49, 7) = 7',
+    ]
+    assert all(calc.verify() for calc in calculator.history)
+
+def test_evaluate_expression_is_a_single_undo_step(calculator):
+    observer = Mock(spec=LoggingObserver)
+    calculator.add_observer(observer)
+
+    calculator.evaluate_expression('1 + 2 * 3')
+
+    observer.update_batch.assert_called_once()
+    assert len(observer.update_batch.call_args.args[0]) == 2
+    assert len(calculator.undo_stack) == 1
+    assert calculator.undo()
+    assert calculator.history == []
+
+def test_evaluate_expression_larger_than_history_undo(calculator):
+    calculator.config.max_history_size = 3
+    calculator.history = []
+
+    calculator.evaluate_expression('1+2+3+4+5')
+    assert len(calculator.history) == 3
+
+    assert calculator.undo()
+    assert calculator.history == []
+    assert calculator.redo()
+    assert calculator.show_history()[-1] == 'Addition(10, 5) = 15'
+
+def test_evaluate_expression_long_sum(calculator):
+    result = calculator.evaluate_expression("+".join(["1"] * 2000))
+
+    assert result == Decimal('2000')
+    assert len(calculator.history) == calculator.config.max_history_size
+
+def test_evaluate_expression_with_variables(calculator):
+    assert calculator.evaluate_expression('x * x + y', {'x': '3', 'y': 1}) == Decimal('10')
+    assert calculator.evaluate_expression('x * x + y', {'x': 2, 'y': '0.5'}) == Decimal('4.5')
+
+def test_evaluate_expression_number_only(calculator):
+    assert calculator.evaluate_expression('-42') == Decimal('-42')
+    assert calculator.history == []
+    assert calculator.undo_stack == []
+
+def test_evaluate_expression_validates_inputs(calculator):
+    calculator.config.max_input_value = Decimal('100')
+    with pytest.raises(ValidationError, match="Value exceeds maximum allowed"):
+        calculator.evaluate_expression('1000 + 1')
+    with pytest.raises(ValidationError, match="Value exceeds maximum allowed"):
+        calculator.evaluate_expression('x + 1', {'x': 1000})
+    with pytest.raises(ValidationError, match="Invalid number format"):
+        calculator.evaluate_expression('x + 1', {'x': 'abc'})
+    assert calculator.history == []
+
+def test_evaluate_expression_errors_leave_history_unchanged(calculator):
+    with pytest.raises(ValidationError, match="Invalid expression"):
+        calculator.evaluate_expression('1 +')
+    with pytest.raises(ValidationError, match="Division by zero"):
+        calculator.evaluate_expression('1 + 1 / 0')
+    assert calculator.history == []
+
+def test_perform_batch_float_engine_matches_power_validation(calculator):
+    a_values, b_values = [-8, -8, 4, 2], ['0.5', 3, '0.5', -1]
+    exact = calculator.perform_batch('power', a_values, b_values)
+    fast = calculator.perform_batch('power', a_values, b_values, allow_float=True)
+
+    for exact_result, fast_result in zip(exact, fast):
+        if isinstance(exact_result, Exception):
+            assert type(fast_result) is type(exact_result)
+            assert str(fast_result) == str(exact_result)
+        else:
+            assert fast_result == float(exact_result)
+    assert str(fast[0]) == "Fractional powers of negative numbers are not supported"
+
+def test_perform_batch_float_falls_back_without_kernel(calculator):
+    with patch.object(Addition, 'supports_arrays', new_callable=PropertyMock, return_value=False):
+        results = calculator.perform_batch('add', [1], [2], allow_float=True)
+    assert results == [Decimal('3')]
+
+def test_perform_operation_honors_precision(calculator):
+    calculator.config.precision = 20
+    calculator.set_operation(OperationFactory.create_operation('root'))
+    assert str(calculator.perform_operation(2, 2)) == "1.4142135623730950488"
+
+def test_perform_operation_power_is_exact(calculator):
+    calculator.set_operation(OperationFactory.create_operation('power'))
+    assert calculator.perform_operation(3, 40) == Decimal(3 ** 40)
+
+def _write_history_with_bad_row(calculator):
+    calculator.set_operation(Addition())
+    calculator.perform_operation(1, 1)
+    calculator.perform_operation(2, 2)
+    calculator.save_history()
+    # corrupt the stored result of the first row
+    text = calculator.config.history_file.read_text()
+    calculator.config.history_file.write_text(text.replace('Addition,1,1,2,', 'Addition,1,1,3,'))
+
+def test_load_history_full_verify_recomputes(calculator):
+    _write_history_with_bad_row(calculator)
+    with patch.object(Calculator, 'verify_history') as mock_verify:
+        calculator.load_history()
+    assert calculator.history[0].result == Decimal('2')
+    mock_verify.assert_not_called()
+
+def test_load_history_trusted_skips_recomputation(calculator):
+    _write_history_with_bad_row(calculator)
+    calculator.config.history_verify = 'none'
+    with patch.object(Calculation, 'calculate') as mock_calculate:
+        calculator.load_history()
+    mock_calculate.assert_not_called()
+    assert [calc.result for calc in calculator.history] == [Decimal('3'), Decimal('4')]
+
+def test_load_history_sample_verify(calculator, caplog):
+    _write_history_with_bad_row(calculator)
+    calculator.config.history_verify = 'sample'
+    calculator.config.history_verify_sample_size = 5
+    with caplog.at_level(logging.WARNING):
+        calculator.load_history()
+    assert "Loaded calculation result 3 differs from computed result 2" in caplog.text
+
+def test_load_history_background_verify(calculator):
+    _write_history_with_bad_row(calculator)
+    calculator.config.history_verify = 'background'
+    with patch.object(Calculator, 'verify_history', return_value=1) as mock_verify:
+        calculator.load_history()
+        calculator._verify_thread.join(timeout=5)
+    mock_verify.assert_called_once_with(calculator.history.copy())
+    assert calculator._verify_thread.name == 'history-verifier'
+
+def test_verify_history_counts_mismatches(calculator):
+    _write_history_with_bad_row(calculator)
+    calculator.config.history_verify = 'none'
+    calculator.load_history()
+    assert calculator.verify_history() == 1
+
+def test_load_history_keeps_exact_decimal_digits(calculator):
+    calculator.set_operation(Addition())
+    calculator.perform_operation('0.12345678901234567890', '1')
+    calculator.save_history()
+    calculator.history = []
+    calculator.load_history()
+    assert calculator.history[0].operand1 == Decimal('0.12345678901234567890')
+
+def test_columnar_history_backend(calculator):
+    calculator.config.history_backend = 'columnar'
+    calculator.history = []
+    calculator.set_operation(OperationFactory.create_operation('power'))
+    calculator.perform_operation(2, 3)
+    calculator.perform_operation('1.5', 2)
+
+    assert type(calculator.history).__name__ == 'ColumnarHistoryBuffer'
+    assert calculator.show_history() == ["Power(2, 3) = 8", "Power(1.5, 2) = 2.25"]
+
+    df = calculator.get_history_dataframe()
+    assert list(df['result']) == ['8', '2.25']
+    assert str(df['timestamp'].dtype).startswith('datetime64')
+
+    assert calculator.undo()
+    assert calculator.show_history() == ["Power(2, 3) = 8"]
+    assert calculator.redo()
+
+    calculator.save_history()
+    calculator.history = []
+    calculator.load_history()
+    assert [calc.result for calc in calculator.history] == [Decimal('8'), Decimal('2.25')]
+
+def test_binary_history_round_trip(calculator):
+    calculator.config.history_format = 'binary'
+    calculator.set_operation(OperationFactory.create_operation('root'))
+    calculator.perform_operation(27, 3)
+    calculator.perform_operation(2, 2)
+    calculator.save_history()
+    assert calculator.config.history_file.read_bytes().startswith(b'CALCHIST')
+
+    expected = calculator.history.copy()
+    calculator.history = []
+    calculator.load_history()
+    assert calculator.history == expected
+
+def test_binary_history_loads_newest_records(calculator):
+    calculator.config.history_format = 'binary'
+    calculator.set_operation(Addition())
+    for value in range(5):
+        calculator.perform_operation(value, 1)
+    calculator.save_history()
+
+    calculator.config.max_history_size = 2
+    calculator.history = []
+    with patch('app.calculator.BinaryHistoryFile.read', wraps=BinaryHistoryFile(calculator.config.history_file).read) as mock_read:
+        calculator.load_history()
+    mock_read.assert_called_once_with(-2, verify=True)
+    assert [calc.operand1 for calc in calculator.history] == [Decimal(3), Decimal(4)]
+
+@pytest.mark.parametrize("file_format", ['parquet', 'feather'])
+def test_arrow_history_round_trip(calculator, file_format):
+    pytest.importorskip('pyarrow')
+    calculator.config.history_format = file_format
+    calculator.set_operation(OperationFactory.create_operation('divide'))
+    calculator.perform_operation(1, 3)
+    calculator.perform_operation('0.12345678901234567890', 1)
+    calculator.save_history()
+
+    df = pd.read_parquet(calculator.config.history_file) if file_format == 'parquet' \
+        else pd.read_feather(calculator.config.history_file)
+    assert isinstance(df['operation'].dtype, pd.CategoricalDtype)
+    assert str(df['timestamp'].dtype).startswith('datetime64')
+
+    expected = calculator.history.copy()
+    calculator.history = []
+    calculator.load_history()
+    assert calculator.history == expected
+    assert [calc.timestamp for calc in calculator.history] == [calc.timestamp for calc in expected]
+    assert type(calculator.history[0].timestamp) is datetime.datetime
+
+@pytest.mark.parametrize("file_format", ['csv', 'binary', 'parquet'])
+def test_load_history_reads_tail_and_pages_older_records(calculator, file_format):
+    if file_format == 'parquet':
+        pytest.importorskip('pyarrow')
+    calculator.config.history_format = file_format
+    calculator.config.max_history_size = 10
+    calculator.history = []
+    calculator.set_operation(Addition())
+    for value in range(10):
+        calculator.perform_operation(value, 1)
+    calculator.save_history()
+    assert list(calculator.iter_history_pages()) == []
+
+    calculator.config.max_history_size = 3
+    calculator.history = []
+    calculator.load_history()
+    assert [calc.operand1 for calc in calculator.history] == [Decimal(7), Decimal(8), Decimal(9)]
+
+    pages = calculator.iter_history_pages(page_size=4)
+    assert [calc.operand1 for calc in next(pages)] == [Decimal(value) for value in range(3, 7)]
+    assert [[calc.operand1 for calc in page] for page in pages] == [
+        [Decimal(value) for value in range(0, 3)]
+    ]
+
+def save_numbered_history(calculator, file_format, count):
+    if file_format == 'parquet':
+        pytest.importorskip('pyarrow')
+    calculator.config.history_format = file_format
+    calculator.set_operation(Addition())
+    for value in range(count):
+        calculator.perform_operation(value, 1)
+    calculator.save_history()
+
+def operands(calculations):
+    return [int(calc.operand1) for calc in calculations]
+
+@pytest.mark.parametrize("file_format", ['csv', 'binary', 'parquet'])
+def test_save_keeps_records_older_than_loaded_history(calculator, file_format):
+    save_numbered_history(calculator, file_format, 10)
+    calculator.config.max_history_size = 4
+    calculator.load_history()
+    calculator.config.auto_save = True
+    calculator.add_observer(AutoSaveObserver(calculator))
+
+    calculator.perform_operation(10, 1)
+    assert operands(calculator.history) == [7, 8, 9, 10]
+    assert [operands(page) for page in calculator.iter_history_pages(page_size=4)] == [
+        [3, 4, 5, 6], [0, 1, 2]
+    ]
+
+    calculator.config.max_history_size = 100
+    calculator.load_history()
+    assert operands(calculator.history) == list(range(11))
+
+@pytest.mark.parametrize("file_format", ['csv', 'binary', 'parquet'])
+def test_undo_takes_back_saved_archived_record(calculator, file_format):
+    save_numbered_history(calculator, file_format, 10)
+    calculator.config.max_history_size = 4
+    calculator.load_history()
+    calculator.perform_operation(10, 1)
+    calculator.perform_operation(11, 1)
+    calculator.save_history()
+
+    calculator.undo()
+    assert [operands(page) for page in calculator.iter_history_pages()] == [list(range(7))]
+    calculator.undo()
+    calculator.save_history()
+    assert operands(calculator.history) == [6, 7, 8, 9]
+    assert [operands(page) for page in calculator.iter_history_pages()] == [list(range(6))]
+
+    calculator.config.max_history_size = 100
+    calculator.load_history()
+    assert operands(calculator.history) == list(range(10))
+
+def test_archive_pages_include_unsaved_evictions(calculator):
+    save_numbered_history(calculator, 'csv', 6)
+    calculator.config.max_history_size = 2
+    calculator.load_history()
+    calculator.perform_operation(6, 1)
+    assert [operands(page) for page in calculator.iter_history_pages(page_size=3)] == [
+        [4], [1, 2, 3], [0]
+    ]
+
+def test_clear_history_discards_archived_records(calculator):
+    save_numbered_history(calculator, 'csv', 6)
+    calculator.config.max_history_size = 2
+    calculator.load_history()
+    calculator.clear_history()
+    calculator.save_history()
+    assert list(calculator.iter_history_pages()) == []
+    calculator.load_history()
+    assert len(calculator.history) == 0
+
+def test_journal_replay_archives_evicted_records(calculator):
+    save_numbered_history(calculator, 'csv', 4)
+    calculator.journal.extend([
+        Calculation.restore('Addition', Decimal(value), Decimal(1), Decimal(value + 1))
+        for value in (4, 5)
+    ])
+    calculator.config.max_history_size = 3
+    calculator.load_history()
+    assert operands(calculator.history) == [3, 4, 5]
+    assert [operands(page) for page in calculator.iter_history_pages()] == [[1, 2], [0]]
+
+def test_iter_history_pages_without_history_file(calculator):
+    assert list(calculator.iter_history_pages()) == []
+
+def test_iter_history_pages_raises_operation_error(calculator):
+    calculator.set_operation(Addition())
+    for value in range(3):
+        calculator.perform_operation(value, 1)
+    calculator.save_history()
+    calculator.config.max_history_size = 1
+    calculator.load_history()
+    calculator.config.history_file.write_bytes(b"\xff\xfe" * 100)
+    with pytest.raises(OperationError, match="Failed to read history page"):
+        list(calculator.iter_history_pages())
+
+def test_undo_redo_clear_flush_observers(calculator):
+    observer = Mock()
+    calculator.add_observer(observer)
+    calculator.set_operation(Addition())
+    calculator.perform_operation(1, 1)
+    observer.flush.assert_not_called()
+
+    calculator.undo()
+    calculator.redo()
+    calculator.clear_history()
+    assert observer.flush.call_count == 3
+
+def test_coalescing_auto_save_writes_once_per_burst(calculator):
+    from app.history import CoalescingAutoSaveObserver
+    calculator.config.auto_save = True
+    observer = CoalescingAutoSaveObserver(calculator, interval=60, max_pending=50)
+    calculator.add_observer(observer)
+    calculator.set_operation(Addition())
+
+    with patch.object(Calculator, 'save_history', wraps=calculator.save_history) as mock_save:
+        for value in range(20):
+            calculator.perform_operation(value, 1)
+        mock_save.assert_not_called()
+        calculator.undo()
+        mock_save.assert_called_once()
+    observer.close()
+
+    calculator.history = []
+    calculator.load_history()
+    assert len(calculator.history) == 19
+
+def test_coalescing_auto_save_saves_undo_of_saved_calculation(calculator):
+    from app.history import CoalescingAutoSaveObserver
+    calculator.config.auto_save = True
+    observer = CoalescingAutoSaveObserver(calculator, interval=60, max_pending=2)
+    calculator.add_observer(observer)
+    calculator.set_operation(Addition())
+    calculator.perform_operation(1, 1)
+    calculator.perform_operation(2, 2)
+    assert observer.pending == 0
+
+    calculator.undo()
+    observer.close()
+
+    calculator.history = []
+    calculator.load_history()
+    assert [calc.result for calc in calculator.history] == [Decimal('2')]
+
+def test_save_history_keeps_previous_file_on_failure(calculator):
+    calculator.set_operation(Addition())
+    calculator.perform_operation(1, 1)
+    calculator.save_history()
+    saved = calculator.config.history_file.read_bytes()
+
+    calculator.perform_operation(2, 2)
+    with patch('pandas.DataFrame.to_csv', side_effect=OSError("disk full")):
+        with pytest.raises(OperationError, match="disk full"):
+            calculator.save_history()
+    assert calculator.config.history_file.read_bytes() == saved
+    assert list(calculator.config.history_dir.iterdir()) == [calculator.config.history_file]
+
+def test_write_history_skips_superseded_snapshot(calculator):
+    calculator.set_operation(Addition())
+    calculator.perform_operation(1, 1)
+    older = calculator.snapshot_history()
+    calculator.perform_operation(2, 2)
+    calculator.save_history()
+
+    calculator.write_history(older)
+    calculator.history = []
+    calculator.load_history()
+    assert len(calculator.history) == 2
+
+def test_background_auto_save(calculator):
+    from app.history import BackgroundAutoSaveObserver
+    calculator.config.auto_save = True
+    observer = BackgroundAutoSaveObserver(calculator)
+    calculator.add_observer(observer)
+    calculator.set_operation(Addition())
+
+    with patch.object(Calculator, 'save_history') as mock_save:
+        for value in range(10):
+            calculator.perform_operation(value, 1)
+        calculator.flush_observers()
+        mock_save.assert_not_called()
+    observer.close()
+
+    calculator.history = []
+    calculator.load_history()
+    assert len(calculator.history) == 10
+
+def test_background_auto_save_keeps_archived_records(calculator):
+    from app.history import BackgroundAutoSaveObserver
+    save_numbered_history(calculator, 'csv', 5)
+    calculator.config.max_history_size = 2
+    calculator.load_history()
+    calculator.config.auto_save = True
+    observer = BackgroundAutoSaveObserver(calculator)
+    calculator.add_observer(observer)
+
+    for value in range(5, 10):
+        calculator.perform_operation(value, 1)
+    calculator.undo()
+    calculator.perform_operation(10, 1)
+    observer.close()
+
+    calculator.config.max_history_size = 100
+    calculator.load_history()
+    assert operands(calculator.history) == [0, 1, 2, 3, 4, 5, 6, 7, 8, 10]
+
+@pytest.mark.parametrize("policy, synced", [('always', 1), ('never', 0)])
+def test_save_history_fsync_policy(calculator, policy, synced):
+    calculator._history_file_writer.fsync = policy
+    with patch('app.atomic_write.os.fsync') as mock_fsync:
+        calculator.save_history()
+    # the file before the rename and the directory after it
+    assert mock_fsync.call_count == 2 * synced
+
+def test_perform_operation_uses_operation_cache(calculator):
+    from app.operation_cache import operation_cache
+    from app.operations import Power
+    operation_cache.clear()
+    calculator.set_operation(Power())
+    with patch.object(Power, 'execute', wraps=calculator.operation_strategy.execute) as mock_execute:
+        for _ in range(3):
+            assert calculator.perform_operation('2', '10') == Decimal('1024')
+    # computed once, then reused by the repeated calls; one lookup per call
+    mock_execute.assert_called_once()
+    assert operation_cache.misses == 1
+    assert operation_cache.hits == 2
+    assert [calc.result for calc in calculator.history] == [Decimal('1024')] * 3
+
+def test_calculator_sizes_operation_cache(tmp_path):
+    from app.operation_cache import operation_cache
+    Calculator(CalculatorConfig(base_dir=tmp_path, operation_cache_size=8, operation_cache_eviction='fifo'))
+    assert (operation_cache.max_size, operation_cache.eviction) == (8, 'fifo')
+    operation_cache.configure(1024, 'lru')
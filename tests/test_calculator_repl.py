@@ -1,8 +1,15 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
 from unittest.mock import patch, MagicMock
 from app.calculator_repl import calculator_repl  # or wherever your REPL function is
 from decimal import Decimal
 from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.operations import OperationFactory
 from app.exceptions import ValidationError, OperationError
 
 
@@ -183,6 +190,34 @@ def test_exception_handling_in_repl(monkeypatch, capsys, side_effect, expected_o
         out = capsys.readouterr().out
         assert expected_output in out
 
+def test_symbol_command_performs_operation(monkeypatch):
+    calc_mock = MagicMock()
+    calc_mock.perform_operation.return_value = Decimal('8')
+
+    with patch('app.calculator_repl.Calculator', return_value=calc_mock):
+        inputs = iter(['^', '2', '3', 'exit'])
+        monkeypatch.setattr('builtins.input', lambda _: next(inputs))
+
+        calculator_repl()
+
+    calc_mock.set_operation.assert_called_once()
+    assert str(calc_mock.set_operation.call_args.args[0]) == 'Power'
+
+def test_eval_command(monkeypatch, capsys):
+    calc_mock = MagicMock()
+    calc_mock.evaluate_expression.side_effect = [Decimal('49.0'), ValidationError("Invalid expression: unexpected end of expression")]
+
+    with patch('app.calculator_repl.Calculator', return_value=calc_mock):
+        inputs = iter(['eval', '(3 + 4) ^ 2', 'eval', '1 +', 'exit'])
+        monkeypatch.setattr('builtins.input', lambda _: next(inputs))
+
+        calculator_repl()
+
+    calc_mock.evaluate_expression.assert_any_call('(3 + 4) ^ 2')
+    out = capsys.readouterr().out
+    assert "Result: 49" in out
+    assert "Error: Invalid expression: unexpected end of expression" in out
+
 # covers lines 134-135 of calculator_repl.py
 def test_unknown_command_prints_message(monkeypatch, capsys):
     inputs = iter(['foobar', 'exit'])  # 'foobar' is unknown command, then exit to stop loop
@@ -235,6 +270,43 @@ def test_repl_handles_eof_error(monkeypatch, capsys):
     assert "Input terminated. Exiting..." in captured
 
 
+def test_repl_uses_coalescing_auto_save(monkeypatch):
+    monkeypatch.setenv('CALCULATOR_AUTO_SAVE_COALESCE', 'true')
+    monkeypatch.setattr('builtins.input', lambda _: 'exit')
+    with patch('app.calculator_repl.CoalescingAutoSaveObserver') as observer_cls:
+        calculator_repl()
+    observer_cls.assert_called_once()
+
+
+def test_repl_uses_background_auto_save(monkeypatch):
+    monkeypatch.setenv('CALCULATOR_AUTO_SAVE_BACKGROUND', 'true')
+    monkeypatch.setattr('builtins.input', lambda _: 'exit')
+    with patch('app.calculator_repl.BackgroundAutoSaveObserver') as observer_cls:
+        calculator_repl()
+    observer_cls.assert_called_once()
+
+
+def test_repl_logs_on_observer_thread(monkeypatch):
+    monkeypatch.setenv('CALCULATOR_OBSERVER_DISPATCH', 'thread')
+    monkeypatch.setattr('builtins.input', lambda _: 'exit')
+    with patch('app.calculator_repl.QueuedObserver') as observer_cls:
+        calculator_repl()
+    observer_cls.assert_called_once()
+    assert type(observer_cls.call_args.args[0]).__name__ == 'LoggingObserver'
+
+
+def test_repl_eof_flushes_observers(monkeypatch, capsys):
+    def fake_input(prompt):
+        raise EOFError
+
+    monkeypatch.setattr('builtins.input', fake_input)
+    with patch('app.calculator.Calculator.flush_observers', side_effect=Exception("disk full")) as flush_mock:
+        calculator_repl()
+
+    flush_mock.assert_called_once()
+    assert "Warning: Could not save history: disk full" in capsys.readouterr().out
+
+
 # covers lines 144-147 of calculator_repl.py
 
 
@@ -255,4 +327,55 @@ def test_fatal_error_during_initialization(capsys):
         # Check exception re-raised with correct message
         assert "Initialization failed" in str(exc_info.value)
 
-        
\ No newline at end of file
+        
+
+# REPL startup must not pay for importing pandas or numpy
+def test_repl_import_skips_pandas():
+    code = (
+        "import sys\n"
+        "import app.calculator_repl\n"
+        "print('pandas' in sys.modules, 'numpy' in sys.modules)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout.split("\n")
+
+    assert output[0] == "False False"
+
+def test_calculator_startup_with_history_file(tmp_path, monkeypatch):
+    # test_config sets CALCULATOR_* variables that would move the history file out of tmp_path
+    for name in list(os.environ):
+        if name.startswith('CALCULATOR_'):
+            monkeypatch.delenv(name)
+
+    # auto-save is on by default, so a history file normally exists at startup
+    calc = Calculator(CalculatorConfig(base_dir=tmp_path))
+    calc.set_operation(OperationFactory.create_operation('add'))
+    for value in range(100):
+        calc.perform_operation(value, 1)
+    calc.save_history()
+    assert calc.config.history_file.is_relative_to(tmp_path)
+
+    code = (
+        "import sys\n"
+        "from pathlib import Path\n"
+        "from app.calculator import Calculator\n"
+        "from app.calculator_config import CalculatorConfig\n"
+        f"calc = Calculator(CalculatorConfig(base_dir=Path({str(tmp_path)!r})))\n"
+        "print('pandas' in sys.modules, 'numpy' in sys.modules)\n"
+        "print(len(calc.history))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout.split("\n")
+
+    assert output[1] == "100"
+    assert output[0] == "False False"
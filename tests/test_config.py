@@ -147,3 +147,241 @@ def test_history_file_property():
     config = CalculatorConfig(base_dir=Path('/new_base_dir'))
     assert config.history_file == Path('/new_base_dir/history/calculator_history.csv').resolve()
 
+
+def test_history_journal_defaults():
+    clear_env_vars('CALCULATOR_HISTORY_JOURNAL', 'CALCULATOR_JOURNAL_COMPACT_INTERVAL')
+    config = CalculatorConfig()
+    assert config.history_journal is False
+    assert config.journal_compact_interval == 100
+
+def test_history_journal_env_vars():
+    os.environ['CALCULATOR_HISTORY_JOURNAL'] = '1'
+    os.environ['CALCULATOR_JOURNAL_COMPACT_INTERVAL'] = '25'
+    config = CalculatorConfig()
+    assert config.history_journal is True
+    assert config.journal_compact_interval == 25
+    clear_env_vars('CALCULATOR_HISTORY_JOURNAL', 'CALCULATOR_JOURNAL_COMPACT_INTERVAL')
+
+def test_history_journal_file_property():
+    clear_env_vars('CALCULATOR_HISTORY_FILE', 'CALCULATOR_HISTORY_JOURNAL_FILE')
+    config = CalculatorConfig(base_dir=Path('/new_base_dir'))
+    assert config.history_journal_file == Path(
+        '/new_base_dir/history/calculator_history.csv.journal'
+    ).resolve()
+
+def test_invalid_journal_compact_interval():
+    with pytest.raises(ConfigurationError, match="journal_compact_interval must be positive"):
+        config = CalculatorConfig(journal_compact_interval=-1)
+        config.validate()
+
+def test_undo_limit_defaults():
+    clear_env_vars('CALCULATOR_MAX_UNDO_DEPTH', 'CALCULATOR_UNDO_MEMORY_BUDGET')
+    config = CalculatorConfig()
+    assert config.max_undo_depth == 1000
+    assert config.undo_memory_budget == 0
+
+def test_undo_limit_env_vars():
+    os.environ['CALCULATOR_MAX_UNDO_DEPTH'] = '50'
+    os.environ['CALCULATOR_UNDO_MEMORY_BUDGET'] = '65536'
+    config = CalculatorConfig()
+    assert config.max_undo_depth == 50
+    assert config.undo_memory_budget == 65536
+    clear_env_vars('CALCULATOR_MAX_UNDO_DEPTH', 'CALCULATOR_UNDO_MEMORY_BUDGET')
+
+def test_invalid_max_undo_depth():
+    with pytest.raises(ConfigurationError, match="max_undo_depth must be positive"):
+        config = CalculatorConfig(max_undo_depth=-1)
+        config.validate()
+
+def test_invalid_undo_memory_budget():
+    with pytest.raises(ConfigurationError, match="undo_memory_budget must not be negative"):
+        config = CalculatorConfig(undo_memory_budget=-1)
+        config.validate()
+
+def test_history_verify_defaults():
+    clear_env_vars('CALCULATOR_HISTORY_VERIFY', 'CALCULATOR_HISTORY_VERIFY_SAMPLE_SIZE')
+    config = CalculatorConfig()
+    assert config.history_verify == 'full'
+    assert config.history_verify_sample_size == 100
+
+def test_history_verify_env_vars():
+    os.environ['CALCULATOR_HISTORY_VERIFY'] = 'Background'
+    os.environ['CALCULATOR_HISTORY_VERIFY_SAMPLE_SIZE'] = '25'
+    config = CalculatorConfig()
+    assert config.history_verify == 'background'
+    assert config.history_verify_sample_size == 25
+    clear_env_vars('CALCULATOR_HISTORY_VERIFY', 'CALCULATOR_HISTORY_VERIFY_SAMPLE_SIZE')
+
+def test_invalid_history_verify():
+    with pytest.raises(ConfigurationError, match="history_verify must be one of"):
+        config = CalculatorConfig(history_verify='sometimes')
+        config.validate()
+
+def test_invalid_history_verify_sample_size():
+    with pytest.raises(ConfigurationError, match="history_verify_sample_size must be positive"):
+        config = CalculatorConfig(history_verify_sample_size=-1)
+        config.validate()
+
+def test_history_backend():
+    clear_env_vars('CALCULATOR_HISTORY_BACKEND')
+    assert CalculatorConfig().history_backend == 'objects'
+    os.environ['CALCULATOR_HISTORY_BACKEND'] = 'Columnar'
+    assert CalculatorConfig().history_backend == 'columnar'
+    clear_env_vars('CALCULATOR_HISTORY_BACKEND')
+
+def test_invalid_history_backend():
+    with pytest.raises(ConfigurationError, match="history_backend must be one of"):
+        config = CalculatorConfig(history_backend='rows')
+        config.validate()
+
+def test_history_format():
+    clear_env_vars('CALCULATOR_HISTORY_FORMAT')
+    config = CalculatorConfig()
+    assert config.history_format == 'auto'
+    assert config.history_file_format == 'csv'
+    os.environ['CALCULATOR_HISTORY_FILE'] = './test_history/test_history.bin'
+    assert CalculatorConfig().history_file_format == 'binary'
+    assert CalculatorConfig(history_format='csv').history_file_format == 'csv'
+    os.environ['CALCULATOR_HISTORY_FILE'] = './test_history/test_history.Parquet'
+    assert CalculatorConfig().history_file_format == 'parquet'
+    os.environ['CALCULATOR_HISTORY_FILE'] = './test_history/test_history.arrow'
+    assert CalculatorConfig().history_file_format == 'feather'
+    os.environ['CALCULATOR_HISTORY_FILE'] = './test_history/test_history.csv'
+    assert CalculatorConfig(history_format='binary').history_file_format == 'binary'
+
+def test_invalid_history_format():
+    with pytest.raises(ConfigurationError, match="history_format must be one of"):
+        config = CalculatorConfig(history_format='xml')
+        config.validate()
+
+def test_auto_save_coalesce_defaults():
+    clear_env_vars('CALCULATOR_AUTO_SAVE_COALESCE', 'CALCULATOR_AUTO_SAVE_INTERVAL', 'CALCULATOR_AUTO_SAVE_BATCH_SIZE')
+    config = CalculatorConfig()
+    assert config.auto_save_coalesce is False
+    assert config.auto_save_interval == 5
+    assert config.auto_save_batch_size == 100
+
+def test_auto_save_coalesce_env_vars():
+    os.environ['CALCULATOR_AUTO_SAVE_COALESCE'] = 'true'
+    os.environ['CALCULATOR_AUTO_SAVE_INTERVAL'] = '2.5'
+    os.environ['CALCULATOR_AUTO_SAVE_BATCH_SIZE'] = '20'
+    config = CalculatorConfig()
+    assert config.auto_save_coalesce is True
+    assert config.auto_save_interval == 2.5
+    assert config.auto_save_batch_size == 20
+    clear_env_vars('CALCULATOR_AUTO_SAVE_COALESCE', 'CALCULATOR_AUTO_SAVE_INTERVAL', 'CALCULATOR_AUTO_SAVE_BATCH_SIZE')
+
+def test_invalid_auto_save_interval():
+    with pytest.raises(ConfigurationError, match="auto_save_interval must not be negative"):
+        config = CalculatorConfig(auto_save_interval=-1)
+        config.validate()
+
+def test_invalid_auto_save_batch_size():
+    with pytest.raises(ConfigurationError, match="auto_save_batch_size must be positive"):
+        config = CalculatorConfig(auto_save_batch_size=-1)
+        config.validate()
+
+def test_auto_save_background():
+    clear_env_vars('CALCULATOR_AUTO_SAVE_BACKGROUND', 'CALCULATOR_HISTORY_WRITER_QUEUE_SIZE')
+    config = CalculatorConfig()
+    assert config.auto_save_background is False
+    assert config.history_writer_queue_size == 8
+    os.environ['CALCULATOR_AUTO_SAVE_BACKGROUND'] = '1'
+    os.environ['CALCULATOR_HISTORY_WRITER_QUEUE_SIZE'] = '2'
+    config = CalculatorConfig()
+    assert config.auto_save_background is True
+    assert config.history_writer_queue_size == 2
+    clear_env_vars('CALCULATOR_AUTO_SAVE_BACKGROUND', 'CALCULATOR_HISTORY_WRITER_QUEUE_SIZE')
+
+def test_invalid_history_writer_queue_size():
+    with pytest.raises(ConfigurationError, match="history_writer_queue_size must be positive"):
+        config = CalculatorConfig(history_writer_queue_size=-1)
+        config.validate()
+
+def test_history_fsync():
+    clear_env_vars('CALCULATOR_HISTORY_FSYNC', 'CALCULATOR_HISTORY_FSYNC_INTERVAL')
+    config = CalculatorConfig()
+    assert config.history_fsync == 'always'
+    assert config.history_fsync_interval == 30
+    os.environ['CALCULATOR_HISTORY_FSYNC'] = 'Interval'
+    os.environ['CALCULATOR_HISTORY_FSYNC_INTERVAL'] = '0.5'
+    config = CalculatorConfig()
+    assert config.history_fsync == 'interval'
+    assert config.history_fsync_interval == 0.5
+    clear_env_vars('CALCULATOR_HISTORY_FSYNC', 'CALCULATOR_HISTORY_FSYNC_INTERVAL')
+
+def test_invalid_history_fsync():
+    with pytest.raises(ConfigurationError, match="history_fsync must be one of"):
+        config = CalculatorConfig(history_fsync='sometimes')
+        config.validate()
+
+def test_invalid_history_fsync_interval():
+    with pytest.raises(ConfigurationError, match="history_fsync_interval must not be negative"):
+        config = CalculatorConfig(history_fsync_interval=-1)
+        config.validate()
+
+def test_observer_dispatch():
+    clear_env_vars('CALCULATOR_OBSERVER_DISPATCH', 'CALCULATOR_OBSERVER_QUEUE_SIZE', 'CALCULATOR_OBSERVER_QUEUE_POLICY')
+    config = CalculatorConfig()
+    assert config.observer_dispatch == 'inline'
+    assert config.observer_queue_size == 1000
+    assert config.observer_queue_policy == 'block'
+    os.environ['CALCULATOR_OBSERVER_DISPATCH'] = 'Thread'
+    os.environ['CALCULATOR_OBSERVER_QUEUE_SIZE'] = '10'
+    os.environ['CALCULATOR_OBSERVER_QUEUE_POLICY'] = 'DROP'
+    config = CalculatorConfig()
+    assert config.observer_dispatch == 'thread'
+    assert config.observer_queue_size == 10
+    assert config.observer_queue_policy == 'drop'
+    clear_env_vars('CALCULATOR_OBSERVER_DISPATCH', 'CALCULATOR_OBSERVER_QUEUE_SIZE', 'CALCULATOR_OBSERVER_QUEUE_POLICY')
+
+def test_invalid_observer_dispatch():
+    with pytest.raises(ConfigurationError, match="observer_dispatch must be one of"):
+        config = CalculatorConfig(observer_dispatch='asyncio')
+        config.validate()
+
+def test_invalid_observer_queue_size():
+    with pytest.raises(ConfigurationError, match="observer_queue_size must be positive"):
+        config = CalculatorConfig(observer_queue_size=-1)
+        config.validate()
+
+def test_invalid_observer_queue_policy():
+    with pytest.raises(ConfigurationError, match="observer_queue_policy must be one of"):
+        config = CalculatorConfig(observer_queue_policy='latest')
+        config.validate()
+
+def test_log_queue_and_level():
+    clear_env_vars('CALCULATOR_LOG_QUEUE', 'CALCULATOR_LOG_LEVEL')
+    config = CalculatorConfig()
+    assert config.log_queue is False
+    assert config.log_level == 'INFO'
+    os.environ['CALCULATOR_LOG_QUEUE'] = 'true'
+    os.environ['CALCULATOR_LOG_LEVEL'] = 'warning'
+    config = CalculatorConfig()
+    assert config.log_queue is True
+    assert config.log_level == 'WARNING'
+    clear_env_vars('CALCULATOR_LOG_QUEUE', 'CALCULATOR_LOG_LEVEL')
+
+def test_invalid_log_level():
+    with pytest.raises(ConfigurationError, match="log_level must be one of"):
+        config = CalculatorConfig(log_level='verbose')
+        config.validate()
+
+def test_operation_cache_settings():
+    clear_env_vars('CALCULATOR_OPERATION_CACHE_SIZE', 'CALCULATOR_OPERATION_CACHE_EVICTION')
+    config = CalculatorConfig()
+    assert config.operation_cache_size == 1024
+    assert config.operation_cache_eviction == 'lru'
+    assert CalculatorConfig(operation_cache_size=0).operation_cache_size == 0
+    os.environ['CALCULATOR_OPERATION_CACHE_SIZE'] = '16'
+    os.environ['CALCULATOR_OPERATION_CACHE_EVICTION'] = 'FIFO'
+    config = CalculatorConfig()
+    assert config.operation_cache_size == 16
+    assert config.operation_cache_eviction == 'fifo'
+    clear_env_vars('CALCULATOR_OPERATION_CACHE_SIZE', 'CALCULATOR_OPERATION_CACHE_EVICTION')
+
+def test_invalid_operation_cache_settings():
+    with pytest.raises(ConfigurationError, match="operation_cache_size must not be negative"):
+        CalculatorConfig(operation_cache_size=-1).validate()
+    with pytest.raises(ConfigurationError, match="operation_cache_eviction must be one of"):
+        CalculatorConfig(operation_cache_eviction='random').validate()
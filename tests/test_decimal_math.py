@@ -0,0 +1,93 @@
+import pytest
+from decimal import Decimal
+from app import decimal_math
+from app.decimal_math import power, root
+from app.exceptions import OperationError
+
+
+@pytest.mark.parametrize("base, exponent, expected", [
+    ("2", "3", "8"),
+    ("2.5", "2", "6.25"),
+    ("5", "0", "1"),
+    ("0", "5", "0"),
+    ("0", "0", "1"),
+    ("-2", "3", "-8"),
+    ("10", "2", "100"),
+    ("0.001", "5", "1E-15"),
+    ("2", "100", "1267650600228229401496703205376"),
+    ("1.5", "20", "3325.25673007965087890625"),
+    ("2", "0.5", "1.4142135624"),
+])
+def test_power(base, exponent, expected):
+    assert str(power(Decimal(base), Decimal(exponent))) == expected
+
+
+def test_power_of_huge_value_is_exact():
+    result = power(Decimal("1e500"), Decimal("2"))
+    assert result == Decimal("1e1000")
+    assert "E" not in str(result)
+
+
+def test_power_large_integer_exponent_uses_logarithm_bound():
+    result = power(Decimal("1.0001"), Decimal("100000"))
+    assert str(result).startswith("22015.456")
+
+
+def test_power_small_integer_exponent_skips_digit_estimate(monkeypatch):
+    def estimate(base, exponent):
+        raise AssertionError("small integer powers should not estimate their digits")
+
+    monkeypatch.setattr(decimal_math, "_integer_digits", estimate)
+    assert power(Decimal("1.5"), Decimal("3")) == Decimal("3.375")
+    with decimal_math.precision(2):
+        assert power(Decimal("1.1111"), Decimal("9")) == Decimal("2.58094249527")
+
+
+def test_power_too_large():
+    with pytest.raises(OperationError, match="Result is too large"):
+        power(Decimal("2"), Decimal("1e999"))
+
+
+def test_power_fractional_of_negative():
+    with pytest.raises(OperationError, match="Fractional powers of negative numbers"):
+        power(Decimal("-8"), Decimal("0.5"))
+
+
+@pytest.mark.parametrize("value, degree, expected", [
+    ("9", "2", "3"),
+    ("27", "3", "3"),
+    ("16", "4", "2"),
+    ("2.25", "2", "1.5"),
+    ("10000", "2", "100"),
+    ("2", "2", "1.4142135624"),
+    ("2", "3", "1.2599210499"),
+    ("0", "3", "0"),
+    ("5", "1", "5"),
+    ("16", "-2", "0.25"),
+    ("16", "0.5", "256"),
+    ("1e-999", "3", "1E-333"),
+])
+def test_root(value, degree, expected):
+    assert str(root(Decimal(value), Decimal(degree))) == expected
+
+
+def test_root_of_value_beyond_float_range():
+    assert root(Decimal("1e999"), Decimal("3")) == Decimal("1e333")
+
+
+@pytest.mark.parametrize("value, degree, message", [
+    ("-8", "3", "Cannot calculate root of negative number"),
+    ("8", "0", "Zero root is undefined"),
+    ("0", "-2", "Division by zero is not allowed"),
+])
+def test_root_errors(value, degree, message):
+    with pytest.raises(OperationError, match=message):
+        root(Decimal(value), Decimal(degree))
+
+
+def test_precision_context():
+    assert decimal_math.get_precision() == decimal_math.DEFAULT_PRECISION
+    with decimal_math.precision(30):
+        assert decimal_math.get_precision() == 30
+        assert str(root(Decimal("2"), Decimal("2"))) == "1.41421356237309504880168872421"
+    assert decimal_math.get_precision() == decimal_math.DEFAULT_PRECISION
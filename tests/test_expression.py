@@ -0,0 +1,134 @@
+from decimal import Decimal
+
+import pytest
+
+from app.exceptions import OperationError, ValidationError
+from app.expression import Apply, CompiledExpression, Negate, Number, Variable, compile_expression, evaluate_expression
+from app.operations import Addition, Operation, OperationFactory, Power, Root
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1 + 2", Decimal("3")),
+    ("2 + 3 * 4", Decimal("14")),
+    ("(2 + 3) * 4", Decimal("20")),
+    ("10 - 4 - 3", Decimal("3")),
+    ("12 / 3 / 2", Decimal("2")),
+    ("2 ^ 3 ^ 2", Decimal("512")),
+    ("2 ** 3", Decimal("8")),
+    ("-2 ^ 2", Decimal("-4")),
+    ("(-2) ^ 2", Decimal("4")),
+    ("-(1 + 2)", Decimal("-3")),
+    ("+5 - -3", Decimal("8")),
+    ("2 × 3 ÷ 4", Decimal("1.5")),
+    ("√81 + 1", Decimal("10")),
+    ("root(27, 3)", Decimal("3")),
+    ("ADD(1, multiply(2, 3))", Decimal("7")),
+    ("1.5e2 + .5", Decimal("150.5")),
+    ("(3 + 4) ^ 2 / root(49, 2)", Decimal("7")),
+])
+def test_evaluate(text, expected):
+    assert evaluate_expression(text) == expected
+
+
+def test_tree_uses_operations():
+    tree = CompiledExpression("-(x + 2) ^ root(4, 2)").tree
+    assert isinstance(tree, Negate)
+    power = tree.operand
+    assert isinstance(power, Apply) and isinstance(power.operation, Power)
+    assert power.left == Apply(OperationFactory.create_operation("add"), Variable("x"), Number(Decimal("2")))
+    assert isinstance(power.right.operation, Root)
+
+
+def test_variables():
+    compiled = CompiledExpression("x * x + y - x")
+    assert compiled.variables == ("x", "y")
+    assert compiled.evaluate({"x": Decimal("3"), "y": Decimal("1")}) == Decimal("7")
+    assert compiled.evaluate({"x": Decimal("2"), "y": Decimal("0")}) == Decimal("2")
+
+
+def test_undefined_variable():
+    with pytest.raises(ValidationError, match="Undefined variable: y"):
+        CompiledExpression("x + y").evaluate({"x": Decimal("1")})
+
+
+def test_numbers():
+    assert CompiledExpression("-2 + x * 3.50").numbers == (Decimal("-2"), Decimal("3.5"))
+
+
+def test_steps_recorded_innermost_first():
+    steps = []
+    result = CompiledExpression("(1 + 2) * 4").evaluate(steps=steps)
+    assert result == Decimal("12")
+    assert [(str(op), a, b, r) for op, a, b, r in steps] == [
+        ("Addition", Decimal("1"), Decimal("2"), Decimal("3")),
+        ("Multiplication", Decimal("3"), Decimal("4"), Decimal("12")),
+    ]
+
+
+@pytest.mark.parametrize("text, message", [
+    ("", "expression is empty"),
+    ("   ", "expression is empty"),
+    ("1 +", "unexpected end of expression"),
+    ("(1 + 2", "unexpected end of expression, expected '\\)'"),
+    ("1 + 2)", "unexpected '\\)' at position 5"),
+    ("1 2", "unexpected '2' at position 2"),
+    ("2 # 3", "unexpected character '#' at position 2"),
+    ("root(8)", "unexpected '\\)' at position 6, expected ','"),
+    ("9e999999999 + 1", "number '9e999999999' out of range at position 0"),
+    ("modulo(5, 2)", "unknown function 'modulo' at position 0"),
+    ("* 2", "unexpected '\\*' at position 0"),
+    ("()", "unexpected '\\)' at position 1"),
+    ("1, 2", "unexpected ',' at position 1"),
+    ("root(1, 2, 3)", "unexpected ',' at position 9, expected '\\)'"),
+    ("root(8", "unexpected end of expression, expected ','"),
+    ("√", "unexpected end of expression"),
+])
+def test_invalid_expression(text, message):
+    with pytest.raises(ValidationError, match=f"Invalid expression: {message}"):
+        CompiledExpression(text)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("+".join(["1"] * 2000), Decimal("2000")),
+    ("(" * 500 + "1" + ")" * 500, Decimal("1")),
+    ("1" + "^1" * 800, Decimal("1")),
+    ("-" * 1001 + "2", Decimal("-2")),
+    ("add(" * 300 + "1" + ", 1)" * 300, Decimal("301")),
+])
+def test_long_and_deeply_nested_expressions(text, expected):
+    compiled = CompiledExpression(text)
+    assert compiled.evaluate() == expected
+    assert compiled.tree is not None
+
+
+def test_operation_errors():
+    with pytest.raises(ValidationError, match="Division by zero is not allowed"):
+        evaluate_expression("1 / (2 - 2)")
+    with pytest.raises(ValidationError, match="Negative exponents not supported"):
+        evaluate_expression("2 ^ -1")
+
+
+def test_arithmetic_failure_raises_operation_error():
+    with pytest.raises(OperationError, match="Calculation failed"):
+        evaluate_expression("9e999999 * 9e999999")
+
+
+def test_compile_expression_is_cached():
+    compile_expression.cache_clear()
+    compiled = compile_expression("1 + 2")
+    assert compile_expression("1 + 2") is compiled
+    assert compile_expression("1+2") is not compiled
+    assert compile_expression.cache_info().hits == 1
+
+
+def test_registered_operation_as_function(operation_registry):
+    class Modulo(Operation):
+        def execute(self, a: Decimal, b: Decimal) -> Decimal:
+            return a % b
+
+    OperationFactory.register_operation("mod", Modulo)
+    assert CompiledExpression("mod(17, 5) + 1").evaluate() == Decimal("3")
+
+
+def test_repr():
+    assert repr(CompiledExpression("1 + 2")) == "CompiledExpression('1 + 2')"
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from decimal import Decimal
+from app.exceptions import OperationError, ValidationError
+from app.float_engine import evaluate_batch, parse_operands
+from app.operations import Addition, Division, Power, Root
+
+
+def test_parse_operands_numeric_fast_path():
+    operands, errors = parse_operands([1, 2.5, '3'], Decimal('1000'))
+    assert operands.tolist() == [1.0, 2.5, 3.0]
+    assert errors == [None, None, None]
+
+
+def test_parse_operands_reports_invalid_rows():
+    operands, errors = parse_operands([' 1 ', 'abc', None, 'nan', 5000], Decimal('1000'))
+    assert operands[0] == 1.0
+    assert errors[0] is None
+    assert isinstance(errors[1], ValidationError)
+    assert "Invalid number format: abc" in str(errors[1])
+    assert isinstance(errors[2], ValidationError)
+    assert "Invalid number format: nan" in str(errors[3])
+    assert "Value exceeds maximum allowed: 1000" in str(errors[4])
+
+
+def test_evaluate_batch_addition():
+    a, b, results, errors = evaluate_batch(Addition(), [1, 2], [3, 4], Decimal('1e999'))
+    assert results.tolist() == [4.0, 6.0]
+    assert errors == [None, None]
+
+
+def test_evaluate_batch_division_by_zero_mask():
+    _, _, results, errors = evaluate_batch(Division(), [1, 1], [4, 0], Decimal('1e999'))
+    assert results[0] == 0.25
+    assert np.isnan(results[1])
+    assert str(errors[1]) == "Division by zero is not allowed"
+
+
+def test_evaluate_batch_power_masks_and_non_finite_results():
+    _, _, results, errors = evaluate_batch(
+        Power(), [2, 2, -8, 10], [3, -1, 0.5, 400], Decimal('1e999')
+    )
+    assert results[0] == 8.0
+    assert str(errors[1]) == "Negative exponents not supported"
+    # rejected like the exact path does, rather than failing as a non-finite result
+    assert isinstance(errors[2], ValidationError)
+    assert str(errors[2]) == "Fractional powers of negative numbers are not supported"
+    assert isinstance(errors[3], OperationError)
+
+
+def test_evaluate_batch_root_masks():
+    _, _, results, errors = evaluate_batch(Root(), [9, -9, 9], [2, 2, 0], Decimal('1e999'))
+    assert results[0] == pytest.approx(3.0)
+    assert str(errors[1]) == "Cannot calculate root of negative number"
+    assert str(errors[2]) == "Zero root is undefined"
+
+
+def test_evaluate_batch_invalid_operand_skips_validation():
+    _, _, _, errors = evaluate_batch(Division(), ['x'], [0], Decimal('1e999'))
+    assert "Invalid number format" in str(errors[0])
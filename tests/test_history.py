@@ -1,9 +1,19 @@
+import threading
 import pytest
 from unittest.mock import Mock, patch
 from app.calculation import Calculation
-from app.history import LoggingObserver, AutoSaveObserver
+from app.history import (
+    HistoryObserver,
+    LoggingObserver,
+    AutoSaveObserver,
+    BackgroundAutoSaveObserver,
+    CoalescingAutoSaveObserver,
+    JournalAutoSaveObserver,
+    QueuedObserver,
+)
 from app.calculator import Calculator
 from app.calculator_config import CalculatorConfig
+from app.exceptions import OperationError
 
 # Sample setup for mock calculation
 calculation_mock = Mock(spec=Calculation)
@@ -19,7 +29,7 @@ def test_logging_observer_logs_calculation(logging_info_mock):
     observer = LoggingObserver()
     observer.update(calculation_mock)
     logging_info_mock.assert_called_once_with(
-        "Calculation performed: addition (5, 3) = 8"
+        "Calculation performed: %s (%s, %s) = %s", "addition", 5, 3, 8
     )
 
 def test_logging_observer_no_calculation():
@@ -71,3 +81,367 @@ def test_autosave_observer_no_calculation():
     
     with pytest.raises(AttributeError):
         observer.update(None)  # Passing None should raise an exception
+
+# Test cases for JournalAutoSaveObserver
+
+def test_journal_observer_appends_calculation():
+    calculator_mock = Mock(spec=Calculator)
+    calculator_mock.config = Mock(spec=CalculatorConfig)
+    calculator_mock.config.auto_save = True
+    observer = JournalAutoSaveObserver(calculator_mock)
+
+    observer.update(calculation_mock)
+    calculator_mock.append_history.assert_called_once_with(calculation_mock)
+    calculator_mock.save_history.assert_not_called()
+
+def test_journal_observer_does_not_append_when_disabled():
+    calculator_mock = Mock(spec=Calculator)
+    calculator_mock.config = Mock(spec=CalculatorConfig)
+    calculator_mock.config.auto_save = False
+    observer = JournalAutoSaveObserver(calculator_mock)
+
+    observer.update(calculation_mock)
+    calculator_mock.append_history.assert_not_called()
+
+def test_journal_observer_appends_batch():
+    calculator_mock = Mock(spec=Calculator)
+    calculator_mock.config = Mock(spec=CalculatorConfig)
+    calculator_mock.config.auto_save = True
+    observer = JournalAutoSaveObserver(calculator_mock)
+
+    observer.update_batch([calculation_mock, calculation_mock])
+    calculator_mock.append_history_batch.assert_called_once_with([calculation_mock, calculation_mock])
+    calculator_mock.append_history.assert_not_called()
+    calculator_mock.save_history.assert_not_called()
+
+    calculator_mock.config.auto_save = False
+    observer.update_batch([calculation_mock])
+    calculator_mock.append_history_batch.assert_called_once()
+
+def test_journal_observer_requires_batch_append():
+    calculator_mock = Mock(spec=['config', 'save_history', 'append_history'])
+    with pytest.raises(TypeError, match="append_history_batch"):
+        JournalAutoSaveObserver(calculator_mock)
+
+def test_journal_observer_invalid_calculator():
+    calculator_mock = Mock(spec=['config', 'save_history'])
+    with pytest.raises(TypeError, match="append_history"):
+        JournalAutoSaveObserver(calculator_mock)
+
+def test_journal_observer_no_calculation():
+    calculator_mock = Mock(spec=Calculator)
+    calculator_mock.config = Mock(spec=CalculatorConfig)
+    observer = JournalAutoSaveObserver(calculator_mock)
+
+    with pytest.raises(AttributeError):
+        observer.update(None)
+
+# Test cases for batch notifications
+
+@patch('logging.info')
+def test_logging_observer_update_batch_logs_once(logging_info_mock):
+    observer = LoggingObserver()
+    observer.update_batch([calculation_mock, calculation_mock])
+    logging_info_mock.assert_called_once_with(
+        "Calculations performed: %d\n%s",
+        2,
+        "  addition (5, 3) = 8\n"
+        "  addition (5, 3) = 8"
+    )
+
+@patch('logging.info')
+def test_logging_observer_update_batch_empty(logging_info_mock):
+    LoggingObserver().update_batch([])
+    logging_info_mock.assert_not_called()
+
+def test_autosave_observer_update_batch_saves_once():
+    calculator_mock = Mock(spec=Calculator)
+    calculator_mock.config = Mock(spec=CalculatorConfig)
+    calculator_mock.config.auto_save = True
+    observer = AutoSaveObserver(calculator_mock)
+
+    observer.update_batch([calculation_mock, calculation_mock, calculation_mock])
+    calculator_mock.save_history.assert_called_once()
+
+def test_autosave_observer_update_batch_disabled():
+    calculator_mock = Mock(spec=Calculator)
+    calculator_mock.config = Mock(spec=CalculatorConfig)
+    calculator_mock.config.auto_save = False
+    observer = AutoSaveObserver(calculator_mock)
+
+    observer.update_batch([calculation_mock])
+    calculator_mock.save_history.assert_not_called()
+
+
+# Test cases for CoalescingAutoSaveObserver
+
+def make_coalescing_observer(interval=60, max_pending=3, auto_save=True):
+    calculator_mock = Mock(spec=Calculator)
+    calculator_mock.config = Mock(spec=CalculatorConfig)
+    calculator_mock.config.auto_save = auto_save
+    observer = CoalescingAutoSaveObserver(calculator_mock, interval=interval, max_pending=max_pending)
+    return observer, calculator_mock
+
+def test_coalescing_observer_saves_once_per_batch_size():
+    observer, calculator_mock = make_coalescing_observer(max_pending=3)
+    for _ in range(7):
+        observer.update(calculation_mock)
+    assert calculator_mock.save_history.call_count == 2
+    assert observer.pending == 1
+    observer.close()
+
+def test_coalescing_observer_saves_after_interval():
+    observer, calculator_mock = make_coalescing_observer(interval=5, max_pending=100)
+    with patch('app.history.time.monotonic', return_value=observer._last_save + 1):
+        observer.update(calculation_mock)
+    calculator_mock.save_history.assert_not_called()
+    with patch('app.history.time.monotonic', return_value=observer._last_save + 5):
+        observer.update(calculation_mock)
+    calculator_mock.save_history.assert_called_once()
+    assert observer.pending == 0
+    observer.close()
+
+def test_coalescing_observer_update_batch():
+    observer, calculator_mock = make_coalescing_observer(max_pending=3)
+    observer.update_batch([calculation_mock, calculation_mock])
+    calculator_mock.save_history.assert_not_called()
+    observer.update_batch([calculation_mock])
+    calculator_mock.save_history.assert_called_once()
+    observer.close()
+
+def test_coalescing_observer_disabled():
+    observer, calculator_mock = make_coalescing_observer(max_pending=1, auto_save=False)
+    observer.update(calculation_mock)
+    observer.update_batch([calculation_mock])
+    assert observer.pending == 0
+    observer.close()
+    calculator_mock.save_history.assert_not_called()
+
+def test_coalescing_observer_no_calculation():
+    observer, _ = make_coalescing_observer()
+    with pytest.raises(AttributeError):
+        observer.update(None)
+    observer.close()
+
+def test_coalescing_observer_flush_and_close():
+    observer, calculator_mock = make_coalescing_observer()
+    observer.flush()
+    calculator_mock.save_history.assert_not_called()
+    observer.update(calculation_mock)
+    with patch('app.history.atexit.unregister') as unregister_mock:
+        observer.close()
+    unregister_mock.assert_called_once_with(observer._flush_at_exit)
+    calculator_mock.save_history.assert_called_once()
+
+def test_coalescing_observer_saves_after_history_change():
+    observer, calculator_mock = make_coalescing_observer()
+    observer.history_changed()
+    calculator_mock.save_history.assert_not_called()
+    observer.flush()
+    calculator_mock.save_history.assert_called_once()
+    observer.flush()
+    calculator_mock.save_history.assert_called_once()
+    observer.close()
+
+def test_coalescing_observer_history_change_disabled():
+    observer, calculator_mock = make_coalescing_observer(auto_save=False)
+    observer.history_changed()
+    observer.close()
+    calculator_mock.save_history.assert_not_called()
+
+@patch('logging.warning')
+def test_coalescing_observer_flush_at_exit_logs_failure(logging_warning_mock):
+    observer, calculator_mock = make_coalescing_observer()
+    observer.update(calculation_mock)
+    calculator_mock.save_history.side_effect = OSError("disk full")
+    observer._flush_at_exit()
+    logging_warning_mock.assert_called_once_with("Could not save pending history at exit: disk full")
+    observer.close = Mock()
+    observer.pending = 0
+
+def test_base_observer_flush_does_nothing():
+    LoggingObserver().flush()
+    LoggingObserver().history_changed()
+
+
+# Test cases for BackgroundAutoSaveObserver
+
+def make_background_observer(auto_save=True):
+    calculator_mock = Mock(spec=Calculator)
+    calculator_mock.config = Mock(spec=CalculatorConfig)
+    calculator_mock.config.auto_save = auto_save
+    calculator_mock.config.history_writer_queue_size = 4
+    observer = BackgroundAutoSaveObserver(calculator_mock)
+    return observer, calculator_mock
+
+def test_background_observer_writes_snapshots_on_writer_thread():
+    observer, calculator_mock = make_background_observer()
+    observer.update(calculation_mock)
+    observer.update_batch([calculation_mock, calculation_mock])
+    observer.flush()
+    assert calculator_mock.snapshot_history.call_count == 2
+    calculator_mock.write_history.assert_called_with(calculator_mock.snapshot_history.return_value)
+    calculator_mock.save_history.assert_not_called()
+    observer.close()
+
+def test_background_observer_disabled():
+    observer, calculator_mock = make_background_observer(auto_save=False)
+    observer.update(calculation_mock)
+    observer.update_batch([calculation_mock])
+    observer.close()
+    calculator_mock.snapshot_history.assert_not_called()
+
+def test_background_observer_no_calculation():
+    observer, _ = make_background_observer()
+    with pytest.raises(AttributeError):
+        observer.update(None)
+    observer.close()
+
+def test_background_observer_requires_snapshot_methods():
+    calculator_mock = Mock()
+    calculator_mock.config = Mock(spec=CalculatorConfig)
+    del calculator_mock.snapshot_history
+    with pytest.raises(TypeError, match="snapshot_history"):
+        BackgroundAutoSaveObserver(calculator_mock)
+
+def test_background_observer_close_unregisters():
+    observer, _ = make_background_observer()
+    with patch('app.history.atexit.unregister') as unregister_mock:
+        observer.close()
+    unregister_mock.assert_called_once_with(observer._close_at_exit)
+    assert not observer.writer._thread.is_alive()
+
+@patch('logging.warning')
+def test_background_observer_close_at_exit_logs_failure(logging_warning_mock):
+    observer, calculator_mock = make_background_observer()
+    calculator_mock.write_history.side_effect = OSError("disk full")
+    observer.update(calculation_mock)
+    observer._close_at_exit()
+    logging_warning_mock.assert_called_once_with(
+        "Could not save pending history at exit: Background history write failed: disk full"
+    )
+    observer.close()
+
+
+# Test cases for QueuedObserver
+
+class RecordingObserver(HistoryObserver):
+    def __init__(self, block=None):
+        self.calls = []
+        self.threads = set()
+        self.block = block
+
+    def update(self, calculation):
+        if self.block is not None:
+            self.block.wait()
+        self.threads.add(threading.current_thread().name)
+        self.calls.append(calculation)
+
+    def history_changed(self):
+        self.calls.append('changed')
+
+    def flush(self):
+        self.calls.append('flush')
+
+def test_queued_observer_delivers_in_order_on_worker_thread():
+    wrapped = RecordingObserver()
+    observer = QueuedObserver(wrapped)
+    calculations = [Mock(spec=Calculation) for _ in range(50)]
+    for calculation in calculations[:10]:
+        observer.update(calculation)
+    observer.update_batch(calculations[10:])
+    observer.flush()
+    assert wrapped.calls == calculations + ['flush']
+    assert wrapped.threads == {'observer-RecordingObserver'}
+    observer.close()
+
+def test_queued_observer_forwards_history_change():
+    wrapped = RecordingObserver()
+    observer = QueuedObserver(wrapped, max_pending=1, policy='drop')
+    observer.update(calculation_mock)
+    observer.history_changed()
+    observer.flush()
+    assert wrapped.calls == [calculation_mock, 'changed', 'flush']
+    observer.close()
+    with pytest.raises(OperationError, match="Observer queue is closed"):
+        observer.history_changed()
+
+def test_queued_observer_block_policy_waits_for_room():
+    release = threading.Event()
+    wrapped = RecordingObserver(block=release)
+    observer = QueuedObserver(wrapped, max_pending=1, policy='block')
+    for _ in range(2):
+        observer.update(calculation_mock)
+
+    blocked = threading.Thread(target=observer.update, args=(calculation_mock,))
+    blocked.start()
+    blocked.join(timeout=0.1)
+    assert blocked.is_alive()
+
+    release.set()
+    blocked.join()
+    observer.close()
+    assert wrapped.calls.count(calculation_mock) == 3
+
+@patch('logging.warning')
+def test_queued_observer_drop_policy_discards_when_full(logging_warning_mock):
+    release = threading.Event()
+    wrapped = RecordingObserver(block=release)
+    observer = QueuedObserver(wrapped, max_pending=1, policy='drop')
+    for _ in range(5):
+        observer.update(calculation_mock)
+    assert observer.dropped >= 3
+
+    release.set()
+    observer.flush()
+    logging_warning_mock.assert_called_once()
+    assert "notifications for RecordingObserver" in logging_warning_mock.call_args.args[0]
+    assert observer.dropped == 0
+    observer.close()
+
+def test_queued_observer_flush_raises_observer_failure(caplog):
+    wrapped = Mock(spec=LoggingObserver)
+    wrapped.update.side_effect = OSError("disk full")
+    observer = QueuedObserver(wrapped)
+    observer.update(calculation_mock)
+    with pytest.raises(OperationError, match="disk full"):
+        observer.flush()
+    assert "disk full" in caplog.text
+    # the worker keeps delivering after a failure
+    wrapped.update.side_effect = None
+    observer.update(calculation_mock)
+    observer.close()
+    assert wrapped.update.call_count == 2
+
+def test_queued_observer_no_calculation():
+    observer = QueuedObserver(RecordingObserver())
+    with pytest.raises(AttributeError):
+        observer.update(None)
+    observer.close()
+
+def test_queued_observer_close():
+    wrapped = RecordingObserver()
+    observer = QueuedObserver(wrapped)
+    observer.update(calculation_mock)
+    with patch('app.history.atexit.unregister') as unregister_mock:
+        observer.close()
+    unregister_mock.assert_called_once_with(observer._close_at_exit)
+    assert wrapped.calls == [calculation_mock, 'flush']
+    assert not observer._thread.is_alive()
+    # closing again has no effect
+    observer.close()
+    observer.flush()
+    with pytest.raises(OperationError, match="Observer queue is closed"):
+        observer.update(calculation_mock)
+
+@patch('logging.warning')
+def test_queued_observer_close_at_exit_logs_failure(logging_warning_mock):
+    wrapped = Mock(spec=LoggingObserver)
+    wrapped.update.side_effect = OSError("disk full")
+    observer = QueuedObserver(wrapped)
+    observer.update(calculation_mock)
+    observer._close_at_exit()
+    logging_warning_mock.assert_called_once_with(
+        "Could not deliver pending notifications at exit: Observer Mock failed: disk full"
+    )
+    assert not observer._thread.is_alive()
@@ -0,0 +1,70 @@
+from decimal import Decimal
+from app.calculation import Calculation
+from app.history_archive import HistoryArchive
+
+
+def make_calculations(count):
+    return [
+        Calculation(operation="Addition", operand1=Decimal(i), operand2=Decimal(0))
+        for i in range(count)
+    ]
+
+
+def make_archive(position=10):
+    # positions count records, as in binary history files
+    archive = HistoryArchive(lambda position, count: position - count)
+    archive.reset(position)
+    return archive
+
+
+def test_push_and_snapshot():
+    calcs = make_calculations(2)
+    archive = make_archive()
+    archive.push(calcs[:1])
+    archive.push([])
+    archive.push(calcs[1:])
+    snapshot = archive.snapshot()
+    assert snapshot.position == 10
+    assert snapshot.pending == calcs
+    assert len(archive) == 2
+
+
+def test_restore_takes_pending_first_then_stored_records():
+    archive = make_archive()
+    archive.push(make_calculations(2))
+    archive.restore(0)
+    archive.restore(1)
+    assert len(archive) == 1
+    assert archive.snapshot().position == 10
+    archive.restore(3)
+    assert len(archive) == 0
+    assert archive.snapshot().position == 8
+
+
+def test_written_moves_pending_to_stored_records():
+    archive = make_archive()
+    archive.push(make_calculations(2))
+    snapshot = archive.snapshot()
+    archive.written(snapshot, 12)
+    assert len(archive) == 0
+    assert archive.snapshot().position == 12
+
+
+def test_written_keeps_pending_changed_since_snapshot():
+    calcs = make_calculations(2)
+    archive = make_archive()
+    archive.push(calcs[:1])
+    snapshot = archive.snapshot()
+    archive.restore(1)
+    archive.push(calcs[1:])
+    archive.written(snapshot, 11)
+    assert archive.snapshot().pending == calcs[1:]
+    assert archive.snapshot().position == 10
+
+
+def test_reset_discards_pending():
+    archive = make_archive()
+    archive.push(make_calculations(1))
+    archive.reset()
+    assert archive.snapshot().position == 0
+    assert len(archive) == 0
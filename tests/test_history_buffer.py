@@ -0,0 +1,162 @@
+import datetime
+import pytest
+import numpy as np
+from decimal import Decimal
+from app.calculation import Calculation
+from app.history_buffer import ColumnarHistoryBuffer, HistoryBuffer, columns_of, concat_columns
+
+
+def make_calculations(count):
+    return [
+        Calculation(operation="Addition", operand1=Decimal(i), operand2=Decimal(0))
+        for i in range(count)
+    ]
+
+
+def test_buffer_keeps_newest_initial_calculations():
+    calcs = make_calculations(5)
+    buffer = HistoryBuffer(3, calcs)
+    assert buffer.max_size == 3
+    assert buffer == calcs[2:]
+
+
+def test_append_evicts_oldest_when_full():
+    calcs = make_calculations(3)
+    buffer = HistoryBuffer(2)
+    assert buffer.append(calcs[0]) is None
+    assert buffer.append(calcs[1]) is None
+    assert buffer.append(calcs[2]) is calcs[0]
+    assert buffer == calcs[1:]
+
+
+def test_extend_returns_evicted_calculations():
+    calcs = make_calculations(5)
+    buffer = HistoryBuffer(3)
+    assert buffer.extend(calcs) == calcs[:2]
+    assert len(buffer) == 3
+
+
+def test_pop_and_appendleft():
+    calcs = make_calculations(3)
+    buffer = HistoryBuffer(3, calcs[1:])
+    assert buffer.pop() is calcs[2]
+    buffer.appendleft(calcs[0])
+    assert buffer == calcs[:2]
+
+
+def test_pop_empty_raises():
+    with pytest.raises(IndexError):
+        HistoryBuffer(1).pop()
+
+
+def test_indexing_and_slicing():
+    calcs = make_calculations(4)
+    buffer = HistoryBuffer(4, calcs)
+    assert buffer[0] is calcs[0]
+    assert buffer[-1] is calcs[3]
+    assert buffer[1:3] == calcs[1:3]
+    assert buffer[-2:] == calcs[-2:]
+    assert buffer[::2] == calcs[::2]
+    assert buffer[::-1] == calcs[::-1]
+
+
+def test_iteration_copy_and_clear():
+    calcs = make_calculations(3)
+    buffer = HistoryBuffer(3, calcs)
+    assert list(buffer) == calcs
+    assert list(reversed(buffer)) == calcs[::-1]
+
+    copy = buffer.copy()
+    buffer.clear()
+    assert copy == calcs
+    assert buffer == []
+    assert not buffer
+
+
+def test_equality_and_repr():
+    calcs = make_calculations(2)
+    assert HistoryBuffer(2, calcs) == HistoryBuffer(5, calcs)
+    assert HistoryBuffer(2).__eq__("not a buffer") is NotImplemented
+    assert repr(HistoryBuffer(2)) == "HistoryBuffer(max_size=2, calculations=[])"
+
+
+
+def test_to_columns():
+    calcs = make_calculations(2)
+    calcs[1].timestamp = datetime.datetime(2024, 1, 2, 3, 4, 5, 6)
+    columns = HistoryBuffer(2, calcs).to_columns()
+    assert columns['operation'] == ['Addition', 'Addition']
+    assert columns['operand1'] == ['0', '1']
+    assert columns['result'] == ['0', '1']
+    assert columns['timestamp'][1] == np.datetime64('2024-01-02T03:04:05.000006')
+
+
+class TestColumnarHistoryBuffer:
+    """Test the columnar ring buffer against the same behaviour as HistoryBuffer."""
+
+    def test_round_trips_calculations(self):
+        calcs = make_calculations(3)
+        calcs[0].timestamp = datetime.datetime(1969, 12, 31, 23, 59, 59, 999999)
+        buffer = ColumnarHistoryBuffer(3, calcs)
+        assert buffer == calcs
+        assert [calc.timestamp for calc in buffer] == [calc.timestamp for calc in calcs]
+        assert buffer[0].result == Decimal(0)
+
+    def test_append_evicts_oldest_when_full(self):
+        calcs = make_calculations(3)
+        buffer = ColumnarHistoryBuffer(2, calcs[:2])
+        assert buffer.max_size == 2
+        assert buffer.append(calcs[2]) == calcs[0]
+        assert buffer.extend(calcs[:1]) == [calcs[1]]
+        assert buffer == [calcs[2], calcs[0]]
+
+    def test_pop_appendleft_and_clear(self):
+        calcs = make_calculations(3)
+        buffer = ColumnarHistoryBuffer(3, calcs[1:])
+        assert buffer.pop() == calcs[2]
+        buffer.appendleft(calcs[0])
+        assert buffer.copy() == calcs[:2]
+        buffer.clear()
+        assert len(buffer) == 0
+        with pytest.raises(IndexError):
+            buffer.pop()
+
+    def test_indexing_slicing_and_reversed(self):
+        calcs = make_calculations(4)
+        buffer = ColumnarHistoryBuffer(4, calcs)
+        assert buffer[-1] == calcs[3]
+        assert buffer[1:3] == calcs[1:3]
+        assert buffer[-2:] == calcs[-2:]
+        assert buffer[::2] == calcs[::2]
+        assert buffer[3:1] == []
+        assert buffer[::-1] == calcs[::-1]
+        assert buffer[2::-2] == calcs[2::-2]
+        assert list(reversed(buffer)) == calcs[::-1]
+
+    def test_to_columns_copies_stored_columns(self):
+        calcs = make_calculations(2)
+        calcs[0].timestamp = datetime.datetime(2024, 1, 1)
+        buffer = ColumnarHistoryBuffer(2, calcs)
+        columns = buffer.to_columns()
+        assert columns == {
+            **columns,
+            'operation': ['Addition', 'Addition'],
+            'operand1': ['0', '1'],
+            'operand2': ['0', '0'],
+            'result': ['0', '1'],
+        }
+        assert columns['timestamp'].dtype == np.dtype('datetime64[us]')
+        assert columns['timestamp'][0] == np.datetime64('2024-01-01T00:00:00')
+
+    def test_repr(self):
+        assert repr(ColumnarHistoryBuffer(2)) == "ColumnarHistoryBuffer(max_size=2, calculations=[])"
+
+
+def test_columns_of_and_concat_columns():
+    calcs = make_calculations(3)
+    columns = concat_columns(columns_of(calcs[:1]), columns_of([]), columns_of(calcs[1:]))
+    expected = HistoryBuffer(3, calcs).to_columns()
+    assert list(columns) == list(expected)
+    for name in ('operation', 'operand1', 'operand2', 'result'):
+        assert columns[name] == expected[name]
+    assert np.array_equal(columns['timestamp'], expected['timestamp'])
@@ -0,0 +1,115 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.calculation import Calculation
+from app.history_journal import HistoryJournal
+
+
+def make_calculation(a, b):
+    return Calculation(
+        operation="Addition",
+        operand1=Decimal(a),
+        operand2=Decimal(b),
+        timestamp=datetime.datetime(2024, 1, 1, 12, 0, 0)
+    )
+
+
+def test_journal_append_and_read(tmp_path):
+    journal = HistoryJournal(tmp_path / "history.csv.journal")
+    journal.append(make_calculation("1", "2"))
+    journal.append(make_calculation("3", "4"))
+
+    assert len(journal) == 2
+    calculations = journal.read()
+    assert [calc.result for calc in calculations] == [Decimal("3"), Decimal("7")]
+    assert calculations[0].timestamp == datetime.datetime(2024, 1, 1, 12, 0, 0)
+
+
+def test_journal_writes_header_once(tmp_path):
+    path = tmp_path / "history.csv.journal"
+    journal = HistoryJournal(path)
+    journal.append(make_calculation("1", "2"))
+    journal.append(make_calculation("3", "4"))
+
+    lines = path.read_text().splitlines()
+    assert lines[0] == "operation,operand1,operand2,result,timestamp"
+    assert len(lines) == 3
+
+
+def test_journal_extend_writes_batch(tmp_path):
+    path = tmp_path / "history.csv.journal"
+    journal = HistoryJournal(path)
+    journal.append(make_calculation("1", "2"))
+    journal.extend([make_calculation("3", "4"), make_calculation("5", "6")])
+
+    assert len(journal) == 3
+    assert len(path.read_text().splitlines()) == 4
+    assert [calc.result for calc in journal.read()] == [Decimal("3"), Decimal("7"), Decimal("11")]
+
+
+def test_journal_discards_incomplete_last_record(tmp_path):
+    path = tmp_path / "history.csv.journal"
+    journal = HistoryJournal(path)
+    journal.extend([make_calculation("1", "2"), make_calculation("3", "4")])
+    # simulate a crash in the middle of appending the last record
+    path.write_bytes(path.read_bytes()[:-12])
+
+    calculations = HistoryJournal(path).read()
+    assert [calc.result for calc in calculations] == [Decimal("3")]
+
+    # the incomplete record was cut, so the next record starts on its own line
+    journal = HistoryJournal(path)
+    journal.append(make_calculation("5", "6"))
+    assert [calc.result for calc in journal.read()] == [Decimal("3"), Decimal("11")]
+    assert len(journal) == 2
+
+
+@pytest.mark.parametrize("encoding", ["utf-16", "utf-16-le"])
+def test_journal_discards_incomplete_record_in_wide_encoding(tmp_path, encoding):
+    path = tmp_path / "history.csv.journal"
+    journal = HistoryJournal(path, encoding)
+    journal.extend([make_calculation("1", "2"), make_calculation("3", "4")])
+    # cut in the middle of a character
+    path.write_bytes(path.read_bytes()[:-13])
+
+    journal = HistoryJournal(path, encoding)
+    assert [calc.result for calc in journal.read()] == [Decimal("3")]
+    journal.append(make_calculation("5", "6"))
+    assert [calc.result for calc in journal.read()] == [Decimal("3"), Decimal("11")]
+
+
+def test_journal_discards_incomplete_header(tmp_path):
+    path = tmp_path / "history.csv.journal"
+    path.write_text("operation,oper")
+    journal = HistoryJournal(path)
+
+    assert journal.read() == []
+    journal.append(make_calculation("1", "2"))
+    assert [calc.result for calc in journal.read()] == [Decimal("3")]
+
+
+def test_journal_read_missing_file(tmp_path):
+    journal = HistoryJournal(tmp_path / "missing.journal")
+    assert journal.read() == []
+    assert len(journal) == 0
+
+
+def test_journal_counts_existing_records(tmp_path):
+    path = tmp_path / "history.csv.journal"
+    HistoryJournal(path).append(make_calculation("1", "2"))
+
+    # a fresh journal object counts the records already on disk
+    assert len(HistoryJournal(path)) == 1
+
+
+def test_journal_clear_removes_file(tmp_path):
+    path = tmp_path / "history.csv.journal"
+    journal = HistoryJournal(path)
+    journal.append(make_calculation("1", "2"))
+    journal.clear()
+
+    assert not path.exists()
+    assert len(journal) == 0
+    journal.clear()  # clearing an empty journal is a no-op
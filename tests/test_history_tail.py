@@ -0,0 +1,53 @@
+import io
+import pytest
+from app import history_tail
+from app.history_tail import line_start_before
+
+CONTENTS = b"header\nline1\nline2\nline3\n"
+DATA_START = len(b"header\n")
+
+
+@pytest.mark.parametrize("count, expected", [
+    (0, len(CONTENTS)),
+    (1, CONTENTS.index(b"line3")),
+    (2, CONTENTS.index(b"line2")),
+    (3, DATA_START),
+    (10, DATA_START),
+])
+def test_line_start_before_end(count, expected):
+    assert line_start_before(io.BytesIO(CONTENTS), len(CONTENTS), count, DATA_START) == expected
+
+
+def test_line_start_before_position():
+    end = CONTENTS.index(b"line3")
+    assert line_start_before(io.BytesIO(CONTENTS), end, 1, DATA_START) == CONTENTS.index(b"line2")
+
+
+def test_line_start_before_without_trailing_newline():
+    contents = CONTENTS.rstrip(b"\n")
+    assert line_start_before(io.BytesIO(contents), len(contents), 1, DATA_START) == contents.index(b"line3")
+
+
+def test_line_start_before_crlf():
+    contents = CONTENTS.replace(b"\n", b"\r\n")
+    assert line_start_before(io.BytesIO(contents), len(contents), 2, 8) == contents.index(b"line2")
+
+
+def test_line_start_before_across_blocks(monkeypatch):
+    monkeypatch.setattr(history_tail, "BLOCK_SIZE", 4)
+    assert line_start_before(io.BytesIO(CONTENTS), len(CONTENTS), 2, DATA_START) == CONTENTS.index(b"line2")
+    assert line_start_before(io.BytesIO(CONTENTS), len(CONTENTS), 5, DATA_START) == DATA_START
+
+
+def test_copy_prefix(monkeypatch):
+    monkeypatch.setattr(history_tail, "BLOCK_SIZE", 4)
+    source = io.BytesIO(CONTENTS)
+    source.seek(5)
+    target = io.BytesIO()
+    history_tail.copy_prefix(source, target, DATA_START + 6)
+    assert target.getvalue() == b"header\nline1\n"
+
+
+def test_copy_prefix_past_end_raises():
+    with pytest.raises(EOFError):
+        history_tail.copy_prefix(io.BytesIO(CONTENTS), io.BytesIO(), len(CONTENTS) + 1)
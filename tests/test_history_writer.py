@@ -0,0 +1,99 @@
+import threading
+import pytest
+from app.exceptions import OperationError
+from app.history_writer import HistorySnapshot, HistoryWriter
+
+
+def make_snapshot(sequence, size=1):
+    return HistorySnapshot(sequence, {'operation': ['Addition'] * size})
+
+
+def test_snapshot_length():
+    assert len(make_snapshot(0, 3)) == 3
+    assert len(make_snapshot(1, 0)) == 0
+
+
+def test_writes_submitted_snapshots():
+    written = []
+    writer = HistoryWriter(written.append)
+    writer.submit(make_snapshot(0))
+    writer.flush()
+    assert [snapshot.sequence for snapshot in written] == [0]
+    writer.close()
+
+
+def test_only_newest_queued_snapshot_is_written():
+    started = threading.Event()
+    release = threading.Event()
+    written = []
+
+    def write(snapshot):
+        started.set()
+        release.wait()
+        written.append(snapshot.sequence)
+
+    writer = HistoryWriter(write, max_pending=8)
+    writer.submit(make_snapshot(0))
+    # wait until the writer is busy with the first snapshot
+    started.wait()
+    for sequence in range(1, 5):
+        writer.submit(make_snapshot(sequence))
+    release.set()
+    writer.flush()
+    assert written == [0, 4]
+    writer.close()
+
+
+def test_submit_blocks_when_queue_is_full():
+    started = threading.Event()
+    release = threading.Event()
+
+    def write(snapshot):
+        started.set()
+        release.wait()
+
+    writer = HistoryWriter(write, max_pending=1)
+    writer.submit(make_snapshot(0))
+    started.wait()
+    writer.submit(make_snapshot(1))
+
+    blocked = threading.Thread(target=writer.submit, args=(make_snapshot(2),))
+    blocked.start()
+    blocked.join(timeout=0.1)
+    assert blocked.is_alive()
+
+    release.set()
+    blocked.join()
+    writer.close()
+
+
+def test_flush_raises_failed_write(caplog):
+    def write(snapshot):
+        raise OSError("disk full")
+
+    writer = HistoryWriter(write)
+    writer.submit(make_snapshot(0))
+    with pytest.raises(OperationError, match="Background history write failed: disk full"):
+        writer.flush()
+    assert "Background history write failed: disk full" in caplog.text
+    # the error is reported once
+    writer.flush()
+    writer.close()
+
+
+def test_close_writes_remaining_snapshots():
+    written = []
+    writer = HistoryWriter(lambda snapshot: written.append(snapshot.sequence))
+    writer.submit(make_snapshot(0))
+    writer.close()
+    assert written == [0]
+    assert not writer._thread.is_alive()
+    # closing again has no effect
+    writer.close()
+
+
+def test_submit_after_close():
+    writer = HistoryWriter(lambda snapshot: None)
+    writer.close()
+    with pytest.raises(OperationError, match="History writer is closed"):
+        writer.submit(make_snapshot(0))
@@ -0,0 +1,62 @@
+import logging
+import threading
+from logging.handlers import QueueHandler
+import pytest
+from unittest.mock import patch
+from app import log_queue
+from app.log_queue import start_queue_logging, stop_queue_logging
+
+LOG_FORMAT = '%(levelname)s - %(threadName)s - %(message)s'
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    yield tmp_path / "calculator.log"
+    stop_queue_logging()
+
+
+def test_records_are_written_by_listener(log_file):
+    start_queue_logging(log_file, 'INFO', LOG_FORMAT)
+    assert isinstance(logging.getLogger().handlers[0], QueueHandler)
+
+    writers = []
+    emit = logging.FileHandler.emit
+    def record_writer(handler, record):
+        writers.append(threading.current_thread())
+        emit(handler, record)
+
+    with patch.object(logging.FileHandler, 'emit', record_writer):
+        logging.info("Set operation: %s", "Addition")
+        stop_queue_logging()
+
+    # written on the listener thread, not the thread that logged
+    assert writers and threading.current_thread() not in writers
+    assert log_file.read_text() == "INFO - MainThread - Set operation: Addition\n"
+
+
+def test_level_filters_records(log_file):
+    start_queue_logging(log_file, 'WARNING', LOG_FORMAT)
+    logging.info("hidden")
+    logging.warning("shown")
+    stop_queue_logging()
+    assert log_file.read_text().count("\n") == 1
+    assert "shown" in log_file.read_text()
+
+
+def test_restart_replaces_listener(log_file, tmp_path):
+    start_queue_logging(log_file, 'INFO', LOG_FORMAT)
+    first = log_queue._listener
+    other_file = tmp_path / "other.log"
+    start_queue_logging(other_file, 'INFO', LOG_FORMAT)
+    assert log_queue._listener is not first
+    assert first.handlers[0].stream is None
+    logging.info("to other")
+    stop_queue_logging()
+    assert "to other" in other_file.read_text()
+    assert "to other" not in log_file.read_text()
+
+
+def test_stop_without_listener():
+    stop_queue_logging()
+    stop_queue_logging()
+    assert log_queue._listener is None
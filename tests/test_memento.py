@@ -1,7 +1,9 @@
 import datetime
 from unittest.mock import MagicMock
-from app.calculator_memento import CalculatorMemento
+import pytest
+from app.calculator_memento import CalculatorMemento, MementoStack
 from app.calculation import Calculation
+from app.history_buffer import ColumnarHistoryBuffer, HistoryBuffer
 
 # covers line 60 of calculator_memento.py
 # Steps:
@@ -72,3 +74,125 @@ def test_calculator_memento_to_dict():
 
 
 
+
+def make_calculation(a, b):
+    return Calculation(
+        operation='Addition',
+        operand1=a,
+        operand2=b,
+        timestamp=datetime.datetime(2023, 1, 1, 12, 0, 0)
+    )
+
+def test_delta_memento_revert_and_apply():
+    calc1, calc2, calc3 = make_calculation(1, 1), make_calculation(2, 2), make_calculation(3, 3)
+    # calc3 was appended to a full history, evicting calc1
+    history = HistoryBuffer(2, [calc2, calc3])
+    memento = CalculatorMemento.from_append([calc3], [calc1])
+    assert memento.is_delta
+
+    history, redo_memento = memento.revert(history)
+    assert history == [calc1, calc2]
+    assert redo_memento is memento
+
+    history, undo_memento = redo_memento.apply(history)
+    assert history == [calc2, calc3]
+    assert undo_memento is memento
+
+@pytest.mark.parametrize("buffer_class", [HistoryBuffer, ColumnarHistoryBuffer])
+def test_delta_memento_for_append_larger_than_history(buffer_class):
+    before = [make_calculation(1, 1), make_calculation(2, 2)]
+    batch = [make_calculation(i, 0) for i in range(10, 15)]
+    history = buffer_class(3, before)
+    evicted = history.extend(batch)
+    # the first two appended calculations were evicted by the later ones
+    memento = CalculatorMemento.from_append(batch, evicted, history.max_size)
+    assert memento.appended == batch[2:]
+    assert memento.evicted == before
+
+    history, _ = memento.revert(history)
+    assert list(history) == before
+
+    history, _ = memento.apply(history)
+    assert list(history) == batch[2:]
+
+def test_snapshot_memento_swaps_history():
+    calc1, calc2 = make_calculation(1, 1), make_calculation(2, 2)
+    current = HistoryBuffer(2, [calc1, calc2])
+    memento = CalculatorMemento([calc1])
+    assert not memento.is_delta
+
+    history, redo_memento = memento.revert(current)
+    assert history == [calc1]
+    assert redo_memento.history is current
+
+    history, undo_memento = redo_memento.apply(history)
+    assert history == [calc1, calc2]
+    assert undo_memento.history == [calc1]
+
+def test_delta_memento_dict_round_trip():
+    calc1, calc2 = make_calculation(1, 1), make_calculation(2, 2)
+    memento = CalculatorMemento.from_append(
+        [calc2], [calc1]
+    )
+    memento.timestamp = datetime.datetime(2023, 1, 3, 10, 0, 0)
+
+    d = memento.to_dict()
+    assert 'history' not in d
+    assert d['appended'][0]['operand1'] == '2'
+    assert d['evicted'][0]['operand1'] == '1'
+
+    restored = CalculatorMemento.from_dict(d)
+    assert restored.is_delta
+    assert restored.appended == [calc2]
+    assert restored.evicted == [calc1]
+    assert restored.timestamp == memento.timestamp
+
+def test_memento_estimate_size_counts_calculations():
+    empty = CalculatorMemento.from_append([])
+    single = CalculatorMemento.from_append([make_calculation(1, 1)])
+    snapshot = CalculatorMemento([make_calculation(1, 1), make_calculation(2, 2)])
+
+    assert 0 < empty.estimate_size() < single.estimate_size() < snapshot.estimate_size()
+
+def test_memento_stack_evicts_oldest_beyond_max_depth():
+    stack = MementoStack(max_depth=2)
+    mementos = [CalculatorMemento.from_append([make_calculation(i, i)]) for i in range(3)]
+    for memento in mementos:
+        stack.append(memento)
+
+    assert len(stack) == 2
+    assert stack == mementos[1:]
+    assert stack[0] is mementos[1]
+    assert stack.pop() is mementos[2]
+
+def test_memento_stack_tracks_memory_usage():
+    stack = MementoStack(max_depth=10)
+    memento = CalculatorMemento.from_append([make_calculation(1, 1)])
+    stack.append(memento)
+    assert stack.memory_usage == memento.estimate_size()
+
+    stack.pop()
+    assert stack.memory_usage == 0
+
+    stack.append(memento)
+    stack.clear()
+    assert stack.memory_usage == 0
+    assert not stack
+
+def test_memento_stack_respects_memory_budget():
+    memento_size = CalculatorMemento.from_append([make_calculation(1, 1)]).estimate_size()
+    stack = MementoStack(max_depth=10, memory_budget=memento_size * 2)
+    for i in range(5):
+        stack.append(CalculatorMemento.from_append([make_calculation(i, i)]))
+
+    assert len(stack) == 2
+    assert stack.memory_usage <= memento_size * 2
+
+def test_memento_stack_pop_empty_raises():
+    with pytest.raises(IndexError):
+        MementoStack(max_depth=1).pop()
+
+def test_memento_stack_equality():
+    assert MementoStack(max_depth=1) == []
+    assert MementoStack(max_depth=1) == MementoStack(max_depth=2)
+    assert MementoStack(max_depth=1).__eq__("not a stack") is NotImplemented
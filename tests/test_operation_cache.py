@@ -0,0 +1,96 @@
+import pytest
+from decimal import Decimal, localcontext
+from unittest.mock import Mock
+from app import decimal_math
+from app.exceptions import OperationError
+from app.operation_cache import OperationCache
+
+
+def test_repeated_lookup_is_a_hit():
+    cache = OperationCache(max_size=4)
+    compute = Mock(return_value=Decimal("8"))
+    for _ in range(3):
+        assert cache.get_or_compute("Power", Decimal("2"), Decimal("3"), compute) == Decimal("8")
+    compute.assert_called_once()
+    assert (cache.hits, cache.misses, len(cache)) == (2, 1, 1)
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = OperationCache(max_size=2, eviction='lru')
+    for a in ("1", "2"):
+        cache.get_or_compute("Addition", Decimal(a), Decimal("1"), lambda: Decimal(a))
+    # using the oldest entry makes "2" the least recently used
+    cache.get_or_compute("Addition", Decimal("1"), Decimal("1"), Mock())
+    cache.get_or_compute("Addition", Decimal("3"), Decimal("1"), lambda: Decimal("4"))
+
+    compute = Mock(return_value=Decimal("2"))
+    cache.get_or_compute("Addition", Decimal("1"), Decimal("1"), compute)
+    compute.assert_not_called()
+    cache.get_or_compute("Addition", Decimal("2"), Decimal("1"), compute)
+    compute.assert_called_once()
+
+
+def test_fifo_eviction_removes_oldest():
+    cache = OperationCache(max_size=2, eviction='fifo')
+    for a in ("1", "2"):
+        cache.get_or_compute("Addition", Decimal(a), Decimal("1"), lambda: Decimal(a))
+    cache.get_or_compute("Addition", Decimal("1"), Decimal("1"), Mock())
+    cache.get_or_compute("Addition", Decimal("3"), Decimal("1"), lambda: Decimal("4"))
+
+    compute = Mock(return_value=Decimal("2"))
+    cache.get_or_compute("Addition", Decimal("1"), Decimal("1"), compute)
+    compute.assert_called_once()
+
+
+def test_disabled_cache_always_computes():
+    cache = OperationCache(max_size=0)
+    compute = Mock(return_value=Decimal("2"))
+    for _ in range(2):
+        cache.get_or_compute("Addition", Decimal("1"), Decimal("1"), compute)
+    assert compute.call_count == 2
+    assert len(cache) == 0
+    assert cache.misses == 0
+
+
+def test_errors_are_not_cached():
+    cache = OperationCache()
+    compute = Mock(side_effect=OperationError("Division by zero is not allowed"))
+    for _ in range(2):
+        with pytest.raises(OperationError):
+            cache.get_or_compute("Division", Decimal("1"), Decimal("0"), compute)
+    assert compute.call_count == 2
+    assert len(cache) == 0
+
+
+def test_key_keeps_operand_representation():
+    cache = OperationCache()
+    cache.get_or_compute("Addition", Decimal("1"), Decimal("1"), lambda: Decimal("2"))
+    result = cache.get_or_compute("Addition", Decimal("1.0"), Decimal("1"), lambda: Decimal("2.0"))
+    assert str(result) == "2.0"
+
+
+def test_key_includes_precision():
+    cache = OperationCache()
+    third = lambda: decimal_math.root(Decimal("2"), Decimal("3"))
+    with decimal_math.precision(2):
+        assert cache.get_or_compute("Root", Decimal("2"), Decimal("3"), third) == Decimal("1.26")
+    with decimal_math.precision(4):
+        assert cache.get_or_compute("Root", Decimal("2"), Decimal("3"), third) == Decimal("1.2599")
+    with localcontext() as ctx:
+        ctx.prec = 5
+        cache.get_or_compute("Division", Decimal("1"), Decimal("3"), lambda: Decimal(1) / Decimal(3))
+    result = cache.get_or_compute("Division", Decimal("1"), Decimal("3"), lambda: Decimal(1) / Decimal(3))
+    assert result == Decimal(1) / Decimal(3)
+    assert cache.misses == 4
+
+
+def test_configure_shrinks_and_clear_resets():
+    cache = OperationCache(max_size=4)
+    for a in range(4):
+        cache.get_or_compute("Addition", Decimal(a), Decimal("1"), lambda: Decimal(a + 1))
+    cache.configure(2, 'fifo')
+    assert len(cache) == 2
+    assert (cache.max_size, cache.eviction) == (2, 'fifo')
+
+    cache.clear()
+    assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
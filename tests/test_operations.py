@@ -145,6 +145,11 @@ class TestPower(BaseOperationTest):
         "one_exponent": {"a": "5", "b": "1", "expected": "5"},
         "decimal_base": {"a": "2.5", "b": "2", "expected": "6.25"},
         "zero_base": {"a": "0", "b": "5", "expected": "0"},
+        "large_integer_exponent": {
+            "a": "2",
+            "b": "100",
+            "expected": "1267650600228229401496703205376"
+        },
     }
     invalid_test_cases = {
         "negative_exponent": {
@@ -153,6 +158,12 @@ class TestPower(BaseOperationTest):
             "error": ValidationError,
             "message": "Negative exponents not supported"
         },
+        "fractional_power_of_negative": {
+            "a": "-8",
+            "b": "0.5",
+            "error": ValidationError,
+            "message": "Fractional powers of negative numbers are not supported"
+        },
     }
 
 
@@ -165,6 +176,7 @@ class TestRoot(BaseOperationTest):
         "cube_root": {"a": "27", "b": "3", "expected": "3"},
         "fourth_root": {"a": "16", "b": "4", "expected": "2"},
         "decimal_root": {"a": "2.25", "b": "2", "expected": "1.5"},
+        "irrational_root": {"a": "2", "b": "2", "expected": "1.4142135624"},
     }
     invalid_test_cases = {
         "negative_base": {
@@ -208,7 +220,38 @@ class TestOperationFactory:
         with pytest.raises(ValueError, match="Unknown operation: invalid_op"):
             OperationFactory.create_operation("invalid_op")
 
-    def test_register_valid_operation(self):
+    def test_create_returns_shared_instance(self):
+        """Test that every request for an operation gets the same instance."""
+        operation = OperationFactory.create_operation("add")
+        assert OperationFactory.create_operation("add") is operation
+        assert OperationFactory.create_operation(" ADD ") is operation
+        assert OperationFactory.get_by_name("Addition") is operation
+
+    @pytest.mark.parametrize("alias, op_class", [
+        ("+", Addition),
+        ("-", Subtraction),
+        ("*", Multiplication),
+        ("×", Multiplication),
+        ("/", Division),
+        ("÷", Division),
+        ("^", Power),
+        ("**", Power),
+        ("√", Root),
+    ])
+    def test_create_by_symbol(self, alias, op_class):
+        """Test creating operations by their symbols."""
+        operation = OperationFactory.create_operation(alias)
+        assert isinstance(operation, op_class)
+        assert OperationFactory.create_operation(f" {alias} ") is operation
+
+    def test_has_operation(self):
+        """Test checking whether a name refers to an operation."""
+        assert OperationFactory.has_operation("add")
+        assert OperationFactory.has_operation("^")
+        assert not OperationFactory.has_operation("modulo")
+        assert not OperationFactory.has_operation("")
+
+    def test_register_valid_operation(self, operation_registry):
         """Test registering a new valid operation."""
         class NewOperation(Operation):
             def execute(self, a: Decimal, b: Decimal) -> Decimal:
@@ -217,6 +260,40 @@ class TestOperationFactory:
         OperationFactory.register_operation("new_op", NewOperation)
         operation = OperationFactory.create_operation("new_op")
         assert isinstance(operation, NewOperation)
+        assert OperationFactory.create_operation("NEW_OP") is operation
+        # registered operations can be looked up by the name calculations record
+        assert OperationFactory.get_by_name("NewOperation") is operation
+
+    def test_register_replaces_resolved_operation(self, operation_registry):
+        """Test that registering an operation replaces the one resolved earlier."""
+        class NewAddition(Operation):
+            def execute(self, a: Decimal, b: Decimal) -> Decimal:
+                return a + b
+
+        assert isinstance(OperationFactory.create_operation("+"), Addition)
+        OperationFactory.register_operation("add", NewAddition)
+        assert isinstance(OperationFactory.create_operation("+"), NewAddition)
+        assert isinstance(OperationFactory.create_operation("add"), NewAddition)
+
+    def test_register_alias(self, operation_registry):
+        """Test registering an alias for an operation."""
+        OperationFactory.register_alias("Plus", "add")
+        assert OperationFactory.create_operation("plus") is OperationFactory.create_operation("add")
+
+    def test_register_alias_unknown_operation(self):
+        """Test that an alias must refer to a registered operation."""
+        with pytest.raises(ValueError, match="Unknown operation: modulo"):
+            OperationFactory.register_alias("%", "modulo")
+        assert not OperationFactory.has_operation("%")
+
+    def test_get_by_name(self):
+        """Test looking up the shared operation instances by name."""
+        for name, op_class in [("Addition", Addition), ("Power", Power), ("Root", Root)]:
+            operation = OperationFactory.get_by_name(name)
+            assert isinstance(operation, op_class)
+            assert OperationFactory.get_by_name(name) is operation
+        assert OperationFactory.get_by_name("addition") is None
+        assert OperationFactory.get_by_name("Modulo") is None
 
     def test_register_invalid_operation(self):
         """Test registering an invalid operation class raises error."""
@@ -224,4 +301,35 @@ class TestOperationFactory:
             pass
 
         with pytest.raises(TypeError, match="Operation class must inherit"):
-            OperationFactory.register_operation("invalid", InvalidOperation)
\ No newline at end of file
+            OperationFactory.register_operation("invalid", InvalidOperation)
+
+class TestArrayKernels:
+    """Test the float64 array kernels of each operation."""
+
+    @pytest.mark.parametrize("operation, expected", [
+        (Addition(), [5.0, 1.0]),
+        (Subtraction(), [1.0, -3.0]),
+        (Multiplication(), [6.0, -2.0]),
+        (Division(), [1.5, -0.5]),
+    ])
+    def test_basic_kernels(self, operation, expected):
+        import numpy as np
+        result = operation.execute_arrays(np.array([3.0, -1.0]), np.array([2.0, 2.0]))
+        assert result.tolist() == expected
+
+    def test_power_and_root_kernels(self):
+        import numpy as np
+        assert Power().execute_arrays(np.array([2.0]), np.array([10.0])).tolist() == [1024.0]
+        assert Root().execute_arrays(np.array([16.0]), np.array([2.0])).tolist() == [4.0]
+
+    def test_default_operation_has_no_kernel(self):
+        class NoKernel(Operation):
+            def execute(self, a: Decimal, b: Decimal) -> Decimal:
+                return a
+
+        operation = NoKernel()
+        assert not operation.supports_arrays
+        assert operation.validate_arrays(None, None) == []
+        with pytest.raises(NotImplementedError, match="NoKernel has no array kernel"):
+            operation.execute_arrays(None, None)
+        assert Addition().supports_arrays